@@ -0,0 +1,84 @@
+# pylint: disable=invalid-name
+
+"""
+filename: circuitBreaker.py
+author: DaveL17
+
+circuitBreaker.py is a module designed to support the OWServer plugin for Indigo Home Control Server. The module
+contains a per-server circuit breaker that keeps the plugin from paying a full connection timeout on every poll of a
+server that is offline.
+
+A breaker starts closed and every poll goes through. After BREAKER_FAILURE_THRESHOLD consecutive failures it opens and
+polls of that server are skipped until its backoff has passed. The backoff doubles with each further failure (up to
+BREAKER_MAX_BACKOFF) and is jittered so that several dead servers don't all retry at once. Once the backoff has passed
+the breaker is half-open: a single trial poll is allowed through. If it succeeds the breaker closes; if it fails the
+breaker opens again with a longer backoff.
+"""
+
+import random
+import threading
+import time
+
+from constants import BREAKER_BASE_BACKOFF, BREAKER_FAILURE_THRESHOLD, BREAKER_MAX_BACKOFF  # noqa
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker for a single EDS server
+    """
+    def __init__(self):
+        self.state = CLOSED
+        self.failures = 0
+        self.retry_at = 0.0
+        self.lock = threading.Lock()
+
+    def allow(self):
+        """
+        Return True if the server should be polled now
+
+        An open breaker whose backoff has passed moves to half-open and lets one trial poll through.
+
+        :return bool:
+        """
+        with self.lock:
+            if self.state == CLOSED:
+                return True
+
+            if self.state == OPEN and time.monotonic() >= self.retry_at:
+                self.state = HALF_OPEN
+                return True
+
+            return False
+
+    def record_success(self):
+        """
+        Close the breaker after a successful poll
+        """
+        with self.lock:
+            self.state = CLOSED
+            self.failures = 0
+
+    def record_failure(self):
+        """
+        Count a failed poll, opening the breaker once the failure threshold is reached
+
+        :return float: seconds until the server will be tried again, or 0 if the breaker is still closed.
+        """
+        with self.lock:
+            self.failures += 1
+
+            if self.state != HALF_OPEN and self.failures < BREAKER_FAILURE_THRESHOLD:
+                return 0
+
+            # Cap the exponent; the backoff is capped anyway and a long outage shouldn't overflow the float.
+            exponent = min(self.failures - BREAKER_FAILURE_THRESHOLD, 16)
+            backoff = min(BREAKER_BASE_BACKOFF * 2 ** exponent, BREAKER_MAX_BACKOFF)
+            backoff *= random.uniform(0.5, 1.0)
+
+            self.state = OPEN
+            self.retry_at = time.monotonic() + backoff
+            return backoff
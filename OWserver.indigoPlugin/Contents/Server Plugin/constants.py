@@ -17,3 +17,58 @@ DEBUG_LABELS = {
     40: "Error Messages",
     50: "Critical Errors Only"
 }
+
+# Server discovery. EDS servers answer a UDP broadcast to DISCOVERY_PORT. Times are in seconds.
+DISCOVERY_PORT       = 30303
+DISCOVERY_INTERVAL   = 3600    # How often to rediscover servers in the background.
+DISCOVERY_QUIET_TIME = 0.5     # Stop listening once no response has arrived for this long.
+DISCOVERY_MAX_TIME   = 10      # Never listen for longer than this.
+DISCOVERY_EXPIRY     = 604800  # Forget servers that haven't answered for a week.
+
+# Poll scheduling. Times are in seconds.
+SCHEDULER_MAX_SLEEP  = 15      # Wake at least this often to pick up newly started devices.
+SCHEDULER_WAKE_STEP  = 0.5     # How often a sleeping poll loop checks whether it has been woken early.
+
+# Device props that change which sensor a device reads or when it is polled. Changing any other prop (including the
+# values mirrored from details.xml) doesn't restart the device.
+RESTART_PROPS = ('serverList', 'romID', 'pollInterval')
+
+# Adaptive polling. A server's intervals are scaled between ADAPTIVE_MIN_SCALE and 1 based on sensor activity.
+ADAPTIVE_MIN_INTERVAL = 15     # Never poll more often than this (seconds).
+ADAPTIVE_MIN_SCALE    = 1 / 64
+ADAPTIVE_BACKOFF      = 1.5    # Scale growth after a poll with flat readings.
+ADAPTIVE_DEADBAND     = 0.5    # Numeric changes this small don't count as activity.
+
+# Per-server circuit breaker. Times are in seconds.
+BREAKER_FAILURE_THRESHOLD = 2     # Consecutive failed polls before a server is skipped.
+BREAKER_BASE_BACKOFF      = 30    # First backoff after the breaker opens.
+BREAKER_MAX_BACKOFF       = 3600  # Longest backoff between trial polls.
+
+# HTTP sessions. Each server's requests can overlap: a poll, its write lane and a menu item or write refresh.
+SESSION_POOL_SIZE = 3  # Pooled keep-alive connections per server.
+
+# Automatic server timeouts. Times are in seconds.
+AUTO_TIMEOUT_FACTOR  = 3       # Timeout is the server's 99th percentile response time times this.
+AUTO_TIMEOUT_MIN     = 0.5     # Never time out faster than this.
+AUTO_TIMEOUT_SAMPLES = 20      # Responses needed before automatic timeouts take over.
+LATENCY_HISTORY      = 200     # Response times kept per server.
+
+# Poll timing instrumentation.
+TIMING_HISTORY       = 500     # Samples kept per histogram.
+TIMING_BUCKETS_MS    = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 30000)
+
+# Traffic capture and replay.
+CAPTURE_FILE_BYTES   = 16 * 1024 * 1024  # Start a new capture file once the newest reaches this size.
+CAPTURE_MAX_FILES    = 8       # Capture files kept; the oldest are deleted.
+REPLAY_POLL_GAP      = 5       # Captures this many seconds apart or less belong to the same poll.
+
+# devices.htm write queue. Times are in seconds.
+WRITE_COALESCE_WINDOW = 0.25   # How long a write waits to be coalesced with later writes to the same variable.
+WRITE_REFRESH_DELAY   = 1.0    # How long after a write to re-read the written device, so the server can settle.
+
+# Writes shown on the device before the server confirms them: {written variable: details.xml keys it sets}. The first
+# key is the one checked against details.xml to confirm the write.
+OPTIMISTIC_WRITES = {
+    'LEDState': ('LED', 'LEDState'),
+    'RelayState': ('Relay', 'RelayState'),
+}
@@ -0,0 +1,156 @@
+# pylint: disable=invalid-name
+
+"""
+filename: metricsExporter.py
+author: DaveL17
+
+metricsExporter.py is a module designed to support the OWServer plugin for Indigo Home Control Server. The module
+exports poll health metrics to an external monitoring system, either as a Prometheus text format endpoint that a
+Prometheus server scrapes, or by pushing them to a StatsD server over UDP.
+
+The plugin publishes a list of metrics after each poll. Each metric is a tuple of (name, kind, help, labels, value)
+where kind is 'gauge' or 'counter' and labels is a dict (which may be empty).
+"""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import re
+import socket
+import threading
+
+
+def escape_label(value):
+    """
+    Escape a Prometheus label value
+
+    :param value:
+    :return str:
+    """
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class MetricsExporter:
+    """
+    Base exporter. Subclasses send or serve the most recently published metrics.
+    """
+    def publish(self, metrics):
+        """
+        :param list metrics: [(name, kind, help, labels, value)]
+        """
+
+    def close(self):
+        """
+        Release any sockets or threads held by the exporter
+        """
+
+
+class PrometheusExporter(MetricsExporter):
+    """
+    Serve the most recently published metrics at http://<Indigo server>:<port>/metrics
+    """
+    def __init__(self, port):
+        self.text = ""
+        self.lock = threading.Lock()
+        exporter = self
+
+        class Handler(BaseHTTPRequestHandler):
+            """
+            Answer scrapes with the current metrics text
+            """
+            def do_GET(self):  # noqa
+                if self.path.split('?')[0] != "/metrics":
+                    self.send_error(404)
+                    return
+
+                with exporter.lock:
+                    body = exporter.text.encode('utf-8')
+
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):  # noqa
+                # Scrapes are frequent; don't write them to stderr.
+                pass
+
+        self.server = ThreadingHTTPServer(('', port), Handler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, name="OWServerMetrics", daemon=True)
+        self.thread.start()
+
+    def publish(self, metrics):
+        """
+        Render the metrics in the Prometheus text exposition format
+
+        :param list metrics: [(name, kind, help, labels, value)]
+        """
+        # Every sample of a metric has to follow its HELP and TYPE lines, so group the samples by name.
+        families = {}
+
+        for name, kind, help_text, labels, value in metrics:
+            family = families.setdefault(name, [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"])
+
+            if labels:
+                label_text = ",".join(f'{key}="{escape_label(label)}"' for key, label in sorted(labels.items()))
+                family.append(f"{name}{{{label_text}}} {value}")
+            else:
+                family.append(f"{name} {value}")
+
+        lines = [line for family in families.values() for line in family]
+
+        with self.lock:
+            self.text = "\n".join(lines) + "\n"
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class StatsdExporter(MetricsExporter):
+    """
+    Push each published metric to a StatsD server as a gauge
+    """
+    MAX_PACKET = 1400  # Keep datagrams under a typical Ethernet MTU.
+
+    def __init__(self, host, port, prefix="owserver"):
+        self.address = (host, port)
+        self.prefix = prefix
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    def publish(self, metrics):
+        """
+        Send the metrics as StatsD gauges, batching several per datagram
+
+        Labels become extra name segments, so owserver_eds_poll_count{server="10.0.1.44"} is sent as
+        owserver.eds_poll_count.10_0_1_44. Counters are sent as gauges of their running total.
+
+        :param list metrics: [(name, kind, help, labels, value)]
+        """
+        packet = ""
+
+        for name, kind, help_text, labels, value in metrics:
+            segments = [name.removeprefix("owserver_")]
+            segments += [re.sub(r'[^A-Za-z0-9_-]', '_', str(labels[key])) for key in sorted(labels)]
+            line = f"{self.prefix}.{'.'.join(segments)}:{value}|g"
+
+            if packet and len(packet) + len(line) + 1 > self.MAX_PACKET:
+                self.send(packet)
+                packet = ""
+            packet = f"{packet}\n{line}" if packet else line
+
+        if packet:
+            self.send(packet)
+
+    def send(self, packet):
+        """
+        :param str packet:
+        """
+        try:
+            self.socket.sendto(packet.encode('utf-8'), self.address)
+        except OSError:
+            # StatsD is fire and forget; a missing server shouldn't interrupt polling.
+            pass
+
+    def close(self):
+        self.socket.close()
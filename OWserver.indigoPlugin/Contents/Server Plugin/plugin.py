@@ -15,14 +15,22 @@ OW-SERVER-WiFi-2G server types. The plugin does _not_ support the HTML-based out
 
 # ================================== IMPORTS ==================================
 # Built-in modules
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 import datetime as dt
+import heapq
 import json
 import logging
+import queue
+import re
 import socket
+import threading
+import time
 import xml.etree.ElementTree as eTree
 
 # Third-party modules
 import requests  # noqa - included in the standard Indigo python install
+from requests.adapters import HTTPAdapter  # noqa - included in the standard Indigo python install
 try:
     import indigo
 #     import pydevd
@@ -30,8 +38,14 @@ except ImportError:
     pass
 
 # My modules
+from circuitBreaker import CircuitBreaker  # noqa
 import DLFramework.DLFramework as Dave  # noqa
+from metricsExporter import PrometheusExporter, StatsdExporter  # noqa
+from pollStats import PollStats  # noqa
+from sensorFamilies import SENSOR_FAMILIES  # noqa
 import stateDict  # noqa
+from trafficArchive import ReplaySession, TrafficCapture, archive_files, group_polls, read_archive  # noqa
+from writeQueue import WriteQueue  # noqa
 from constants import *  # noqa  pylint: disable=wildcard-import
 from plugin_defaults import kDefaultPluginPrefs  # noqa  pylint: disable=unused-import
 
@@ -69,8 +83,50 @@ class Plugin(indigo.PluginBase):
         self.device_list             = []
         self.number_of_sensors       = 0
         self.number_of_servers       = 0
+        self.sessions                = {}  # One pooled HTTP session per server, keyed by server IP.
+        self.sessions_lock           = threading.Lock()
+        self.state_cache             = {}  # Last state values written to each device, keyed by device ID.
+        self.state_batches           = {}  # Open state update batches, keyed by device ID.
+        self.last_seen               = {}  # When each device was last found in a details.xml file, keyed by device ID.
+        self.dead_warned             = {}  # When each dead device was last warned about, keyed by device ID.
+        self.snapshots               = {}  # Most recent details.xml from each server, keyed by server IP.
+        self.snapshots_lock          = threading.Lock()
+        self.discovered_servers      = json.loads(self.pluginPrefs.get('discoveredServers', '{}'))  # IP: last seen.
+        self.discovery_lock          = threading.Lock()
+        self.discovery_thread        = None
+        self.last_discovery          = None  # time.monotonic() when the last discovery started.
+        self.poll_schedule           = {}  # Next time.monotonic() each device is due to be polled, keyed by device ID.
+        self.poll_queue              = []  # Heap of (due time, device ID); stale if not in poll_schedule.
+        self.poll_schedule_lock      = threading.Lock()
+        self.poll_lock               = threading.RLock()  # Held while a poll is updating devices.
+        self.poll_wakeup             = threading.Event()  # Set to wake the poll loop before its next device is due.
+        self.adaptive_scale          = {}  # Adaptive polling interval multiplier (0 - 1], keyed by server IP.
+        self.server_activity         = {}  # Whether a sensor value changed during the current poll, keyed by server IP.
+        self.last_values             = {}  # Last primary sensor value, keyed by device ID.
+        self.breakers                = {}  # One circuit breaker per server, keyed by server IP.
+        self.latencies               = {}  # Recent details.xml response times in seconds, keyed by server IP.
+        self.latencies_lock          = threading.Lock()
+        self.poll_stats              = PollStats()
+        self.cycle_timings           = {}  # Seconds spent in each main thread phase this poll, keyed by (IP, phase).
+        self.metrics_exporter        = None
+        self.fetch_failures          = {}  # Failed details.xml fetches since the plugin started, keyed by server IP.
+        self.fetch_started           = {}  # time.monotonic() the last details.xml request started, keyed by server IP.
+        self.pending_writes          = {}  # Optimistic values awaiting confirmation, keyed by (device ID, variable).
+        self.pending_lock            = threading.Lock()
+        self.pending_changes         = deque()  # (device ID, variable, entry) for the poll thread to apply.
+        self.write_mismatches        = {}  # Optimistic values the server didn't confirm, keyed by server IP.
+        self.sensor_ids              = None  # Enabled sensor device IDs keyed by (server IP, ROM ID). None to rebuild.
+        self.sensor_ids_lock         = threading.Lock()
+        self.eds_metrics             = {}  # Numeric server values from the last details.xml, keyed by server IP.
+        self.dead_sensors            = 0
+        self.cycle_state_writes      = 0
+        self.cycle_prop_writes       = 0
+        self.traffic_capture         = None
+        self.replay_session          = None  # Stands in for every server's session while captures are replayed.
+        self.replay_thread           = None
+        self.replay_stop             = threading.Event()
+        self.write_queue             = WriteQueue(self.write_to_server)
         self.pad_log = "\n" + (" " * 34)  # 34 spaces to continue in line with log margin.
-        self.xmlns = '{http://www.embeddeddatasystems.com/schema/owserver}'  # noqa - not https://
 
         # ========================== Initialize DLFramework ===========================
         self.Fogbert = Dave.Fogbert(self)
@@ -124,6 +180,8 @@ class Plugin(indigo.PluginBase):
         self.logger.debug('closedDeviceConfigUi() method called:')
         if not user_cancelled:
             self.logger.debug("closedDeviceConfigUi()")
+            # A server device's polling interval is the default for its sensors.
+            self.reschedule_devices()
         else:
             self.logger.debug("Device configuration cancelled.")
 
@@ -147,8 +205,15 @@ class Plugin(indigo.PluginBase):
             indigo.server.log(f"Debugging on (Level: {DEBUG_LABELS[self.debug_level]} ({self.debug_level})")
 
             # Plugin-specific actions
+            # Server settings may have changed, so start over with fresh HTTP sessions and details.xml snapshots.
+            self.close_sessions()
+            self.invalidate_snapshot()
+            self.start_metrics_exporter()
+            self.start_traffic_capture()
+
             # Update all device states upon close
             self.updateDeviceStates()
+            self.reschedule_devices()
 
             self.logger.debug("Plugin prefs saved.")
 
@@ -157,6 +222,20 @@ class Plugin(indigo.PluginBase):
 
         return values_dict
 
+    # =============================================================================
+    def didDeviceCommPropertyChange(self, orig_dev:indigo.Device, new_dev:indigo.Device):  # noqa
+        """
+        Standard Indigo method called when a device's props change to decide whether to restart the device.
+
+        Indigo restarts the device on any prop change by default, which would reset its state cache and poll it
+        straight away each time update_props() saves a mirrored value.
+
+        :param indigo.Device orig_dev:
+        :param indigo.Device new_dev:
+        :return bool:
+        """
+        return any(orig_dev.pluginProps.get(prop) != new_dev.pluginProps.get(prop) for prop in RESTART_PROPS)
+
     # =============================================================================
     def deviceStartComm(self, dev:indigo.Device):  # noqa
         """
@@ -167,7 +246,11 @@ class Plugin(indigo.PluginBase):
         """
         self.logger.debug(f"Starting OWServer device: {dev.name}")
         dev.stateListOrDisplayStateIdChanged()
-        dev.updateStateOnServer('onOffState', value=True, uiValue=" ")
+        # The device's states may have been reset, so the next poll writes every state.
+        self.state_cache.pop(dev.id, None)
+        self.update_state(dev, 'onOffState', value=True, uiValue=" ")
+        self.schedule_device(dev.id, time.monotonic())
+        self.invalidate_sensor_ids()
 
     # =============================================================================
     def deviceStopComm(self, dev):  # noqa
@@ -178,7 +261,9 @@ class Plugin(indigo.PluginBase):
         :return:
         """
         self.logger.debug(f"Stopping OWServer device: {dev.name}")
-        dev.updateStateOnServer('onOffState', value=False, uiValue=" ")
+        self.unschedule_device(dev.id)
+        self.invalidate_sensor_ids()
+        self.update_state(dev, 'onOffState', value=False, uiValue=" ")
         dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
 
     # =============================================================================
@@ -194,10 +279,22 @@ class Plugin(indigo.PluginBase):
 
         try:
             while True:
-                self.spot_dead_sensors()
-                self.updateDeviceStates()
-                sleep_time = int(self.pluginPrefs.get('configMenuPollInterval', 900))
-                self.sleep(sleep_time-5)
+                if self.pluginPrefs.get('autoDetectServers', True) and (
+                        self.last_discovery is None or time.monotonic() - self.last_discovery >= DISCOVERY_INTERVAL
+                ):
+                    self.start_discovery()
+
+                self.apply_pending_changes()
+
+                # Only the servers with devices that are due are polled, and only the due devices are updated. Live
+                # polling is paused while captured traffic is being replayed.
+                if self.replay_session is None:
+                    due = self.pop_due_devices()
+                    if due:
+                        self.spot_dead_sensors()
+                        self.updateDeviceStates(due=due)
+
+                self.sleep_until_next_poll()
 
         except self.StopThread:
             self.logger.debug("Fatal error. Stopping OWServer thread.")
@@ -212,6 +309,10 @@ class Plugin(indigo.PluginBase):
         :return:
         """
         self.plugin_is_shutting_down = True
+        self.replay_stop.set()
+        self.write_queue.close()
+        self.close_sessions()
+        self.stop_metrics_exporter()
         self.logger.debug("Shutting down OWServer plugin.")
 
     # =============================================================================
@@ -228,6 +329,9 @@ class Plugin(indigo.PluginBase):
         # =========================== Audit Server Version ============================
         self.Fogbert.audit_server_version(min_ver=2022)
 
+        self.start_metrics_exporter()
+        self.start_traffic_capture()
+
     # =============================================================================
     def validatePrefsConfigUi(self, values_dict):  # noqa
         """
@@ -251,6 +355,16 @@ class Plugin(indigo.PluginBase):
         # Split apart the IP address(es) to ensure that they have at least four parts.
         if not auto_detect_servers:
             for server_ip in split_ip:
+                # A port may follow the address (0.0.0.0:8080) for servers behind port forwarding or the EDS simulator.
+                server_ip, _, port = server_ip.partition(":")
+                if port:
+                    try:
+                        if not 0 < int(port) < 65536:
+                            raise ValueError
+                    except ValueError:
+                        error_msg_dict['OWServerIP'] = "Please enter a port number between 1 and 65535."
+                        return False, values_dict, error_msg_dict
+
                 address_parts = server_ip.split(".")
                 if len(address_parts) != 4:
                     error_msg_dict['OWServerIP'] = "Please enter a valid IP address with four valid parts (0.0.0.0)."
@@ -269,6 +383,16 @@ class Plugin(indigo.PluginBase):
                         )
                         return False, values_dict, error_msg_dict
 
+        # Metrics exporter ports.
+        port_fields = {'prometheus': ['metricsPort'], 'statsd': ['statsdPort']}
+        for field in port_fields.get(values_dict.get('metricsExporter', 'none'), []):
+            try:
+                if not 0 < int(values_dict[field]) < 65536:
+                    raise ValueError
+            except ValueError:
+                error_msg_dict[field] = "Please enter a port number between 1 and 65535."
+                return False, values_dict, error_msg_dict
+
         return True, values_dict
 
     # =============================================================================
@@ -278,23 +402,13 @@ class Plugin(indigo.PluginBase):
         """
         Title Placeholder
 
-        The sendToServer() method merely logs the url sent to the server for the purposes of confirmation and a signal
-        that the event took place. This is a temporary method which will be removed if it's no longer needed.
+        The sendToServer() method queues a write to a 1-Wire device and returns without waiting for the server. The
+        write is sent from the server's write lane (see writeQueue.py) and its outcome is logged.
 
-        :param List val:
+        :param List val: (server IP, ROM ID, variable, value)
+        :return Future:
         """
-        # The EDS server does not support https://.
-        write_url = f"http://{val[0]}/devices.htm?rom={val[1]}&variable={val[2]}&value={val[3]}"
-
-        try:
-            time_out = int(self.pluginPrefs.get('configMenuServerTimeout', 15))
-            reply = requests.get(write_url, timeout=time_out)
-
-            self.logger.debug(f"Write to server URL: {write_url}")
-            self.logger.debug(f"Reply: {reply}")
-
-        except Exception:  # noqa
-            self.logger.exception("sendToServer()")
+        return self.queue_write(*val)
 
     # =============================================================================
     def sendToServerAction(self, val):  # noqa
@@ -315,22 +429,23 @@ class Plugin(indigo.PluginBase):
             plugin.executeAction("sendToServerAction", props)
         =======================================================================
 
-        :param indigo.Dict val:
+        The write is queued and the action returns straight away. Add "wait": True to the props to wait for the server
+        to answer, in which case the action returns True if the write succeeded.
+
+        :param indigo.PluginAction val:
         """
         server    = val.props.get('server')
         rom_id    = val.props.get('romId')
         variable  = val.props.get('variable')
         value     = val.props.get('value')
-        write_url = f"https://{server}/devices.htm?rom={rom_id}&variable={variable}&value={value}"
+        future    = self.queue_write(server, rom_id, variable, value)
 
-        try:
-            time_out = int(self.pluginPrefs.get('configMenuServerTimeout', 15))
-            reply = requests.get(write_url, timeout=time_out)
-            self.logger.debug(f"Write to server URL: {write_url}")
-            self.logger.debug(f"Reply: {reply}")
-
-        except Exception:  # noqa  # oqa
-            self.logger.exception("sendToServerAction()")
+        if val.props.get('wait', False):
+            try:
+                future.result()
+                return True
+            except Exception:  # noqa
+                return False
 
     # =============================================================================
     def actionControlSensor(self, action, dev):  # noqa
@@ -386,2007 +501,1854 @@ class Plugin(indigo.PluginBase):
             error_msg_dict['writeToValue'] = "Only decimal values can be written to 1-Wire devices."
             return False, values_dict, error_msg_dict
 
-        # All tests passed, so construct the URL to send to the server.
-        write_to_url = (
-            f"https://{write_to_server}/devices.htm?rom={write_to_rom}&variable={write_to_variable}"
-            f"&value={write_to_value}"
+        # All tests passed, so queue the write. The outcome is logged once the server has answered.
+        self.logger.debug(
+            f"Queueing write to device: {write_to_server} {write_to_rom} {write_to_variable}={write_to_value}"
+        )
+        self.queue_write(
+            write_to_server, write_to_rom, write_to_variable, write_to_value,
+            callback=lambda request: self.log_write_result(request, announce=True)
+        )
+        return True
+
+    # =============================================================================
+    def queue_write(self, server_ip, rom_id, variable, value, callback=None, toggle=False, refresh=True):
+        """
+        Queue a devices.htm write on the server's write lane
+
+        Writes to the same ROM ID and variable that arrive close together are coalesced (see writeQueue.py).
+
+        :param str server_ip:
+        :param str rom_id:
+        :param str variable:
+        :param str value:
+        :param callback: callable(WriteRequest) to call once the write has finished. Defaults to log_write_result().
+        :param bool toggle: value is the opposite of the device's current value.
+        :param bool refresh: poll the written device shortly after the write (see schedule_write_refresh()).
+        :return Future:
+        """
+        self.logger.debug(f"Queueing write to {server_ip}: {rom_id} {variable}={value}")
+        future = self.write_queue.submit(
+            server_ip, rom_id, variable, value, callback or self.log_write_result, toggle=toggle, refresh=refresh
         )
 
-        self.logger.debug(f"URL constructed to post data to device: {write_to_url}")
+        if variable in OPTIMISTIC_WRITES and self.pluginPrefs.get('optimisticWrites', True):
+            self.set_pending_write(server_ip, rom_id, variable, value, future)
 
-        # Send the URL to the server.
-        try:
-            time_out = int(self.pluginPrefs.get('configMenuServerTimeout', 15))
-            reply = requests.get(write_to_url, timeout=time_out)
-            self.logger.info(f"{write_to_variable}: {write_to_value} written successfully.")
-            self.logger.info(f"Reply: {reply}")
-            return True
+        return future
 
-        # TODO - include requests exception handlers?
-        # What happens if we're unsuccessful.
-        # except urllib2.HTTPError as error:
-        #     self.logger.exception("General exception:")
-        #     self.logger.critical("HTTP error writing server data.")
-        #     error_msg_dict['writeToServer'] = f"{error.reason}"
-        #     return False, values_dict, error_msg_dict
-        except IOError as error:  # TODO: Check to see if these are IOErrors.
-            self.logger.exception("General exception:")
-            self.logger.warning("Exception error getting server data.")
-            # (no number, timed out)
-            # (51, Network is unreachable) - OWServer has no LAN access
-            # (50, Network is down) - EDS hardware offline
-            # (54, Connection reset by peer) - EDS hardware offline
-            error_msg_dict['writeToServer'] = f"{error}"
-            return False, values_dict, error_msg_dict
-        except Exception as error:
-            self.logger.exception("General exception:")
-            self.logger.warning(
-                "Misc. error downloading details.xml file. If the problem persists, please enable debugging in the "
-                "OWServer configuration dialog and check user forum for more information."
+    # =============================================================================
+    def set_pending_write(self, server_ip, rom_id, variable, value, future):
+        """
+        Show a queued LED or relay write on its devices, marked as pending
+
+        The pending value is recorded here and handed to the poll thread, which shows it on the device (see
+        apply_pending_changes()). It is confirmed or rolled back by the first details.xml requested after the write was
+        sent (see reconcile_pending_writes()), or rolled back as soon as the write fails. Only pending_lock is taken, so
+        the caller never waits on a poll.
+
+        :param str server_ip:
+        :param str rom_id:
+        :param str variable: a key of OPTIMISTIC_WRITES.
+        :param str value:
+        :param Future future: the queued write.
+        """
+        if self.replay_session is not None or str(value) not in ("0", "1"):
+            return
+
+        keys = OPTIMISTIC_WRITES[variable]
+
+        for dev_id in self.get_sensor_ids(server_ip, rom_id):
+            if dev_id not in indigo.devices:
+                continue
+
+            dev = indigo.devices[dev_id]
+            props = dev.pluginProps
+            family = SENSOR_FAMILIES[dev.deviceTypeId]
+
+            states = {state for state, key in family['states'].items() if key in keys}
+            if keys[0] not in family['states'].values():
+                continue
+
+            if family['value_pref'] and family['values'].get(props.get(family['value_pref']), (None,))[0] in keys:
+                states.add('sensorValue')
+
+            with self.pending_lock:
+                # A second write before the first is confirmed rolls back to the value from before the first.
+                earlier = self.pending_writes.get((dev.id, variable))
+                confirmed_state = next(state for state, key in family['states'].items() if key == keys[0])
+                entry = {
+                    'server': server_ip, 'keys': keys, 'states': states, 'value': str(value),
+                    'previous': earlier['previous'] if earlier else str(dev.states.get(confirmed_state, "")),
+                    'future': future, 'sent': None, 'outcome': None,
+                }
+                if earlier and 'reported' in earlier:
+                    entry['reported'] = earlier['reported']
+                self.pending_writes[(dev.id, variable)] = entry
+                self.pending_changes.append((dev.id, variable, entry))
+
+            future.add_done_callback(
+                lambda done, dev_id=dev.id: self.pending_write_done(dev_id, variable, done)
             )
-            error_msg_dict['writeToServer'] = f"{error}"
-            return False, values_dict, error_msg_dict
+
+        self.poll_wakeup.set()
 
     # =============================================================================
-    def dumpXML(self, values_dict, type_id):  # noqa
+    def apply_written_value(self, dev, keys, value):
         """
-        Title Placeholder
+        Write a value to every device state (and the sensorValue, if selected) fed by the given details.xml keys
 
-        dumpXML(self, values_dict): This method grabs a copy of the details.xml file from the server at the specified
-        IP address, parses it, and dumps a copy to a log file. The purpose is for the user to be able to confirm that
-        the 1-Wire server is online and that the plugin can talk to it. Log file is written to the Indigo server logs
-        folder.
+        :param indigo.Device dev:
+        :param tuple keys: details.xml keys.
+        :param str value:
+        """
+        family = SENSOR_FAMILIES[dev.deviceTypeId]
 
-        :param indigo.Dict values_dict:
-        :param int type_id:
+        for state, key in family['states'].items():
+            if key in keys:
+                self.update_state(dev, state, value=value)
+
+        if family['value_pref']:
+            key, _, image = family['values'].get(dev.pluginProps.get(family['value_pref']), (None, None, None))
+            if key in keys:
+                self.update_state(dev, 'sensorValue', value=value, uiValue=value)
+                self.update_state_image(dev, image, value)
+
+    # =============================================================================
+    def pending_write_done(self, dev_id, variable, future):
         """
-        self.logger.debug("Dumping details.xml file to Indigo log file...")
+        Note when a pending write was sent, or hand it to the poll thread to be settled if it wasn't
 
-        addr = values_dict['writeToServer']
-        split_ip = addr.replace(" ", "").split(",")
+        Called from the server's write lane when the write's future resolves. A write that failed, was cancelled or
+        was toggled back before it was sent is marked with its outcome and left for apply_pending_changes() or
+        reconcile_pending_writes(), whichever reaches it first, so that device states are only changed by the poll
+        thread.
 
-        for server_ip in split_ip:
-            try:
-                ows_xml = self.get_details_xml(server_ip)
-                if values_dict['writeXMLToLog']:
-                    file_name = f"{indigo.server.getLogsFolderPath()}/{dt.datetime.today().date()} OWServer.txt"
-                    with open(file_name, "w", encoding='utf-8') as data:
-                        data.write("OWServer details.xml Log\n")
-                        data.write(f"Written at: {dt.datetime.today()}\n")
-                        data.write("=" * 72 + "\n")
-                        data.write(str(ows_xml))
+        :param int dev_id:
+        :param str variable:
+        :param Future future:
+        """
+        with self.pending_lock:
+            pending = self.pending_writes.get((dev_id, variable))
 
-                if not ows_xml:
-                    self.logger.critical(f"OWServer IP: {server_ip} failed.")
-                else:
-                    indigo.server.log(f"OWServer IP: {server_ip} passed.")
+            # A later write to the same variable has taken over.
+            if pending is None or pending['future'] is not future:
+                return
 
-            except Exception:  # noqa
-                self.logger.exception("General exception:")
-                self.logger.warning("Can't dump XML to log. Check server connection.")
+            if future.cancelled() or future.exception() is not None:
+                pending['outcome'] = 'failed'
+            elif future.result() is None:
+                pending['outcome'] = 'not sent'
+            else:
+                pending['sent'] = time.monotonic()
+                return
+
+            self.pending_changes.append((dev_id, variable, pending))
+
+        self.poll_wakeup.set()
 
     # =============================================================================
-    def get_details_xml(self, server_ip):
+    def apply_pending_changes(self):
         """
-        Title Placeholder
+        Show newly pending values on their devices, and settle pending writes that were never sent
 
-        get_details_xml(): This method goes out to the 1-Wire server at the specified OWServerIP address and pulls in a
-        copy of the details.xml file. It doesn't process it any way.
+        Runs on the poll thread (from the poll loop and at the start of each poll) so that device states are never
+        changed by two threads at once. Entries that a later write or a poll has already replaced are skipped. A
+        settled write restores the newest value a poll has reported since it was queued, or the value from before the
+        write if no poll has.
 
-        :param str server_ip:
+        :return:
         """
-        self.logger.debug("get_details_xml() method called.")
+        with self.poll_lock:
+            while True:
+                with self.pending_lock:
+                    if not self.pending_changes:
+                        return
+                    dev_id, variable, entry = self.pending_changes.popleft()
 
-        try:
-            # The EDS server does not support https://.
-            url      = f"http://{server_ip}/details.xml"  # noqa
-            time_out = int(self.pluginPrefs.get('configMenuServerTimeout', 15))
-            response = requests.get(url, timeout=time_out)
-            self.logger.debug("details.xml file retrieved successfully.")
-            return response.text
+                    if self.pending_writes.get((dev_id, variable)) is not entry:
+                        continue
+                    if entry['outcome']:
+                        del self.pending_writes[(dev_id, variable)]
 
-        # What happens if we're unsuccessful. No connection to Internet, no response from OWServer. Let's keep trying.
-        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout, requests.exceptions.HTTPError):
-            self.logger.warning("Unable to make a successful connection to One Wire Server.")
+                if self.plugin_is_shutting_down or dev_id not in indigo.devices:
+                    continue
 
-        except Exception:  # noqa
-            self.logger.exception("General exception:")
-            self.logger.warning(
-                "Misc. error downloading details.xml file. If the problem persists, please enable  debugging in the "
-                "OWServer configuration dialog and check user forum for more information."
-            )
+                dev = indigo.devices[dev_id]
+
+                if entry['outcome'] is None:
+                    self.apply_written_value(dev, entry['keys'], entry['value'])
+
+                elif entry['outcome'] == 'not sent':
+                    # Toggled back before it was sent, so nothing changed on the server.
+                    self.apply_written_value(dev, entry['keys'], entry.get('reported', entry['value']))
+
+                else:
+                    restored = entry.get('reported', entry['previous'])
+                    self.apply_written_value(dev, entry['keys'], restored)
+                    self.logger.warning(f"{dev.name}: {variable} wasn't written. Rolled back to {restored}.")
 
     # =============================================================================
-    def getSensorList(self, fltr="indigo.sensor", type_id=0, values_dict=None, target_id=0):  # noqa
+    def reconcile_pending_writes(self, dev, server_ip, sensor_data):
         """
-        Title Placeholder
+        Confirm or roll back a device's pending writes against its sensor's details.xml values
 
-        getSensorList(): This method constructs a list of 1-Wire sensors that have  been added to all servers. It's
-        called when the user opens up a device config dialog. If there are no sensors left to assign (they have all
-        been assigned to other devices) then the user is sent a message 'No sensors to add.' This string is necessary
-        to address conditions where the method returns a noneType value instead of a list (Indigo throws an error when
-        this happens.)
+        A details.xml requested before the write was sent can't confirm it, so the pending values are laid over the
+        server's values and stay pending, and the server's value is kept in case the write has to be rolled back.
+        Otherwise the write is confirmed if the server reports the written value, or counted in write_mismatches and
+        rolled back if it doesn't. A write that was never sent is simply dropped. Either way the server's values are
+        then applied as usual, which clears the pending marker.
 
-        :param str fltr:
-        :param str type_id:
-        :param indigo.Dict values_dict:
-        :param str target_id:
+        :param indigo.Device dev:
+        :param str server_ip:
+        :param dict sensor_data:
+        :return dict: the values to apply to the device.
         """
-        self.logger.debug("getSensorList() method called.")
-        self.logger.debug("Generating list of 1-Wire sensors...")
+        fetched = self.fetch_started.get(server_ip, 0)
 
-        server_list        = self.pluginPrefs.get('OWServerIP', None)
-        clean_server_list  = server_list.replace(' ', '').split(',')
-        sorted_server_list = sorted(clean_server_list)
-        sorted_sensor_list = []
-        sensor_id_list     = []
+        with self.pending_lock:
+            pending = {
+                variable: entry for (dev_id, variable), entry in self.pending_writes.items() if dev_id == dev.id
+            }
+            for variable, entry in pending.items():
+                if entry['outcome'] or (entry['sent'] is not None and entry['sent'] <= fetched):
+                    del self.pending_writes[(dev.id, variable)]
+                elif entry['keys'][0] in sensor_data:
+                    entry['reported'] = str(sensor_data[entry['keys'][0]])
 
-        for IP in sorted_server_list:
-            try:
-                ows_xml = self.get_details_xml(IP)
-                root = eTree.fromstring(ows_xml)
+        values = sensor_data
 
-                if self.pluginPrefs['showDebugInfo'] and self.pluginPrefs['showDebugLevel'] >= 3:
-                    self.logger.debug(f"{ows_xml}")
+        for variable, entry in pending.items():
+            reported = str(sensor_data.get(entry['keys'][0]))
 
-                # Build a list of ROM IDs for all 1-Wire sensors on the network. We start by parsing out a list of all
-                # ROM IDs in the source details.xml file. The resulting list is called "sensorID_list"
-                for child in root:
-                    if "owd_" in child.tag:
-                        rom_id = child.find(self.xmlns + 'ROMId')
-                        sensor_id_list += [rom_id.text]
+            if entry['outcome'] == 'failed':
+                self.logger.warning(f"{dev.name}: {variable} wasn't written. Rolled back to {reported}.")
 
-                # If the list is empty, there are no ROM IDs in details.xml. Let's proceed with an empty list.
-                if sensor_id_list is None:
-                    sensor_id_list = []
+            if entry['outcome']:
+                continue
 
-                # Sort the list (to make it easy to find the ROM ID needed), and return the list.
-                sorted_sensor_list = sorted(sensor_id_list)
+            if entry['sent'] is None or entry['sent'] > fetched:
+                values = {**values, **{key: entry['value'] for key in entry['keys']}}
 
-            except Exception:  # noqa
-                self.logger.exception("General exception:")
-                self.logger.debug("Error reading sensor data from servers.")
-                sorted_sensor_list = ["Error reading data from servers."]
+            elif reported == entry['value']:
+                self.logger.debug(f"{dev.name}: {variable}={entry['value']} confirmed.")
 
-        return sorted_sensor_list
+            else:
+                self.write_mismatches[server_ip] = self.write_mismatches.get(server_ip, 0) + 1
+                self.logger.warning(
+                    f"{dev.name}: {variable}={entry['value']} was sent but the server reports {reported}. Rolled back."
+                )
+
+        return values
 
     # =============================================================================
-    def getServerList(self, fltr="indigo.sensor", type_id=0, values_dict=None, target_id=0):  # noqa
+    def write_to_server(self, request):
         """
-        Title Placeholder
+        Send a queued write to its server
 
-        getServerList(): This method provides the callback for defining server devices. It obtains its list of server
-        IP addresses from one of two distinct procedures: (1) automatic server detection, and (2) manual declaration of
-        server IPs. Within the plugin configuration dialog, the user either accepts automatic detection or else enters
-        a comma delimited list of addresses. Despite whichever procedure is used, getServerList() returns a list
-        (sorted_server_list) containing the list of IPs. This list is used to assign IP addresses when the user creates
-        OWServer devices.
+        Called from the server's write lane, never from the Indigo UI or action threads. Writes are refused while
+        captured traffic is being replayed, since the devices are showing replayed values rather than the servers'.
 
-        :param str fltr:
-        :param str type_id:
-        :param indigo.Dict values_dict:
-        :param int target_id:
+        :param WriteRequest request:
+        :return requests.Response:
         """
-        self.logger.debug("getServerList() method called.")
-        master_list = []
-        my_socket = None
+        if self.replay_session is not None:
+            raise RuntimeError("A captured traffic replay is in progress. Stop the replay and try again.")
 
-        if not self.pluginPrefs.get('autoDetectServers', True):
-            server_list        = self.pluginPrefs.get('OWServerIP', None)
-            clean_server_list  = server_list.replace(" ", "").split(",")
-            sorted_server_list = sorted(clean_server_list)
-            return sorted_server_list
+        # The EDS server does not support https://.
+        write_url = (
+            f"http://{request.server_ip}/devices.htm?rom={request.rom_id}&variable={request.variable}"
+            f"&value={request.value}"
+        )
 
-        else:
-            # We will ignore everything that responds to our UDP broadcast request unless it has one of the following
-            # in its return.
-            try:
-                socket.setdefaulttimeout(0.5)
-                my_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
-                my_socket.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, True)
-                my_socket.sendto("D".encode("utf-8"), ('<broadcast>', 30303))
+        reply = self.get_session(request.server_ip).get(write_url, timeout=self.get_timeout(request.server_ip))
+        reply.raise_for_status()
+        self.invalidate_snapshot(request.server_ip)
+        self.schedule_write_refresh(request)
 
-                while True:
-                    response = my_socket.recv(2048)
-                    if response.find(b'{') >= 0:
-                        response = response[response.find(b'{'):response.find(b'}')+1]
-
-                        # This code removes a comma after the last field, which is sent in some older versions of EDS
-                        # products.
-                        comma_err = response.find(b',\r\n}')
-                        if comma_err > 64:
-                            response = response[:comma_err] + b'}'
-
-                        # Unpack the response and add it to the server list.
-                        j = json.loads(response)
-                        master_list.append(j['IP'])
-
-            except socket.timeout:
-                my_socket.close()
-                return sorted(master_list)
-
-            except Exception as e:
-                err = e.args
-                if err[0] == 51:
-                    self.logger.warning("The network is unreachable.")
-                else:
-                    self.logger.exception("General exception")
-                return sorted(master_list)
+        self.logger.debug(f"Write to server URL: {write_url}")
+        self.logger.debug(f"Reply: {reply}")
+        return reply
 
     # =============================================================================
-    def killAllComms(self):  # noqa
+    def schedule_write_refresh(self, request):
         """
-        Set the enabled status of all plugin devices to false.
-        """
-        for dev in indigo.devices.itervalues("self"):
-            if dev.enabled:
-                indigo.device.enable(dev, value=False)
+        Schedule the written device to be polled again shortly, so the change shows up without a full poll
 
-    # =============================================================================
-    def unkillAllComms(self):  # noqa
-        """
-        Set the enabled status of all plugin devices to true.
+        The device is due WRITE_REFRESH_DELAY seconds after the write, which gives the server time to apply it and lets
+        a burst of writes share one poll. Only the device's server is fetched and only the devices that are due are
+        updated (see updateDeviceStates()). The device goes back to its usual schedule afterwards.
+
+        :param WriteRequest request:
         """
-        for dev in indigo.devices.itervalues("self"):
-            if not dev.enabled:
-                indigo.device.enable(dev, value=True)
+        if request.refresh:
+            self.schedule_refresh(request.server_ip, self.get_sensor_ids(request.server_ip, request.rom_id))
 
     # =============================================================================
-    def spot_dead_sensors(self):
+    def schedule_refresh(self, server_ip, dev_ids):
         """
-        Log a warning when a sensor has been offline
+        Make devices due WRITE_REFRESH_DELAY seconds from now and wake the poll loop
 
-        spot_dead_sensors(self): This method compares the time each plugin device was last updated to the current
-        Indigo time. If the difference exceeds a set interval (currently set to 60 seconds), then the sensor's
-        onOffState is set to false and an error is thrown to the log. This condition could be for a number of reasons
-        including sensor fail, wiring fail, 1-Wire network collisions, etc.
+        :param str server_ip:
+        :param list dev_ids:
         """
-        self.logger.debug("spot_dead_sensors() method called.")
-
-        for dev in indigo.devices.itervalues("self"):
-            if dev.enabled:
-                diff_time = indigo.server.getTime() - dev.lastChanged
-                pref_poll = int(self.pluginPrefs.get('configMenuPollInterval', 900))
-                dead_time = dt.timedelta(seconds=pref_poll) + dt.timedelta(seconds=60)
+        if self.replay_session is not None or not self.pluginPrefs.get('refreshAfterWrite', True) or not dev_ids:
+            return
 
-                # If a sensor has been offline for more than the specified amount of time, throw a message to the log
-                # and mark it offline. Starting with 60 seconds.
-                if diff_time <= dead_time:
-                    pass
+        due_time = time.monotonic() + WRITE_REFRESH_DELAY
+        for dev_id in dev_ids:
+            self.schedule_device(dev_id, due_time)
 
-                else:
-                    self.logger.warning(
-                        f"{dev.name} hasn't been updated in {diff_time}. If this condition persists, check it's "
-                        f"connection."
-                    )
-                    try:
-                        dev.updateStateOnServer('onOffState', value=False, uiValue="")
-                    except Exception:  # noqa
-                        self.logger.exception("General exception:")
-                        self.logger.warning("Unable to spot dead sensors.")
+        self.logger.debug(f"Refreshing {len(dev_ids)} device(s) on {server_ip} in {WRITE_REFRESH_DELAY} seconds.")
+        self.poll_wakeup.set()
 
     # =============================================================================
-    def humidex_convert(self, ows_humidex):
+    def get_sensor_ids(self, server_ip, rom_id):
         """
-        Title Placeholder
+        Return the IDs of the enabled sensor devices that read a sensor
 
-        humidex_convert(self): This method converts any humidex values used in the plugin based on user preference:
-        self.pluginPrefs['configMenuHumidexDec'].
+        The lookup is built from indigo.devices on first use and rebuilt after any device starts or stops, so a write
+        doesn't have to scan every device.
 
-        :param str ows_humidex:
+        :param str server_ip:
+        :param str rom_id:
+        :return list:
         """
-        self.logger.debug("  Converting humidex values.")
-
-        try:
-            # Format the humidex value to the requested number of decimal places.
-            format_humidex = f"%.{self.pluginPrefs.get('configMenuHumidexDec', '1')}f"
-            ows_humidex = float(ows_humidex)
-            ows_humidex = format_humidex % ows_humidex
-            return ows_humidex
+        with self.sensor_ids_lock:
+            if self.sensor_ids is None:
+                self.sensor_ids = {}
+                for dev in indigo.devices.itervalues("self"):
+                    if dev.enabled and dev.deviceTypeId in SENSOR_FAMILIES:
+                        key = (dev.pluginProps.get('serverList', ''), dev.pluginProps.get('romID', ''))
+                        self.sensor_ids.setdefault(key, []).append(dev.id)
 
-        except Exception:  # noqa
-            self.logger.exception("General exception:")
-            self.logger.warning("Error formatting humidex value. Returning value unchanged.")
-            return ows_humidex
+            return list(self.sensor_ids.get((server_ip, rom_id), []))
 
     # =============================================================================
-    def humidity_convert(self, ows_humidity):
+    def invalidate_sensor_ids(self):
         """
-        Title Placeholder
+        Rebuild the sensor device lookup the next time it is used
 
-        humidity_convert(self): This method converts any humidity values used in the plugin based on user preference:
-        self.pluginPrefs['configMenuHumidityDec'].
+        :return:
+        """
+        with self.sensor_ids_lock:
+            self.sensor_ids = None
 
-        :param str ows_humidity:
+    # =============================================================================
+    def log_write_result(self, request, announce=False):
         """
-        self.logger.debug("  Converting humidity values.")
+        Log the outcome of a queued write
 
-        try:
-            # Format the humidity value to the requested number of decimal places.
-            format_humidity = f"%.{self.pluginPrefs.get('configMenuHumidityDec', '1')}f"
-            ows_humidity    = float(ows_humidity)
-            ows_humidity    = format_humidity % ows_humidity
-            return ows_humidity
+        :param WriteRequest request:
+        :param bool announce: log success at the info level rather than debug.
+        """
+        if request.future.cancelled():
+            self.logger.warning(f"Write to {request.server_ip} cancelled: {request.rom_id} {request.variable}")
 
-        except Exception:  # noqa
-            self.logger.exception("General exception:")
-            self.logger.warning("Error formatting humidity value. Returning value unchanged.")
-            return ows_humidity
+        elif request.future.exception() is not None:
+            self.logger.warning(
+                f"Write to {request.server_ip} failed: {request.rom_id} {request.variable}={request.value} "
+                f"({request.future.exception()})"
+            )
+
+        elif request.future.result() is None:
+            self.logger.debug(
+                f"Write to {request.server_ip} not sent: {request.rom_id} {request.variable} was toggled back first."
+            )
+
+        elif announce:
+            self.logger.info(f"{request.variable}: {request.value} written successfully.")
+
+        else:
+            self.logger.debug(
+                f"Write to {request.server_ip} complete: {request.rom_id} {request.variable}={request.value} "
+                f"({time.monotonic() - request.queued_at:.2f} seconds)"
+            )
 
     # =============================================================================
-    def pressure_convert(self, ows_pressure):
+    def dumpXML(self, values_dict, type_id):  # noqa
         """
         Title Placeholder
 
-        pressure_convert(self): This method converts any pressure values used in the plugin based on user preference:
-        self.pluginPrefs['configMenuPressureDec'].
-
-        :param float ows_pressure:
-        """
-        self.logger.debug("  Converting pressure values.")
-
-        try:
-            # Format the pressure value to the requested number of decimal places.
-            format_pressure = f"%.{self.pluginPrefs.get('configMenuPressureDec', '1')}f"
-            ows_pressure = float(ows_pressure)
-            ows_pressure = format_pressure % ows_pressure
-            return ows_pressure
-
-        except Exception:  # noqa
-            self.logger.exception("General exception:")
-            self.logger.warning("Error formatting pressure value. Returning value unchanged.")
-            return ows_pressure
-
-    # =============================================================================
-    def temp_convert(self, ows_temp):
-        """
-        Title Placeholder
-
-        temp_convert(self): This method converts any temperature values used in the plugin based on user preference:
-        self.pluginPrefs['configMenuDegreesDec']. This method returns a string that is formatted based on user
-        preferences.
+        dumpXML(self, values_dict): This method grabs a copy of the details.xml file from the server at the specified
+        IP address, parses it, and dumps a copy to a log file. The purpose is for the user to be able to confirm that
+        the 1-Wire server is online and that the plugin can talk to it. Log file is written to the Indigo server logs
+        folder. A details.xml snapshot from the last poll is used if it is still fresh.
 
-        :param float ows_temp:
+        :param indigo.Dict values_dict:
+        :param int type_id:
         """
-        self.logger.debug("  Converting temperature values.")
+        self.logger.debug("Dumping details.xml file to Indigo log file...")
 
-        # Format the temperature value to the requested number of decimal places.
-        format_temp = f"%.{self.pluginPrefs.get('configMenuDegreesDec', '1')}f"
+        addr = values_dict['writeToServer']
+        split_ip = addr.replace(" ", "").split(",")
 
-        if self.pluginPrefs.get('configMenuDegrees', 'F') == "C":
-            ows_temp = float(ows_temp)
-            ows_temp = format_temp % ows_temp
+        for server_ip in split_ip:
+            try:
+                ows_xml = self.get_details_snapshot(server_ip)
+                if values_dict['writeXMLToLog']:
+                    file_name = f"{indigo.server.getLogsFolderPath()}/{dt.datetime.today().date()} OWServer.txt"
+                    with open(file_name, "w", encoding='utf-8') as data:
+                        data.write("OWServer details.xml Log\n")
+                        data.write(f"Written at: {dt.datetime.today()}\n")
+                        data.write("=" * 72 + "\n")
+                        data.write(str(ows_xml))
 
-        elif self.pluginPrefs.get('configMenuDegrees', 'F') != "C":
-            ows_temp = float(ows_temp) * 1.8000 + 32.00
-            ows_temp = format_temp % ows_temp
+                if not ows_xml:
+                    self.logger.critical(f"OWServer IP: {server_ip} failed.")
+                else:
+                    indigo.server.log(f"OWServer IP: {server_ip} passed.")
 
-        return ows_temp
+            except Exception:  # noqa
+                self.logger.exception("General exception:")
+                self.logger.warning("Can't dump XML to log. Check server connection.")
 
     # =============================================================================
-    def volts_convert(self, ows_volts):
+    def showPollTiming(self, values_dict, type_id):  # noqa
         """
-        Title Placeholder
+        Log a summary of the poll timing histograms
 
-        volts_convert(self): This method converts any voltages values used in the plugin based on user preference:
-        self.pluginPrefs['configMenuVoltsDec']. This method returns a string that is formatted based on user
-        preferences.
+        Per-server phase times are totals for one poll of that server. Device and device type times are the cost of a
+        single device update. All times are in milliseconds. Servers with writes still queued show how many are
+        waiting. The full histograms can optionally be written as JSON to the Indigo server logs folder.
 
-        :param str ows_volts:
+        :param indigo.Dict values_dict:
+        :param int type_id:
         """
-        self.logger.debug("  Converting volts values.")
+        self.logger.debug("showPollTiming() method called.")
+        report = self.poll_stats.summary()
 
-        # Format the value to the requested number of decimal places.
-        format_volts = f"%.{self.pluginPrefs.get('configMenuVoltsDec', '1')}f"
-        ows_volts    = float(ows_volts)
-        ows_volts    = format_volts % ows_volts
-        return ows_volts
+        def line(name, summary):
+            return (
+                f"{name:<40} n={summary['count']:<5} mean={summary['mean']:>10.3f} p50={summary['p50']:>10.3f} "
+                f"p90={summary['p90']:>10.3f} p99={summary['p99']:>10.3f} max={summary['max']:>10.3f}"
+            )
 
-    # =============================================================================
-    # ================== Server and Sensor Device Update Methods ==================
-    # =============================================================================
-    def updateOWServer(self, dev, root, server_ip):  # noqa
-        """
-        Title Placeholder
+        lines = ["OWServer Poll Timing (ms)"]
+        for phase, summary in report.get('cycle', {}).get('all', {}).items():
+            lines.append(line(f"cycle {phase}", summary))
 
-        Server Type: Covers OWSERVER-ENET Rev. 1 and Rev. 2
+        for server_ip, phases in report.get('server', {}).items():
+            for phase, summary in phases.items():
+                lines.append(line(f"{server_ip} {phase}", summary))
 
-        :param indigo.Device dev:
-        :param JSON root:
-        :param str server_ip:
-        """
-        self.logger.debug("updateOWServer() method called.")
+        # The slowest device types and devices are the ones most worth looking at.
+        for group in ('family', 'device'):
+            slowest = sorted(report.get(group, {}).items(), key=lambda item: item[1]['update']['p90'], reverse=True)
+            for name, phases in slowest[:10]:
+                lines.append(line(name, phases['update']))
 
-        try:
-            server_state_dict = self.state_dict.server_state_dict()
+        # Writes still waiting in each server's write lane.
+        for server_ip, waiting in sorted(self.write_queue.pending().items()):
+            lines.append(f"{server_ip} writes waiting: {waiting}")
 
-            for key, value in server_state_dict.items():
-                try:
-                    dev.updateStateOnServer(key, value=root.find(self.xmlns + value).text)
-                except AttributeError:
-                    dev.updateStateOnServer(key, value="Unsupported")
+        indigo.server.log(self.pad_log.join(lines))
 
+        if values_dict.get('writeTimingToFile', False):
+            file_name = f"{indigo.server.getLogsFolderPath()}/{dt.datetime.today().date()} OWServer Timing.json"
             try:
-                devices_connected = root.find(self.xmlns + 'DevicesConnected').text
-                if devices_connected == "1":
-                    input_value = f"{devices_connected} sensor"
-                else:
-                    input_value = f"{devices_connected} sensors"
-                dev.updateStateOnServer('onOffState', value=True, uiValue=input_value)
-                dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOn)
+                with open(file_name, "w", encoding='utf-8') as data:
+                    json.dump(report, data, indent=2)
+                indigo.server.log(f"Poll timing written to {file_name}")
 
             except Exception:  # noqa
-                self.logger.debug(f"Unable to update device state on server. Device: {dev.name}")
-                dev.updateStateImageOnServer(indigo.kStateImageSel.Error)
-                dev.updateStateOnServer('onOffState', value=False, uiValue=" ")
                 self.logger.exception("General exception:")
+                self.logger.warning("Unable to write poll timing file.")
 
-            new_props = dev.pluginProps
-            new_props['address'] = dev.states['owsMACAddress']
-            dev.replacePluginPropsOnServer(new_props)
-            self.number_of_servers += 1
+        return True
 
-            self.logger.debug("Success. Polling next server if appropriate.")
-            return True
+    # =============================================================================
+    def start_metrics_exporter(self):
+        """
+        Start (or restart) the metrics exporter selected in the plugin prefs
+
+        :return:
+        """
+        self.stop_metrics_exporter()
+        exporter = self.pluginPrefs.get('metricsExporter', 'none')
+
+        try:
+            match exporter:
+                case "prometheus":
+                    port = int(self.pluginPrefs.get('metricsPort', 9788))
+                    self.metrics_exporter = PrometheusExporter(port)
+                    self.logger.info(f"Serving Prometheus metrics on port {port}.")
+                case "statsd":
+                    host = self.pluginPrefs.get('statsdHost', '127.0.0.1')
+                    port = int(self.pluginPrefs.get('statsdPort', 8125))
+                    self.metrics_exporter = StatsdExporter(host, port)
+                    self.logger.info(f"Sending StatsD metrics to {host}:{port}.")
 
         except Exception:  # noqa
-            self.logger.critical("Server update failure. Check settings.")
             self.logger.exception("General exception:")
-            dev.updateStateOnServer('onOffState', value=False, uiValue=" ")
-            dev.updateStateImageOnServer(indigo.kStateImageSel.Error)
-            return False
+            self.logger.warning("Unable to start the metrics exporter.")
 
-    #  =============================================================================
-    def updateDS18B20(self, dev, ows_sensor, server_ip):  # noqa
+    # =============================================================================
+    def stop_metrics_exporter(self):
         """
-        Title Placeholder
+        Stop the metrics exporter if one is running
 
-        DS18B20 Description = "Programmable resolution thermometer"
+        :return:
+        """
+        if self.metrics_exporter is not None:
+            self.metrics_exporter.close()
+            self.metrics_exporter = None
 
-        :param indigo.Device dev:
-        :param XML ows_sensor:
-        :param str server_ip:
+    # =============================================================================
+    def publish_metrics(self, cycle_time):
         """
-        self.logger.debug("updateDS18B20() method called.")
+        Send the poll health metrics to the metrics exporter
 
-        try:
-            ds18b20_state_dict = self.state_dict.ds18b20_state_dict()
+        :param float cycle_time: seconds the poll took.
+        """
+        if self.metrics_exporter is None:
+            return
 
-            for key, value in ds18b20_state_dict.items():
-                try:
-                    if key == "owsTemperature":
-                        ows_temp    = ows_sensor.find(self.xmlns + 'Temperature').text
-                        comp_val    = dev.pluginProps.get('DS18B20TempComp', '0.0')
-                        input_value = float(ows_temp) + float(comp_val)
-                        input_value = self.temp_convert(input_value)
-                        dev.updateStateOnServer(key, value=input_value)
-                    else:
-                        dev.updateStateOnServer(key, value=ows_sensor.find(self.xmlns + value).text)
-                except Exception:  # noqa
-                    self.logger.exception("General exception:")
-                    self.logger.debug(f"Unable to update device state on server. Device: {dev.name}")
-                    self.logger.debug(f"Key: {key} : Value: Unsupported")
-                    dev.updateStateOnServer(key, value="Unsupported")
+        metrics = [
+            ('owserver_servers_polled', 'gauge', "Servers polled in the last poll.", {}, self.number_of_servers),
+            ('owserver_sensors_updated', 'gauge', "Sensor devices updated in the last poll.", {},
+             self.number_of_sensors),
+            ('owserver_dead_sensors', 'gauge', "Devices that haven't been updated within their polling interval.", {},
+             self.dead_sensors),
+            ('owserver_state_writes', 'gauge', "Device states written in the last poll.", {}, self.cycle_state_writes),
+            ('owserver_prop_writes', 'gauge', "Device props saved in the last poll.", {}, self.cycle_prop_writes),
+            ('owserver_poll_seconds', 'gauge', "Duration of the last poll.", {}, round(cycle_time, 6)),
+        ]
 
-            try:
-                ows_temp    = ows_sensor.find(self.xmlns + 'Temperature').text
-                comp_val    = dev.pluginProps.get('DS18B20TempComp', '0.0')
-                input_value = float(ows_temp) + float(comp_val)
-                input_value = self.temp_convert(input_value)
-                dev.updateStateOnServer('sensorValue', value=input_value, uiValue=input_value)
-            except Exception:  # noqa
-                self.logger.exception("General exception:")
-                self.logger.debug(f"Unable to update device state on server. Device: {dev.name}")
-                dev.updateStateOnServer('sensorValue', value="Unsupported", uiValue="Unsupported")
-                dev.updateStateImageOnServer(indigo.kStateImageSel.Error)
+        with self.latencies_lock:
+            latencies = {server_ip: samples[-1] for server_ip, samples in self.latencies.items() if samples}
+
+        for server_ip, latency in sorted(latencies.items()):
+            metrics.append(('owserver_fetch_latency_seconds', 'gauge', "Last details.xml response time.",
+                            {'server': server_ip}, round(latency, 6)))
+
+        for server_ip, failures in sorted(self.fetch_failures.items()):
+            metrics.append(('owserver_fetch_failures_total', 'counter', "Failed details.xml fetches.",
+                            {'server': server_ip}, failures))
 
-            props = ['UserByte1', 'UserByte2']
-            self.populate_props(dev, props, ows_sensor, "DS18B20")
+        for server_ip, mismatches in sorted(self.write_mismatches.items()):
+            metrics.append(('owserver_write_mismatches_total', 'counter',
+                            "LED and relay writes shown as pending that the server didn't confirm.",
+                            {'server': server_ip}, mismatches))
 
+        for server_ip, values in sorted(self.eds_metrics.items()):
+            for key, value in sorted(values.items()):
+                name = f"owserver_eds_{re.sub(r'(?<!^)(?=[A-Z])', '_', key).lower()}"
+                metrics.append((name, 'gauge', f"{key} reported by the EDS server.", {'server': server_ip}, value))
+
+        try:
+            self.metrics_exporter.publish(metrics)
         except Exception:  # noqa
-            self.logger.critical("Sensor update failure. Check connection.")
             self.logger.exception("General exception:")
-            dev.updateStateOnServer('onOffState', value=False, uiValue=" ")
-            dev.updateStateImageOnServer(indigo.kStateImageSel.Error)
-            return False
+            self.logger.warning("Unable to publish metrics.")
 
-    #  =============================================================================
-    def updateDS18S20(self, dev, ows_sensor, server_ip):  # noqa
+    # =============================================================================
+    @staticmethod
+    def capture_folder():
         """
-        Title Placeholder
+        Return the folder that holds the traffic capture archive
 
-        DS18S20 Description = "Parasite Power Thermometer"
+        :return str:
+        """
+        return f"{indigo.server.getLogsFolderPath()}/OWServer Captures"
 
-        :param indigo.Device dev:
-        :param XML ows_sensor:
-        :param str server_ip:
+    # =============================================================================
+    def start_traffic_capture(self):
         """
-        self.logger.debug("updateDS18S20() method called.")
+        Start or stop capturing details.xml to the archive as selected in the plugin prefs
 
-        try:
-            ds18s20_state_dict = self.state_dict.ds18s20_state_dict()
+        :return:
+        """
+        if self.pluginPrefs.get('captureTraffic', False):
+            if self.traffic_capture is None:
+                self.traffic_capture = TrafficCapture(self.capture_folder())
+                self.logger.info(f"Capturing details.xml to {self.capture_folder()}")
+        else:
+            self.traffic_capture = None
 
-            for key, value in ds18s20_state_dict.items():
-                try:
-                    if key == "owsTemperature":
-                        ows_temp    = ows_sensor.find(self.xmlns + 'Temperature').text
-                        comp_val    = dev.pluginProps.get('DS18S20TempComp', '0.0')
-                        input_value = float(ows_temp) + float(comp_val)
-                        input_value = self.temp_convert(input_value)
-                        dev.updateStateOnServer(key, value=input_value)
-                    else:
-                        dev.updateStateOnServer(key, value=ows_sensor.find(self.xmlns + value).text)
-                except Exception:  # noqa
-                    self.logger.exception("General exception:")
-                    self.logger.debug(f"Unable to update device state on server. Device: {dev.name}")
-                    self.logger.debug(f"Key: {key} : Value: Unsupported")
-                    dev.updateStateOnServer(key, value="Unsupported")
+    # =============================================================================
+    def getCaptureList(self, fltr="", values_dict=None, type_id="", target_id=0):  # noqa
+        """
+        Return the capture files that can be replayed, newest first
 
-            try:
-                ows_temp    = ows_sensor.find(self.xmlns + 'Temperature').text
-                comp_val    = dev.pluginProps.get('DS18S20TempComp', '0.0')
-                input_value = float(ows_temp) + float(comp_val)
-                input_value = self.temp_convert(input_value)
-                dev.updateStateOnServer('sensorValue', value=input_value, uiValue=input_value)
-            except Exception:  # noqa
-                self.logger.debug(f"Unable to update device state on server. Device: {dev.name}")
-                dev.updateStateOnServer('sensorValue', value="Unsupported", uiValue="Unsupported")
-                dev.updateStateImageOnServer(indigo.kStateImageSel.Error)
+        :param str fltr:
+        :param indigo.Dict values_dict:
+        :param str type_id:
+        :param int target_id:
+        :return list:
+        """
+        files = archive_files(self.capture_folder())
+        return [("all", "All Capture Files")] + [(path.name, path.name) for path in reversed(files)]
 
-            props = ['UserByte1', 'UserByte2']
-            self.populate_props(dev, props, ows_sensor, "DS18S20")
+    # =============================================================================
+    def replayTrafficMenu(self, values_dict, type_id):  # noqa
+        """
+        Start replaying captured details.xml in the background when it is called for from a Menu item.
 
-        except Exception:  # noqa
-            self.logger.critical("Sensor update failure. Check connection.")
-            self.logger.exception("General exception:")
-            dev.updateStateOnServer('onOffState', value=False, uiValue=" ")
-            dev.updateStateImageOnServer(indigo.kStateImageSel.Error)
+        :param indigo.Dict values_dict:
+        :param str type_id:
+        :return:
+        """
+        self.logger.debug("replayTrafficMenu() method called.")
+
+        if self.replay_thread is not None and self.replay_thread.is_alive():
+            self.logger.warning("A replay is already running. Use Stop Replay to end it.")
             return False
 
-    #  =============================================================================
-    def updateDS2406(self, dev, ows_sensor, server_ip):  # noqa
+        files = archive_files(self.capture_folder())
+        choice = values_dict.get('replayArchive', 'all')
+        if choice != 'all':
+            files = [path for path in files if path.name == choice]
+
+        if not files:
+            self.logger.warning("There are no captures to replay. Turn on Capture Traffic in the plugin config.")
+            return False
+
+        self.replay_stop.clear()
+        self.replay_thread = threading.Thread(
+            target=self.replay_traffic, args=(files, float(values_dict.get('replaySpeed', 0))), daemon=True
+        )
+        self.replay_thread.start()
+        return True
+
+    # =============================================================================
+    def stopReplayMenu(self):  # noqa
         """
-        Title Placeholder
+        Stop a running replay when it is called for from a Menu item.
 
-        DS2406 Description = "Dual Addressable Switch Plus Memory"
+        :return:
+        """
+        self.replay_stop.set()
 
-        :param indigo.Device dev:
-        :param XML ows_sensor:
-        :param str server_ip:
+    # =============================================================================
+    def replay_traffic(self, files, speed):
+        """
+        Feed captured details.xml back through the normal poll pipeline
+
+        Captures are grouped into the polls they came from (see trafficArchive.group_polls()) and each poll is run with
+        updateDeviceStates() for the devices on the captured servers. With a speed of 1 the polls are replayed at the
+        pace they were captured, with 10 at ten times that pace, and with 0 as fast as they can be processed. Live
+        polling is paused and writes are refused until the replay ends. Replayed polls leave the circuit breakers,
+        metrics, adaptive polling, dead sensor tracking and details.xml snapshots alone.
+
+        :param list files: capture files, oldest first.
+        :param float speed:
+        :return:
         """
-        self.logger.debug("updateDS2406() method called.")
+        indigo.server.log(f"Replaying captured traffic from {len(files)} file(s).")
+        self.replay_session = ReplaySession()
+        polls = 0
+        previous = None
 
         try:
-            ds2406_state_dict = self.state_dict.ds2406_state_dict()
-            input_value = None
+            for poll_time, bodies in group_polls(read_archive(files), REPLAY_POLL_GAP):
+                if speed and previous is not None and self.replay_stop.wait((poll_time - previous) / speed):
+                    break
+                if self.replay_stop.is_set():
+                    break
+                previous = poll_time
+
+                self.replay_session.bodies = bodies
+                due = {
+                    dev.id for dev in indigo.devices.itervalues("self")
+                    if dev.pluginProps.get('serverList', '') in bodies
+                }
+                self.updateDeviceStates(due=due, replay=True)
+                polls += 1
 
-            for key, value in ds2406_state_dict.items():
-                try:
-                    dev.updateStateOnServer(key, value=ows_sensor.find(self.xmlns + value).text)
-                except Exception:  # noqa
-                    self.logger.exception("General exception:")
-                    self.logger.debug(f"Unable to update device state on server. Device: {dev.name}")
-                    self.logger.debug(f"Key: {key} : Value: Unsupported")
-                    dev.updateStateOnServer(key, value="Unsupported")
+        except Exception:  # noqa
+            self.logger.exception("General exception:")
 
-            # The user can select which of the following values become the main sensorValue.
-            try:
-                match dev.pluginProps['prefSensorValue2406']:
-                    case "I_A":  # Input Level A
-                        input_value = ows_sensor.find(self.xmlns + 'InputLevel_A').text
-                        if input_value == "0":
-                            dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOn)
-                        else:
-                            dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-                    case "I_B":  # Input Level B
-                        input_value = ows_sensor.find(self.xmlns + 'InputLevel_B').text
-                        if input_value == "0":
-                            dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOn)
-                        else:
-                            dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-
-                dev.updateStateOnServer('sensorValue', value=input_value, uiValue=input_value)
+        finally:
+            self.replay_session = None
+            indigo.server.log(f"Replay finished after {polls} polls. Live polling has resumed.")
 
-            except Exception:  # noqa
-                self.logger.exception("General exception:")
-                self.logger.debug(f"Unable to update device state on server. Device: {dev.name}")
-                dev.updateStateOnServer('sensorValue', value="Unsupported", uiValue="Unsupported")
-                dev.updateStateImageOnServer(indigo.kStateImageSel.Error)
+    # =============================================================================
+    def get_session(self, server_ip):
+        """
+        Return the pooled HTTP session for a server, creating it if needed
 
-            new_props = dev.pluginProps
-            new_props['DS2406ActivityLatchReset'] = ows_sensor.find(self.xmlns + 'ActivityLatchReset').text
-            new_props['address'] = dev.states['owsRomID']
-            dev.replacePluginPropsOnServer(new_props)
+        Every request to an EDS server goes through its session so that connections are kept alive and reused rather
+        than paying for a new TCP handshake on each poll and write. Sessions live for the life of the plugin and are
+        rebuilt when the plugin preferences are saved.
 
-            self.number_of_sensors += 1
+        :param str server_ip:
+        :return requests.Session:
+        """
+        with self.sessions_lock:
+            session = self.sessions.get(server_ip)
 
-            dev.updateStateOnServer('onOffState', value=True, uiValue=" ")
-            self.logger.debug("Success. Polling next sensor if appropriate.")
-            return True
+            if session is None:
+                session = requests.Session()
+                # A poll, a write and a menu item's fetch can all reach the same server at once, so pool a connection
+                # for each rather than opening and discarding extras.
+                session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=SESSION_POOL_SIZE))
+                self.sessions[server_ip] = session
 
-        except Exception:  # noqa
-            self.logger.critical("Sensor update failure. Check connection.")
-            self.logger.exception("General exception:")
-            dev.updateStateOnServer('onOffState', value=False, uiValue=" ")
-            dev.updateStateImageOnServer(indigo.kStateImageSel.Error)
-            return False
+            return session
 
-    #  =============================================================================
-    def updateDS2408(self, dev, ows_sensor, server_ip):  # noqa
+    # =============================================================================
+    def get_timeout(self, server_ip):
         """
-        Title Placeholder
+        Return the (connect, read) timeout for requests to a server
 
-        DS2408 Description = "8-Channel Addressable Switch"
+        The connect timeout is kept short so that a server that is powered off fails quickly, while the read timeout
+        gives a slow server time to answer. With automatic timeouts turned on, both are set to the 99th percentile of
+        the server's recent response times multiplied by AUTO_TIMEOUT_FACTOR, no shorter than AUTO_TIMEOUT_MIN and no
+        longer than the configured timeouts. Automatic timeouts wait until AUTO_TIMEOUT_SAMPLES responses have been
+        seen.
 
-        :param indigo.Device dev:
-        :param XML ows_sensor:
         :param str server_ip:
+        :return tuple:
         """
-        self.logger.debug("updateDS2408() method called.")
+        connect_timeout = float(self.pluginPrefs.get('configMenuConnectTimeout', 3))
+        read_timeout    = float(self.pluginPrefs.get('configMenuServerTimeout', 15))
 
-        try:
-            ds2408_state_dict = self.state_dict.ds2408_state_dict()
-            input_value = None
-
-            for key, value in ds2408_state_dict.items():
-                try:
-                    dev.updateStateOnServer(key, value=ows_sensor.find(self.xmlns + value).text)
-                except Exception:  # noqa
-                    self.logger.exception("General exception:")
-                    self.logger.debug(f"Unable to update device state on server. Device: {dev.name}")
-                    self.logger.debug(f"Key: {key} : Value: Unsupported")
-                    dev.updateStateOnServer(key, value="Unsupported")
+        if self.pluginPrefs.get('autoTimeout', False):
+            with self.latencies_lock:
+                samples = sorted(self.latencies.get(server_ip, ()))
 
-            # The user can select which of the following values become the main sensorValue.
-            try:
-                # We need to parse the switch state out of the binary number stored in PIOOutputLatchState.
-                latch_state     = float(dev.states['owsPIOOutputLatchState'])
-                latch_state_int = int(latch_state)
-                latch_state_bin = int(bin(latch_state_int)[2:])
-                latch_state_str = str(latch_state_bin)
-                latch_state_str = latch_state_str.zfill(8)
-
-                # These states don't exist in the details.xml file. We impute them from <PIOOutputLatchState>.
-                for _ in range(0, 8):
-                    dev.updateStateOnServer(f'owsInput{_}', value=latch_state_str[_])
-
-                match dev.pluginProps['prefSensorValue2408']:
-                    case "S_0":  # Switch 0
-                        input_value = latch_state_str[7]
-                        if input_value == "0":
-                            dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOn)
-                        else:
-                            dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-                    case "S_1":  # Switch 1
-                        input_value = latch_state_str[6]
-                        if input_value == "0":
-                            dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOn)
-                        else:
-                            dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-                    case "S_2":  # Switch 2
-                        input_value = latch_state_str[5]
-                        if input_value == "0":
-                            dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOn)
-                        else:
-                            dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-                    case "S_3":  # Switch 3
-                        input_value = latch_state_str[4]
-                        if input_value == "0":
-                            dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOn)
-                        else:
-                            dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-                    case "S_4":  # Switch 4
-                        input_value = latch_state_str[3]
-                        if input_value == "0":
-                            dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOn)
-                        else:
-                            dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-                    case "S_5":  # Switch 5
-                        input_value = latch_state_str[2]
-                        if input_value == "0":
-                            dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOn)
-                        else:
-                            dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-                    case "S_6":  # Switch 6
-                        input_value = latch_state_str[1]
-                        if input_value == "0":
-                            dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOn)
-                        else:
-                            dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-                    case "S_7":  # Switch 7
-                        input_value = latch_state_str[0]
-                        if input_value == "0":
-                            dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOn)
-                        else:
-                            dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-
-                dev.updateStateOnServer('sensorValue', value=input_value, uiValue=input_value)
+            if len(samples) >= AUTO_TIMEOUT_SAMPLES:
+                p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+                auto_timeout = max(p99 * AUTO_TIMEOUT_FACTOR, AUTO_TIMEOUT_MIN)
+                connect_timeout = min(connect_timeout, auto_timeout)
+                read_timeout    = min(read_timeout, auto_timeout)
 
-            except Exception:  # noqa
-                self.logger.exception("General exception:")
-                self.logger.debug(f"Unable to update device state on server. Device: {dev.name}")
-                dev.updateStateOnServer('sensorValue', value="Unsupported", uiValue="Unsupported")
-                dev.updateStateImageOnServer(indigo.kStateImageSel.Error)
+        return connect_timeout, read_timeout
 
-            props = ['PIOActivityLatchState', 'PIOOutputLatchState', 'PowerOnResetLatch', 'RSTZconfiguration']
+    # =============================================================================
+    def record_latency(self, server_ip, seconds):
+        """
+        Record how long a server took to answer a details.xml request
 
-            self.populate_props(dev, props, ows_sensor, "DS2408")
+        :param str server_ip:
+        :param float seconds:
+        """
+        with self.latencies_lock:
+            self.latencies.setdefault(server_ip, deque(maxlen=LATENCY_HISTORY)).append(seconds)
 
-        except Exception:  # noqa
-            self.logger.critical("Sensor update failure. Check connection.")
-            self.logger.exception("General exception:")
-            dev.updateStateOnServer('onOffState', value=False, uiValue=" ")
-            dev.updateStateImageOnServer(indigo.kStateImageSel.Error)
-            return False
+    # =============================================================================
+    def close_sessions(self):
+        """
+        Close and discard all pooled HTTP sessions
+        """
+        with self.sessions_lock:
+            for session in self.sessions.values():
+                session.close()
+            self.sessions = {}
 
-    #  =============================================================================
-    def updateDS2423(self, dev, ows_sensor, server_ip):  # noqa
+    # =============================================================================
+    def get_details_xml(self, server_ip):
         """
         Title Placeholder
 
-        DS2423 Description = "RAM with Counters"
+        get_details_xml(): This method goes out to the 1-Wire server at the specified OWServerIP address and pulls in a
+        copy of the details.xml file. It doesn't process it any way.
 
-        :param indigo.Device dev:
-        :param XML ows_sensor:
         :param str server_ip:
         """
-        self.logger.debug("updateDS2423() method called.")
+        self.logger.debug("get_details_xml() method called.")
 
         try:
-            ds2423_state_dict = self.state_dict.ds2423_state_dict()
-            input_value = None
+            # The EDS server does not support https://.
+            url      = f"http://{server_ip}/details.xml"  # noqa
+            response = self.get_session(server_ip).get(url, timeout=self.get_timeout(server_ip))
+            self.record_latency(server_ip, response.elapsed.total_seconds())
+            self.logger.debug("details.xml file retrieved successfully.")
+            return response.text
 
-            for key, value in ds2423_state_dict.items():
-                try:
-                    dev.updateStateOnServer(key, value=ows_sensor.find(self.xmlns + value).text)
-                except Exception:  # noqa
-                    self.logger.exception("General exception:")
-                    self.logger.debug(f"Unable to update device state on server. Device: {dev.name}")
-                    self.logger.debug(f"Key: {key} : Value: Unsupported")
-                    dev.updateStateOnServer(key, value="Unsupported")
+        # What happens if we're unsuccessful. No connection to Internet, no response from OWServer. Let's keep trying.
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout, requests.exceptions.HTTPError):
+            self.logger.warning("Unable to make a successful connection to One Wire Server.")
 
-            # The user can select which of the following values become the main sensorValue.
-            try:
-                if dev.pluginProps['prefSensorValue2423'] == "C_A":  # Counter A
-                    input_value = ows_sensor.find(self.xmlns + 'Counter_A').text
-                if dev.pluginProps['prefSensorValue2423'] == "C_B":  # Counter B
-                    input_value = ows_sensor.find(self.xmlns + 'Counter_B').text
+        except Exception:  # noqa
+            self.logger.exception("General exception:")
+            self.logger.warning(
+                "Misc. error downloading details.xml file. If the problem persists, please enable  debugging in the "
+                "OWServer configuration dialog and check user forum for more information."
+            )
+
+    # =============================================================================
+    def get_details_snapshot(self, server_ip):
+        """
+        Return a server's details.xml, from the snapshot cache when possible
 
-                dev.updateStateOnServer('sensorValue', value=input_value, uiValue=input_value)
-                dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
+        Every successful poll leaves a snapshot of each server's details.xml. Snapshots are good for the shortest
+        effective polling interval of the server's devices (see poll_intervals()) and are dropped as soon as anything
+        is written to the server, so the config dialogs and menus can share the poll's copy instead of downloading
+        their own. A stale or missing snapshot is replaced by a fresh download.
 
-            except Exception:  # noqa
-                self.logger.exception("General exception:")
-                self.logger.debug(f"Unable to update device state on server. Device: {dev.name}")
-                dev.updateStateOnServer('sensorValue', value="Unsupported", uiValue="Unsupported")
-                dev.updateStateImageOnServer(indigo.kStateImageSel.Error)
+        :param str server_ip:
+        :return str:
+        """
+        ttl = min(
+            self.poll_intervals(server_ip).values(), default=int(self.pluginPrefs.get('configMenuPollInterval', 900))
+        )
 
-            # The DS2423 does not have any writable parameters.
-            new_props = dev.pluginProps
-            new_props['address'] = dev.states['owsRomID']
-            dev.replacePluginPropsOnServer(new_props)
-            self.number_of_sensors += 1
+        with self.snapshots_lock:
+            snapshot = self.snapshots.get(server_ip)
 
-            dev.updateStateOnServer('onOffState', value=True, uiValue=" ")
-            dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-            self.logger.debug("Success. Polling next sensor if appropriate.")
-            return True
+        if snapshot and time.monotonic() - snapshot[0] < ttl:
+            self.logger.debug(f"Using details.xml snapshot for server {server_ip}.")
+            return snapshot[1]
 
-        except Exception:  # noqa
-            self.logger.critical("Sensor update failure. Check connection.")
-            self.logger.exception("General exception:")
-            dev.updateStateOnServer('onOffState', value=False, uiValue=" ")
-            dev.updateStateImageOnServer(indigo.kStateImageSel.Error)
-            return False
+        ows_xml = self.get_details_xml(server_ip)
+        if ows_xml:
+            self.store_snapshot(server_ip, ows_xml)
+        return ows_xml
 
-    #  =============================================================================
-    def updateDS2438(self, dev, ows_sensor, server_ip):  # noqa
+    # =============================================================================
+    def store_snapshot(self, server_ip, ows_xml):
         """
-        Title Placeholder
+        Save a server's details.xml as its current snapshot
 
-        DS2438 Description = "Smart battery monitor"
+        :param str server_ip:
+        :param str ows_xml:
+        """
+        with self.snapshots_lock:
+            self.snapshots[server_ip] = (time.monotonic(), ows_xml)
+
+    # =============================================================================
+    def invalidate_snapshot(self, server_ip=None):
+        """
+        Drop a server's details.xml snapshot, or every snapshot if no server is given
+
+        Called after anything is written to a server, so that the next reader sees the new values.
 
-        :param indigo.Device dev:
-        :param XML ows_sensor:
         :param str server_ip:
         """
-        self.logger.debug("updateDS2438() method called.")
+        with self.snapshots_lock:
+            if server_ip is None:
+                self.snapshots = {}
+            else:
+                self.snapshots.pop(server_ip, None)
 
-        try:
-            ds2438_state_dict = self.state_dict.ds2438_state_dict()
+    # =============================================================================
+    def getSensorList(self, fltr="indigo.sensor", type_id=0, values_dict=None, target_id=0):  # noqa
+        """
+        Title Placeholder
 
-            for key, value in ds2438_state_dict.items():
-                try:
-                    if key == "owsTemperature":
-                        ows_temp = ows_sensor.find(self.xmlns + 'Temperature').text
-                        comp_val = dev.pluginProps.get('DS2438TempComp', '0.0')
-                        input_value = float(ows_temp) + float(comp_val)
-                        input_value = self.temp_convert(input_value)
-                        dev.updateStateOnServer(key, value=input_value)
-                    else:
-                        dev.updateStateOnServer(key, value=ows_sensor.find(self.xmlns + value).text)
-                except Exception:  # noqa
-                    self.logger.exception("General exception:")
-                    self.logger.debug(f"Unable to update device state on server. Device: {dev.name}")
-                    self.logger.debug(f"Key: {key} : Value: Unsupported")
-                    dev.updateStateOnServer(key, value="Unsupported")
+        getSensorList(): This method constructs a list of 1-Wire sensors that have  been added to all servers. It's
+        called when the user opens up a device config dialog. If there are no sensors left to assign (they have all
+        been assigned to other devices) then the user is sent a message 'No sensors to add.' This string is necessary
+        to address conditions where the method returns a noneType value instead of a list (Indigo throws an error when
+        this happens.) The list is built from the details.xml snapshots, so opening a dialog doesn't have to go back to
+        every server.
+
+        :param str fltr:
+        :param str type_id:
+        :param indigo.Dict values_dict:
+        :param str target_id:
+        """
+        self.logger.debug("getSensorList() method called.")
+        self.logger.debug("Generating list of 1-Wire sensors...")
 
+        server_list        = self.pluginPrefs.get('OWServerIP', None)
+        clean_server_list  = server_list.replace(' ', '').split(',')
+        sorted_server_list = sorted(clean_server_list)
+        sorted_sensor_list = []
+        sensor_id_list     = []
+
+        for IP in sorted_server_list:
             try:
-                ows_temp = ows_sensor.find(self.xmlns + 'Temperature').text
-                comp_val = dev.pluginProps.get('DS2438TempComp', '0.0')
-                input_value = float(ows_temp) + float(comp_val)
-                input_value = self.temp_convert(input_value)
-                dev.updateStateOnServer('sensorValue', value=input_value, uiValue=input_value)
+                # Build a list of ROM IDs for all 1-Wire sensors on the network. We start by parsing out a list of all
+                # ROM IDs in the source details.xml file. The resulting list is called "sensorID_list"
+                ows_xml = self.get_details_snapshot(IP)
+                rom_ids = [payload[0] for kind, payload in self.parse_details_xml([ows_xml]) if kind == 'sensor']
+                self.logger.debug(f"Sensors found on server {IP}: {rom_ids}")
+                sensor_id_list += rom_ids
+
+                # If the list is empty, there are no ROM IDs in details.xml. Let's proceed with an empty list.
+                if sensor_id_list is None:
+                    sensor_id_list = []
+
+                # Sort the list (to make it easy to find the ROM ID needed), and return the list.
+                sorted_sensor_list = sorted(sensor_id_list)
+
             except Exception:  # noqa
                 self.logger.exception("General exception:")
-                self.logger.debug(f"Unable to update device state on server. Device: {dev.name}")
-                dev.updateStateOnServer('sensorValue', value="Unsupported", uiValue="Unsupported")
-                dev.updateStateImageOnServer(indigo.kStateImageSel.Error)
+                self.logger.debug("Error reading sensor data from servers.")
+                sorted_sensor_list = ["Error reading data from servers."]
+
+        return sorted_sensor_list
+
+    # =============================================================================
+    def getServerList(self, fltr="indigo.sensor", type_id=0, values_dict=None, target_id=0):  # noqa
+        """
+        Title Placeholder
 
-            # The DS2438 does not have any writable parameters.
-            new_props = dev.pluginProps
-            new_props['address'] = dev.states['owsRomID']
-            dev.replacePluginPropsOnServer(new_props)
-            self.number_of_sensors += 1
+        getServerList(): This method provides the callback for defining server devices. It obtains its list of server
+        IP addresses from one of two distinct procedures: (1) automatic server detection, and (2) manual declaration of
+        server IPs. Within the plugin configuration dialog, the user either accepts automatic detection or else enters
+        a comma delimited list of addresses. Despite whichever procedure is used, getServerList() returns a list
+        (sorted_server_list) containing the list of IPs. This list is used to assign IP addresses when the user creates
+        OWServer devices.
+
+        Automatically detected servers come from the discovery cache, so the list is returned immediately. If nothing
+        has been discovered yet, a discovery is started in the background and the list fills in on the next reload.
+
+        :param str fltr:
+        :param str type_id:
+        :param indigo.Dict values_dict:
+        :param int target_id:
+        """
+        self.logger.debug("getServerList() method called.")
+
+        if not self.pluginPrefs.get('autoDetectServers', True):
+            server_list        = self.pluginPrefs.get('OWServerIP', None)
+            clean_server_list  = server_list.replace(" ", "").split(",")
+            sorted_server_list = sorted(clean_server_list)
+            return sorted_server_list
+
+        else:
+            with self.discovery_lock:
+                master_list = list(self.discovered_servers)
+
+            if not master_list:
+                self.start_discovery()
+
+            return sorted(master_list)
+
+    # =============================================================================
+    def getBulkServerList(self, fltr="indigo.sensor", type_id=0, values_dict=None, target_id=0):  # noqa
+        """
+        Return the server list with an "All Servers" choice at the top, for bulk operations
+
+        :param str fltr:
+        :param str type_id:
+        :param indigo.Dict values_dict:
+        :param int target_id:
+        :return list:
+        """
+        return [("all", "All Servers")] + [(server_ip, server_ip) for server_ip in self.getServerList()]
+
+    # =============================================================================
+    def discoverServersMenu(self):  # noqa
+        """
+        Start a server discovery when it is called for from a Menu item.
 
-            dev.updateStateImageOnServer(indigo.kStateImageSel.TemperatureSensor)
-            dev.updateStateOnServer('onOffState', value=True, uiValue=" ")
-            self.logger.debug("Success. Polling next sensor if appropriate.")
+        :return:
+        """
+        if self.start_discovery():
+            indigo.server.log("Server discovery started.")
+        else:
+            indigo.server.log("Server discovery is already running.")
+
+    # =============================================================================
+    def start_discovery(self):
+        """
+        Run discover_servers() on a background thread unless a discovery is already running
+
+        :return bool: True if a discovery was started.
+        """
+        with self.discovery_lock:
+            if self.discovery_thread is not None and self.discovery_thread.is_alive():
+                return False
+
+            self.last_discovery = time.monotonic()
+            self.discovery_thread = threading.Thread(
+                target=self.discover_servers, name="OWServerDiscovery", daemon=True
+            )
+            self.discovery_thread.start()
             return True
 
+    # =============================================================================
+    def discover_servers(self):
+        """
+        Broadcast an EDS discovery request and update the discovery cache with the servers that answer
+
+        EDS servers answer a "D" sent to UDP port 30303 with a JSON blob that includes their IP. Responses are read
+        until none has arrived for DISCOVERY_QUIET_TIME seconds (or DISCOVERY_MAX_TIME has passed), using a timeout on
+        this socket only so the process-wide default timeout is left alone. The receive buffer is enlarged so that a
+        burst of answers from a large subnet isn't dropped. Each server's last-seen time is recorded, servers that
+        haven't answered for DISCOVERY_EXPIRY seconds are dropped, and the cache is saved to the plugin prefs.
+        """
+        self.logger.debug("discover_servers() method called.")
+        found = {}
+        deadline = time.monotonic() + DISCOVERY_MAX_TIME
+
+        try:
+            with socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP) as my_socket:
+                my_socket.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, True)
+                my_socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 256 * 1024)
+                my_socket.settimeout(DISCOVERY_QUIET_TIME)
+                my_socket.sendto("D".encode("utf-8"), ('<broadcast>', DISCOVERY_PORT))
+
+                while time.monotonic() < deadline:
+                    try:
+                        response, address = my_socket.recvfrom(2048)
+                    except socket.timeout:
+                        break
+
+                    server_ip = self.parse_discovery_response(response)
+                    if server_ip:
+                        found[server_ip] = dt.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                    else:
+                        self.logger.debug(f"Ignoring discovery response from {address[0]}.")
+
+        except OSError as error:
+            if error.errno == 51:
+                self.logger.warning("The network is unreachable.")
+            else:
+                self.logger.exception("General exception")
+
         except Exception:  # noqa
-            self.logger.critical("Sensor update failure. Check connection.")
-            self.logger.exception("General exception:")
-            dev.updateStateOnServer('onOffState', value=False, uiValue=" ")
-            dev.updateStateImageOnServer(indigo.kStateImageSel.Error)
-            return False
+            self.logger.exception("General exception")
 
-    #  =============================================================================
-    def updateDS2450(self, dev, ows_sensor, server_ip):  # noqa
+        with self.discovery_lock:
+            self.discovered_servers.update(found)
+
+            expired = (dt.datetime.now() - dt.timedelta(seconds=DISCOVERY_EXPIRY)).strftime('%Y-%m-%d %H:%M:%S')
+            self.discovered_servers = {
+                server_ip: last_seen for server_ip, last_seen in self.discovered_servers.items() if last_seen >= expired
+            }
+            self.pluginPrefs['discoveredServers'] = json.dumps(self.discovered_servers)
+
+        self.logger.debug(f"Server discovery found {len(found)} servers: {sorted(found)}")
+
+    # =============================================================================
+    @staticmethod
+    def parse_discovery_response(response):
         """
-        Title Placeholder
+        Return the IP address from an EDS discovery response, or None if it isn't one
 
-        DS2450 Description = "Quad A/D Converter"
+        We will ignore everything that responds to our UDP broadcast request unless it contains a JSON blob with an IP
+        field.
 
-        :param indigo.Device dev:
-        :param XML ows_sensor:
-        :param str server_ip:
+        :param bytes response:
+        :return str:
         """
-        self.logger.debug("updateDS2450() method called.")
-        props = [
-            'ChannelAConversionRange', 'ChannelAConversionResolution', 'ChannelAOutputControl', 'ChannelAOutputEnable',
-            'ChannelBConversionRange', 'ChannelBConversionResolution', 'ChannelBOutputControl', 'ChannelBOutputEnable',
-            'ChannelCConversionRange', 'ChannelCConversionResolution', 'ChannelCOutputControl', 'ChannelCOutputEnable',
-            'ChannelDConversionRange', 'ChannelDConversionResolution', 'ChannelDOutputControl', 'ChannelDOutputEnable',
-            'PowerOnReset', 'VCCControl'
-        ]
+        if response.find(b'{') < 0:
+            return None
+
+        response = response[response.find(b'{'):response.find(b'}')+1]
+
+        # This code removes a comma after the last field, which is sent in some older versions of EDS products.
+        comma_err = response.find(b',\r\n}')
+        if comma_err > 64:
+            response = response[:comma_err] + b'}'
 
         try:
-            ds2450_state_dict = self.state_dict.ds2450_state_dict()
-            input_value = None
+            return json.loads(response).get('IP')
+        except (ValueError, AttributeError):
+            return None
 
-            for key, value in ds2450_state_dict.items():
-                try:
-                    dev.updateStateOnServer(key, value=ows_sensor.find(self.xmlns + value).text)
-                except Exception:  # noqa
-                    self.logger.exception("General exception:")
-                    self.logger.debug(f"Unable to update device state on server. Device: {dev.name}")
-                    self.logger.debug(f"Key: {key} : Value: Unsupported")
-                    dev.updateStateOnServer(key, value="Unsupported")
+    # =============================================================================
+    def killAllComms(self):  # noqa
+        """
+        Set the enabled status of all plugin devices to false.
+        """
+        for dev in indigo.devices.itervalues("self"):
+            if dev.enabled:
+                indigo.device.enable(dev, value=False)
 
-            # The user can select which of the following values become the main sensorValue.
-            try:
-                match dev.pluginProps['prefSensorValue2450']:
-                    case "C_A":  # Counter A
-                        input_value = ows_sensor.find(self.xmlns + 'ChannelAConversionValue').text
-                    case "C_B":  # Counter B
-                        input_value = ows_sensor.find(self.xmlns + 'ChannelBConversionValue').text
-                    case "C_C":  # Counter C
-                        input_value = ows_sensor.find(self.xmlns + 'ChannelCConversionValue').text
-                    case "C_D":  # Counter D
-                        input_value = ows_sensor.find(self.xmlns + 'ChannelDConversionValue').text
-
-                dev.updateStateOnServer('sensorValue', value=input_value, uiValue=input_value)
-                dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
+    # =============================================================================
+    def unkillAllComms(self):  # noqa
+        """
+        Set the enabled status of all plugin devices to true.
+        """
+        for dev in indigo.devices.itervalues("self"):
+            if not dev.enabled:
+                indigo.device.enable(dev, value=True)
 
-            except Exception:  # noqa
-                self.logger.exception("General exception:")
-                self.logger.debug(f"Unable to update device state on server. Device: {dev.name}")
-                dev.updateStateOnServer('sensorValue', value="Unsupported", uiValue="Unsupported")
-                dev.updateStateImageOnServer(indigo.kStateImageSel.Error)
+    # =============================================================================
+    def clearAllAlarmsAction(self, action):  # noqa
+        """
+        Clear latched alarms in bulk when it is called for from an Action item.
 
-            self.populate_props(dev, props, ows_sensor, "DS2450")
+        Scripters can call it too, and add "wait": True to the props to wait for every server to answer, in which case
+        the action returns True if every write succeeded:
+        =======================================================================
+        plugin = indigo.server.getPlugin("com.fogbert.indigoplugin.OWServer")
+        plugin.executeAction("clearAllAlarmsAction", props={"server": "all", "latchedOnly": True, "wait": True})
+        =======================================================================
 
-        except Exception:  # noqa
-            self.logger.critical("Sensor update failure. Check connection.")
-            self.logger.exception("General exception:")
-            dev.updateStateOnServer('onOffState', value=False, uiValue=" ")
-            dev.updateStateImageOnServer(indigo.kStateImageSel.Error)
-            return False
+        :param indigo.PluginAction action:
+        """
+        return self.clear_all_alarms(
+            action.props.get('server', 'all'), action.props.get('latchedOnly', False), action.props.get('wait', False)
+        )
 
-    #  =============================================================================
-    def updateEDS0064(self, dev, ows_sensor, server_ip):  # noqa
+    # =============================================================================
+    def clearAllAlarmsMenu(self, values_dict, type_id):  # noqa
         """
-        Title Placeholder
+        Clear latched alarms in bulk when it is called for from a Menu item.
 
-        EDS0064 Description = "Octal Current Input Device"
+        :param indigo.Dict values_dict:
+        :param str type_id:
+        :return:
+        """
+        self.clear_all_alarms(values_dict.get('server', 'all'), values_dict.get('latchedOnly', False))
+        return True
 
-        :param indigo.Device dev:
-        :param XML ows_sensor:
-        :param str server_ip:
+    # =============================================================================
+    def clear_all_alarms(self, server_ip="all", latched_only=False, wait=False):
         """
-        self.logger.debug("updateEDS0064() method called.")
-        props = ['LEDFunction', 'RelayFunction', 'TemperatureHighAlarmValue', 'TemperatureLowAlarmValue']
+        Send clearAlarms to every enabled sensor device that has alarm search states
 
-        try:
-            eds0064_state_dict = self.state_dict.eds0064_state_dict()
-            input_value = None
+        Writes are queued on each server's write lane, so each server clears its sensors one at a time while the
+        servers work in parallel. A summary is logged once every server has answered.
 
-            for key, value in eds0064_state_dict.items():
-                try:
-                    if key == "owsTemperature":
-                        ows_temp = ows_sensor.find(self.xmlns + 'Temperature').text
-                        comp_val = dev.pluginProps.get('EDS0064TempComp', '0.0')
-                        input_value = float(ows_temp) + float(comp_val)
-                        input_value = self.temp_convert(input_value)
-                        dev.updateStateOnServer(key, value=input_value)
-                    else:
-                        dev.updateStateOnServer(key, value=ows_sensor.find(self.xmlns + value).text)
-                except Exception:  # noqa
-                    self.logger.exception("General exception:")
-                    self.logger.debug(f"Unable to update device state on server. Device: {dev.name}")
-                    self.logger.debug(f"Key: {key} : Value: Unsupported")
-                    dev.updateStateOnServer(key, value="Unsupported")
+        :param str server_ip: only clear devices on this server, or "all".
+        :param bool latched_only: only clear devices with a conditional search state that is set.
+        :param bool wait: wait for the writes to finish before returning.
+        :return bool: with wait, True if every write succeeded; otherwise True once the writes are queued.
+        """
+        requests_by_server = {}
+        cleared_ids = {}  # {server IP: [device ID]}
 
-            # The user can select which of the following values become the main sensorValue.
-            try:
-                match dev.pluginProps['prefSensorValue0064']:
-                    case "C_1":  # Counter 1
-                        input_value = ows_sensor.find(self.xmlns + 'Counter1').text
-                        dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-                    case "C_2":  # Counter 2
-                        input_value = ows_sensor.find(self.xmlns + 'Counter2').text
-                        dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-                    case "LED":  # LED
-                        input_value = ows_sensor.find(self.xmlns + 'LED').text
-                        if input_value == "1":
-                            dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOn)
-                        else:
-                            dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-                    case "Relay":  # Relay
-                        input_value = ows_sensor.find(self.xmlns + 'Relay').text
-                        if input_value == "1":
-                            dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOn)
-                        else:
-                            dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-                    case "T":  # Temperature
-                        ows_temp = ows_sensor.find(self.xmlns + 'Temperature').text
-                        comp_val = dev.pluginProps.get('EDS0064TempComp', '0.0')
-                        input_value = float(ows_temp) + float(comp_val)
-                        input_value = self.temp_convert(input_value)
-                        dev.updateStateImageOnServer(indigo.kStateImageSel.TemperatureSensor)
-
-                dev.updateStateOnServer('sensorValue', value=input_value, uiValue=input_value)
+        for dev in indigo.devices.itervalues("self"):
+            family = SENSOR_FAMILIES.get(dev.deviceTypeId)
+            if not dev.enabled or not family:
+                continue
+
+            alarm_states = [state for state in family['states'] if state.endswith('ConditionalSearchState')]
+            props = dev.pluginProps
+            if not alarm_states or server_ip not in ("all", props.get('serverList')):
+                continue
+
+            if latched_only and not any(str(dev.states.get(state)) in ("1", "True") for state in alarm_states):
+                continue
+
+            # Failures are reported in the summary rather than one warning per device, and each server is refreshed
+            # once after its last write rather than once per device.
+            future = self.queue_write(
+                props['serverList'], props['romID'], "clearAlarms", "0", callback=lambda request: None, refresh=False
+            )
+            requests_by_server.setdefault(props['serverList'], []).append((dev.name, future))
+            cleared_ids.setdefault(props['serverList'], []).append(dev.id)
 
-            except Exception:  # noqa
-                self.logger.exception("General exception:")
-                self.logger.debug(f"Unable to update device state on server. Device: {dev.name}")
-                dev.updateStateOnServer('sensorValue', value="Unsupported", uiValue="Unsupported")
-                dev.updateStateImageOnServer(indigo.kStateImageSel.Error)
+        if not requests_by_server:
+            self.logger.info("There are no alarms to clear.")
+            return True
 
-            self.populate_props(dev, props, ows_sensor, "EDS0064")
+        # A server's writes are sent in order, so its last write finishes after the rest.
+        for ip, queued in requests_by_server.items():
+            queued[-1][1].add_done_callback(
+                lambda done, ip=ip: self.schedule_refresh(ip, cleared_ids[ip])
+            )
 
-        except Exception:  # noqa
-            self.logger.critical("Sensor update failure. Check connection.")
-            self.logger.exception("General exception:")
-            dev.updateStateOnServer('onOffState', value=False, uiValue=" ")
-            dev.updateStateImageOnServer(indigo.kStateImageSel.Error)
-            return False
+        self.logger.info(
+            f"Clearing alarms on {sum(len(queued) for queued in requests_by_server.values())} devices across "
+            f"{len(requests_by_server)} servers."
+        )
 
-    #  =============================================================================
-    def updateEDS0065(self, dev, ows_sensor, server_ip):  # noqa
+        if wait:
+            return self.report_bulk_writes("Clear alarms", requests_by_server)
+
+        threading.Thread(
+            target=self.report_bulk_writes, args=("Clear alarms", requests_by_server), daemon=True
+        ).start()
+        return True
+
+    # =============================================================================
+    def report_bulk_writes(self, title, requests_by_server):
         """
-        Title Placeholder
+        Wait for a batch of queued writes and log one summary for the lot
 
-        EDS0065 Description = "Temperature and Humidity Sensor"
+        :param str title:
+        :param dict requests_by_server: {server IP: [(device name, Future)]}
+        :return bool: True if every write succeeded.
+        """
+        succeeded = 0
+        failed = {}  # {server IP: [(device name, reason)]}
 
-        :param indigo.Device dev:
-        :param XML ows_sensor:
-        :param str server_ip:
+        for server_ip, queued in sorted(requests_by_server.items()):
+            for dev_name, future in queued:
+                try:
+                    future.result()
+                    succeeded += 1
+                except Exception as error:  # noqa
+                    failed.setdefault(server_ip, []).append((dev_name, str(error) or type(error).__name__))
+
+        total = succeeded + sum(len(failures) for failures in failed.values())
+        if not failed:
+            self.logger.info(f"{title}: all {total} writes succeeded.")
+            return True
+
+        self.logger.warning(f"{title}: {succeeded} of {total} writes succeeded.")
+        for server_ip, failures in failed.items():
+            names = ", ".join(dev_name for dev_name, _ in failures[:5])
+            more = f" and {len(failures) - 5} more" if len(failures) > 5 else ""
+            self.logger.warning(f"  {server_ip}: {len(failures)} failed ({failures[0][1]}): {names}{more}")
+
+        return False
+
+    # =============================================================================
+    def poll_intervals(self, server_ip=None):
+        """
+        Return the polling interval for each enabled plugin device
+
+        A device's own pollInterval prop wins. Sensors without one fall back to the pollInterval of their server's
+        device, and everything else falls back to the plugin's polling interval. With adaptive polling turned on, the
+        interval is then scaled down by the server's adaptive scale (see adapt_poll_interval()).
+
+        :param str server_ip: only return the intervals of this server's devices.
+        :return dict: {device ID: seconds}
         """
-        self.logger.debug("updateEDS0065() method called.")
-        props = [
-            'DewPointHighAlarmValue', 'DewPointLowAlarmValue', 'HeatIndexHighAlarmValue', 'HeatIndexLowAlarmValue',
-            'HumidexHighAlarmValue', 'HumidexLowAlarmValue', 'HumidityHighAlarmValue', 'HumidityLowAlarmValue',
-            'LEDFunction', 'RelayFunction', 'TemperatureHighAlarmValue', 'TemperatureLowAlarmValue'
+        default = int(self.pluginPrefs.get('configMenuPollInterval', 900))
+        adaptive = self.pluginPrefs.get('adaptivePolling', False)
+        devices = [
+            dev for dev in indigo.devices.itervalues("self")
+            if dev.enabled and server_ip in (None, dev.pluginProps.get('serverList', ''))
         ]
+        server_intervals = {
+            dev.pluginProps.get('serverList', ''): int(dev.pluginProps.get('pollInterval', 0) or 0)
+            for dev in devices if dev.deviceTypeId == "owsOWSServer"
+        }
 
-        try:
-            eds0065_state_dict = self.state_dict.eds0065_state_dict()
-            input_value = None
+        intervals = {}
+        for dev in devices:
+            server_ip = dev.pluginProps.get('serverList', '')
+            interval = int(dev.pluginProps.get('pollInterval', 0) or 0)
+            if not interval and dev.deviceTypeId != "owsOWSServer":
+                interval = server_intervals.get(server_ip, 0)
+            interval = interval or default
 
-            for key, value in eds0065_state_dict.items():
-                try:
-                    if key == "owsTemperature":
-                        ows_temp = ows_sensor.find(self.xmlns + 'Temperature').text
-                        comp_val = dev.pluginProps.get('EDS0065TempComp', '0.0')
-                        input_value = float(ows_temp) + float(comp_val)
-                        input_value = self.temp_convert(input_value)
-                        dev.updateStateOnServer(key, value=input_value)
-                    else:
-                        dev.updateStateOnServer(key, value=ows_sensor.find(self.xmlns + value).text)
-                except Exception:  # noqa
-                    self.logger.exception("General exception:")
-                    self.logger.debug(f"Unable to update device state on server. Device: {dev.name}")
-                    self.logger.debug(f"Key: {key} : Value: Unsupported")
-                    dev.updateStateOnServer(key, value="Unsupported")
+            if adaptive:
+                scaled = round(interval * self.adaptive_scale.get(server_ip, 1.0))
+                interval = max(min(interval, ADAPTIVE_MIN_INTERVAL), scaled)
 
-            # The user can select which of the following values become the main sensorValue.
-            try:
-                match dev.pluginProps['prefSensorValue0065']:
-                    case "C_1":  # Counter 1
-                        input_value = ows_sensor.find(self.xmlns + 'Counter1').text
-                        dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-                    case "C_2":  # Counter 2
-                        input_value = ows_sensor.find(self.xmlns + 'Counter2').text
-                        dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-                    case "DP":  # Dew Point
-                        dew_point = ows_sensor.find(self.xmlns + 'DewPoint').text
-                        input_value = self.temp_convert(dew_point)
-                        dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-                    case "Hu":  # Humidity
-                        humidity = ows_sensor.find(self.xmlns + 'Humidity').text
-                        input_value = self.humidity_convert(humidity)
-                        dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-                    case "Hx":  # Humidex
-                        humidex = ows_sensor.find(self.xmlns + 'Humidex').text
-                        input_value = self.humidex_convert(humidex)
-                        dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-                    case "HI":  # Heat Index
-                        heat_index = ows_sensor.find(self.xmlns + 'HeatIndex').text
-                        input_value = self.temp_convert(heat_index)
-                        dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-                    case "LED":  # LED
-                        input_value = ows_sensor.find(self.xmlns + 'LED').text
-                        if input_value == "1":
-                            dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOn)
-                        else:
-                            dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-                    case "Relay":  # Relay
-                        input_value = ows_sensor.find(self.xmlns + 'Relay').text
-                        if input_value == "1":
-                            dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOn)
-                        else:
-                            dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-                    case "T":  # Temperature
-                        ows_temp = ows_sensor.find(self.xmlns + 'Temperature').text
-                        comp_val = dev.pluginProps.get('EDS0065TempComp', '0.0')
-                        input_value = float(ows_temp) + float(comp_val)
-                        input_value = self.temp_convert(input_value)
-                        dev.updateStateImageOnServer(indigo.kStateImageSel.TemperatureSensor)
-
-                dev.updateStateOnServer('sensorValue', value=input_value, uiValue=input_value)
+            intervals[dev.id] = interval
 
-            except Exception:  # noqa
-                self.logger.exception("General exception:")
-                self.logger.debug(f"Unable to update device state on server. Device: {dev.name}")
-                dev.updateStateOnServer('sensorValue', value="Unsupported", uiValue="Unsupported")
-                dev.updateStateImageOnServer(indigo.kStateImageSel.Error)
+        return intervals
+
+    # =============================================================================
+    def adapt_poll_interval(self, server_ip, active):
+        """
+        Speed up or back off a server's polling based on how quickly its sensor values are changing
 
-            self.populate_props(dev, props, ows_sensor, "EDS0065")
+        After each poll, a server whose sensors showed activity has its adaptive scale halved, so its devices are
+        polled twice as often (but never more often than ADAPTIVE_MIN_INTERVAL). A server whose readings were flat
+        has its scale grown by ADAPTIVE_BACKOFF until its devices are back to their configured intervals, which act as
+        the ceiling.
 
-        except Exception:  # noqa
-            self.logger.critical("Sensor update failure. Check connection.")
-            self.logger.exception("General exception:")
-            dev.updateStateOnServer('onOffState', value=False, uiValue=" ")
-            dev.updateStateImageOnServer(indigo.kStateImageSel.Error)
-            return False
+        :param str server_ip:
+        :param bool active: True if a sensor value changed by more than ADAPTIVE_DEADBAND.
+        """
+        scale = self.adaptive_scale.get(server_ip, 1.0)
 
-    #  =============================================================================
-    def updateEDS0066(self, dev, ows_sensor, server_ip):  # noqa
+        if active:
+            new_scale = max(scale / 2, ADAPTIVE_MIN_SCALE)
+        else:
+            new_scale = min(scale * ADAPTIVE_BACKOFF, 1.0)
+
+        if new_scale != scale:
+            self.logger.debug(f"Adaptive polling scale for server {server_ip}: {new_scale:.3f}")
+            self.adaptive_scale[server_ip] = new_scale
+
+        # A shorter interval should take effect now rather than after the next (longer) scheduled poll.
+        if new_scale < scale:
+            self.reschedule_devices()
+
+    # =============================================================================
+    def note_sensor_activity(self, server_ip, dev):
         """
-        Title Placeholder
+        Record whether a sensor device's primary value changed enough to count as activity for adaptive polling
 
-        EDS0066 Description = "Temperature and Barometric Pressure Sensor"
+        Numeric values count when they move by more than ADAPTIVE_DEADBAND, so temperature jitter is ignored but
+        counter increments are not. Any change to a non-numeric value counts.
 
-        :param indigo.Device dev:
-        :param XML ows_sensor:
         :param str server_ip:
+        :param indigo.Device dev:
         """
-        self.logger.debug("updateEDS0066() method called.")
-        props = [
-            'BarometricPressureHgHighAlarmValue', 'BarometricPressureHgLowAlarmValue',
-            'BarometricPressureMbHighAlarmValue', 'BarometricPressureMbLowAlarmValue', 'LEDFunction', 'RelayFunction',
-            'TemperatureHighAlarmValue', 'TemperatureLowAlarmValue'
-        ]
+        value = self.state_cache.get(dev.id, {}).get('sensorValue', (None, None))[0]
+        last_value = self.last_values.get(dev.id)
+        self.last_values[dev.id] = value
+
+        if value is None or last_value is None:
+            return
 
         try:
-            eds0066_state_dict = self.state_dict.eds0066_state_dict()
-            input_value = None
+            changed = abs(float(value) - float(last_value)) > ADAPTIVE_DEADBAND
+        except (TypeError, ValueError):
+            changed = value != last_value
 
-            for key, value in eds0066_state_dict.items():
-                try:
-                    if key == "owsTemperature":
-                        ows_temp = ows_sensor.find(self.xmlns + 'Temperature').text
-                        comp_val = dev.pluginProps.get('EDS0066TempComp', '0.0')
-                        input_value = float(ows_temp) + float(comp_val)
-                        input_value = self.temp_convert(input_value)
-                        dev.updateStateOnServer(key, value=input_value)
-                    else:
-                        dev.updateStateOnServer(key, value=ows_sensor.find(self.xmlns + value).text)
-                except Exception:  # noqa
-                    self.logger.exception("General exception:")
-                    self.logger.debug(f"Unable to update device state on server. Device: {dev.name}")
-                    self.logger.debug(f"Key: {key} : Value: Unsupported")
-                    dev.updateStateOnServer(key, value="Unsupported")
+        if changed:
+            self.server_activity[server_ip] = True
 
-            # The user can select which of the following values become the main sensorValue.
-            try:
-                match dev.pluginProps['prefSensorValue0066']:
-                    case "C_1":  # Counter 1
-                        input_value = ows_sensor.find(self.xmlns + 'Counter1').text
-                        dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-                    case "C_2":  # Counter 2
-                        input_value = ows_sensor.find(self.xmlns + 'Counter2').text
-                        dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-                    case "BPH":  # Barometric Pressure (Mb)
-                        bph = ows_sensor.find(self.xmlns + 'BarometricPressureHg').text
-                        input_value = self.pressure_convert(bph)
-                        dev.updateStateImageOnServer(indigo.kStateImageSel.LightSensor)
-                    case "BPM":  # Barometric Pressure (Hg)
-                        bpm = ows_sensor.find(self.xmlns + 'BarometricPressureMb').text
-                        input_value = self.pressure_convert(bpm)
-                        dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-                    case "LED":  # LED
-                        input_value = ows_sensor.find(self.xmlns + 'LED').text
-                        if input_value == "1":
-                            dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOn)
-                        else:
-                            dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-                    case "Relay":  # Relay
-                        input_value = ows_sensor.find(self.xmlns + 'Relay').text
-                        if input_value == "1":
-                            dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOn)
-                        else:
-                            dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-                    case "T":  # Temperature
-                        ows_temp = ows_sensor.find(self.xmlns + 'Temperature').text
-                        comp_val = dev.pluginProps.get('EDS0066TempComp', '0.0')
-                        input_value = float(ows_temp) + float(comp_val)
-                        input_value = self.temp_convert(input_value)
-                        dev.updateStateImageOnServer(indigo.kStateImageSel.TemperatureSensor)
-
-                dev.updateStateOnServer('sensorValue', value=input_value, uiValue=input_value)
+    # =============================================================================
+    def schedule_device(self, dev_id, due_time):
+        """
+        Schedule a device's next poll, replacing any poll it already has scheduled
 
-            except Exception:  # noqa
-                self.logger.exception("General exception:")
-                self.logger.debug(f"Unable to update device state on server. Device: {dev.name}")
-                dev.updateStateOnServer('sensorValue', value="Unsupported", uiValue="Unsupported")
-                dev.updateStateImageOnServer(indigo.kStateImageSel.Error)
+        :param int dev_id:
+        :param float due_time: time.monotonic() time the device is due.
+        """
+        with self.poll_schedule_lock:
+            self.poll_schedule[dev_id] = due_time
+            heapq.heappush(self.poll_queue, (due_time, dev_id))
 
-            self.populate_props(dev, props, ows_sensor, "EDS0066")
+    # =============================================================================
+    def unschedule_device(self, dev_id):
+        """
+        Stop polling a device
 
-        except Exception:  # noqa
-            self.logger.critical("Sensor update failure. Check connection.")
-            self.logger.exception("General exception:")
-            dev.updateStateOnServer('onOffState', value=False, uiValue=" ")
-            dev.updateStateImageOnServer(indigo.kStateImageSel.Error)
-            return False
+        Its queue entry becomes stale and is discarded when it reaches the head of the queue.
 
-    #  =============================================================================
-    def updateEDS0067(self, dev, ows_sensor, server_ip):  # noqa
+        :param int dev_id:
         """
-        Title Placeholder
+        with self.poll_schedule_lock:
+            self.poll_schedule.pop(dev_id, None)
 
-        EDS0067 Description = "Temperature and Light Sensor"
+    # =============================================================================
+    def reschedule_devices(self):
+        """
+        Bring every device's next poll forward if its polling interval has been shortened
 
-        :param indigo.Device dev:
-        :param XML ows_sensor:
-        :param str server_ip:
+        :return:
         """
-        self.logger.debug("updateEDS0067() method called.")
-        props = [
-            'LEDFunction', 'LightHighAlarmValue', 'LightLowAlarmValue', 'RelayFunction', 'TemperatureHighAlarmValue',
-            'TemperatureLowAlarmValue'
-        ]
+        now = time.monotonic()
 
-        try:
-            eds0067_state_dict = self.state_dict.eds0067_state_dict()
-            input_value = None
+        for dev_id, interval in self.poll_intervals().items():
+            with self.poll_schedule_lock:
+                due_time = self.poll_schedule.get(dev_id)
 
-            for key, value in eds0067_state_dict.items():
-                try:
-                    if key == "owsTemperature":
-                        ows_temp = ows_sensor.find(self.xmlns + 'Temperature').text
-                        comp_val = dev.pluginProps.get('EDS0067TempComp', '0.0')
-                        input_value = float(ows_temp) + float(comp_val)
-                        input_value = self.temp_convert(input_value)
-                        dev.updateStateOnServer(key, value=input_value)
-                    else:
-                        dev.updateStateOnServer(key, value=ows_sensor.find(self.xmlns + value).text)
-                except Exception:  # noqa
-                    self.logger.exception("General exception:")
-                    self.logger.debug(f"Unable to update device state on server. Device: {dev.name}")
-                    self.logger.debug(f"Key: {key} : Value: Unsupported")
-                    dev.updateStateOnServer(key, value="Unsupported")
+            if due_time is not None and now + interval < due_time:
+                self.schedule_device(dev_id, now + interval)
 
-            # The user can select which of the following values become the main sensorValue.
-            try:
-                match dev.pluginProps['prefSensorValue0067']:
-                    case "C_1":  # Counter 1
-                        input_value = ows_sensor.find(self.xmlns + 'Counter1').text
-                        dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-                    case "C_2":  # Counter 2
-                        input_value = ows_sensor.find(self.xmlns + 'Counter2').text
-                        dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-                    case "IL":  # Illumination
-                        input_value = ows_sensor.find(self.xmlns + 'Light').text
-                        dev.updateStateImageOnServer(indigo.kStateImageSel.LightSensor)
-                    case "LED":  # LED
-                        input_value = ows_sensor.find(self.xmlns + 'LED').text
-                        if input_value == "1":
-                            dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOn)
-                        else:
-                            dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-                    case "Relay":  # Relay
-                        input_value = ows_sensor.find(self.xmlns + 'Relay').text
-                        if input_value == "1":
-                            dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOn)
-                        else:
-                            dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-                    case "T":  # Temperature
-                        ows_temp = ows_sensor.find(self.xmlns + 'Temperature').text
-                        comp_val = dev.pluginProps.get('EDS0067TempComp', '0.0')
-                        input_value = float(ows_temp) + float(comp_val)
-                        input_value = self.temp_convert(input_value)
-                        dev.updateStateImageOnServer(indigo.kStateImageSel.TemperatureSensor)
-
-                dev.updateStateOnServer('sensorValue', value=input_value, uiValue=input_value)
+    # =============================================================================
+    def pop_due_devices(self):
+        """
+        Return the IDs of the devices that are due to be polled and schedule their next poll
 
-            except Exception:  # noqa
-                self.logger.exception("General exception:")
-                self.logger.debug(f"Unable to update device state on server. Device: {dev.name}")
-                dev.updateStateOnServer('sensorValue', value="Unsupported", uiValue="Unsupported")
-                dev.updateStateImageOnServer(indigo.kStateImageSel.Error)
+        :return set:
+        """
+        now = time.monotonic()
+        due = set()
+
+        with self.poll_schedule_lock:
+            while self.poll_queue and self.poll_queue[0][0] <= now:
+                due_time, dev_id = heapq.heappop(self.poll_queue)
+                if self.poll_schedule.get(dev_id) == due_time:
+                    due.add(dev_id)
+
+        if due:
+            intervals = self.poll_intervals()
+            for dev_id in due:
+                if dev_id in intervals:
+                    self.schedule_device(dev_id, now + intervals[dev_id])
+                else:
+                    self.unschedule_device(dev_id)
+
+        return due
+
+    # =============================================================================
+    def seconds_until_next_poll(self):
+        """
+        Return how long the poll loop can sleep before the next device is due
 
-            self.populate_props(dev, props, ows_sensor, "EDS0067")
+        :return float:
+        """
+        with self.poll_schedule_lock:
+            # Discard stale entries so they don't wake the loop early.
+            while self.poll_queue and self.poll_schedule.get(self.poll_queue[0][1]) != self.poll_queue[0][0]:
+                heapq.heappop(self.poll_queue)
+
+            if not self.poll_queue:
+                return SCHEDULER_MAX_SLEEP
+
+            return min(max(self.poll_queue[0][0] - time.monotonic(), 1), SCHEDULER_MAX_SLEEP)
+
+    # =============================================================================
+    def sleep_until_next_poll(self):
+        """
+        Sleep until the next device is due, or until poll_wakeup is set
+
+        The sleep is taken in SCHEDULER_WAKE_STEP slices so that a device scheduled after the loop went to sleep (by a
+        write, for example) doesn't wait for the device that was due next.
+
+        :return:
+        """
+        deadline = time.monotonic() + self.seconds_until_next_poll()
+
+        while not self.poll_wakeup.is_set():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            self.sleep(min(remaining, SCHEDULER_WAKE_STEP))
+
+        self.poll_wakeup.clear()
+
+    # =============================================================================
+    def spot_dead_sensors(self):
+        """
+        Log a warning when a sensor has been offline
+
+        spot_dead_sensors(self): This method compares the time each plugin device was last updated to the current
+        Indigo time. If the difference exceeds the device's polling interval plus 60 seconds, then the sensor's
+        onOffState is set to false and an error is thrown to the log. This condition could be for a number of reasons
+        including sensor fail, wiring fail, 1-Wire network collisions, etc. The warning is repeated at most once per
+        polling interval for as long as the sensor stays dead.
+        """
+        self.logger.debug("spot_dead_sensors() method called.")
+        intervals = self.poll_intervals()
+        self.dead_sensors = 0
+
+        for dev in indigo.devices.itervalues("self"):
+            if dev.enabled:
+                # Only changed states are written to the server, so a sensor with steady readings won't update
+                # lastChanged. Prefer the time the sensor was last found in a details.xml file.
+                diff_time = indigo.server.getTime() - self.last_seen.get(dev.id, dev.lastChanged)
+                pref_poll = intervals.get(dev.id, int(self.pluginPrefs.get('configMenuPollInterval', 900)))
+                dead_time = dt.timedelta(seconds=pref_poll) + dt.timedelta(seconds=60)
+
+                # If a sensor has been offline for more than the specified amount of time, throw a message to the log
+                # and mark it offline. Starting with 60 seconds.
+                if diff_time <= dead_time:
+                    self.dead_warned.pop(dev.id, None)
+
+                else:
+                    self.dead_sensors += 1
+                    now = indigo.server.getTime()
+                    warned = self.dead_warned.get(dev.id)
+                    if warned is None or now - warned >= dt.timedelta(seconds=pref_poll):
+                        self.dead_warned[dev.id] = now
+                        self.logger.warning(
+                            f"{dev.name} hasn't been updated in {diff_time}. If this condition persists, check it's "
+                            f"connection."
+                        )
+                    try:
+                        self.update_state(dev, 'onOffState', value=False, uiValue="")
+                    except Exception:  # noqa
+                        self.logger.exception("General exception:")
+                        self.logger.warning("Unable to spot dead sensors.")
+
+    # =============================================================================
+    def humidex_convert(self, ows_humidex):
+        """
+        Title Placeholder
+
+        humidex_convert(self): This method converts any humidex values used in the plugin based on user preference:
+        self.pluginPrefs['configMenuHumidexDec'].
+
+        :param str ows_humidex:
+        """
+        self.logger.debug("  Converting humidex values.")
+
+        try:
+            # Format the humidex value to the requested number of decimal places.
+            format_humidex = f"%.{self.pluginPrefs.get('configMenuHumidexDec', '1')}f"
+            ows_humidex = float(ows_humidex)
+            ows_humidex = format_humidex % ows_humidex
+            return ows_humidex
 
         except Exception:  # noqa
-            self.logger.critical("Sensor update failure. Check connection.")
             self.logger.exception("General exception:")
-            dev.updateStateOnServer('onOffState', value=False, uiValue=" ")
-            dev.updateStateImageOnServer(indigo.kStateImageSel.Error)
-            return False
+            self.logger.warning("Error formatting humidex value. Returning value unchanged.")
+            return ows_humidex
 
-    #  =============================================================================
-    def updateEDS0068(self, dev, ows_sensor, server_ip):  # noqa
+    # =============================================================================
+    def humidity_convert(self, ows_humidity):
         """
         Title Placeholder
 
-        EDS0068 Description = "Temperature, Humidity,Barometric Pressure and Light Sensor"
+        humidity_convert(self): This method converts any humidity values used in the plugin based on user preference:
+        self.pluginPrefs['configMenuHumidityDec'].
 
-        :param indigo.Device dev:
-        :param XML ows_sensor:
-        :param str server_ip:
+        :param str ows_humidity:
         """
-        self.logger.debug("updateEDS0068() method called.")
-        local = {}
-        props = [
-            'BarometricPressureHgHighAlarmValue', 'BarometricPressureHgHighConditionalSearchState',
-            'BarometricPressureHgLowAlarmValue', 'BarometricPressureHgLowConditionalSearchState',
-            'BarometricPressureMbHighAlarmValue', 'BarometricPressureMbHighConditionalSearchState',
-            'BarometricPressureMbLowAlarmValue', 'BarometricPressureMbLowConditionalSearchState',
-            'DewPointHighAlarmValue', 'DewPointHighConditionalSearchState', 'DewPointLowAlarmValue',
-            'DewPointLowConditionalSearchState', 'HeatIndexHighAlarmValue', 'HeatIndexHighConditionalSearchState',
-            'HeatIndexLowAlarmValue', 'HeatIndexLowConditionalSearchState', 'HumidexHighAlarmValue',
-            'HumidexHighConditionalSearchState', 'HumidexLowAlarmValue', 'HumidexLowConditionalSearchState',
-            'HumidityHighAlarmValue', 'HumidityHighConditionalSearchState', 'HumidityLowAlarmValue',
-            'HumidityLowConditionalSearchState', 'LEDFunction', 'LightHighAlarmValue',
-            'LightHighConditionalSearchState', 'LightLowAlarmValue', 'LightLowConditionalSearchState',
-            'RelayFunction', 'TemperatureHighAlarmValue', 'TemperatureHighConditionalSearchState',
-            'TemperatureLowAlarmValue', 'TemperatureLowConditionalSearchState'
-        ]
+        self.logger.debug("  Converting humidity values.")
 
         try:
-            local['eds0068_state_dict'] = self.state_dict.eds0068_state_dict()
+            # Format the humidity value to the requested number of decimal places.
+            format_humidity = f"%.{self.pluginPrefs.get('configMenuHumidityDec', '1')}f"
+            ows_humidity    = float(ows_humidity)
+            ows_humidity    = format_humidity % ows_humidity
+            return ows_humidity
 
-            for key, value in local['eds0068_state_dict'].items():
-                try:
-                    if key == "owsTemperature":
-                        local['ows_temp'] = float(ows_sensor.find(self.xmlns + 'Temperature').text)
-                        comp_val = float(dev.pluginProps.get('EDS0068TempComp', 0.0))
-                        local['input_value'] = local['ows_temp'] + comp_val
-                        local['input_value'] = self.temp_convert(float(local['input_value']))
-                        dev.updateStateOnServer(key, value=local['input_value'])
-                    else:
-                        dev.updateStateOnServer(key, value=ows_sensor.find(self.xmlns + value).text)
-                except Exception:  # noqa
-                    self.logger.exception("General exception:")
-                    self.logger.debug(f"Unable to update device state on server. Device: {dev.name}")
-                    self.logger.debug(f"Key: {key} : Value: Unsupported")
-                    dev.updateStateOnServer(key, value="Unsupported")
+        except Exception:  # noqa
+            self.logger.exception("General exception:")
+            self.logger.warning("Error formatting humidity value. Returning value unchanged.")
+            return ows_humidity
 
-            # The user can select which of the following values become the main sensorValue.
-            try:
-                match dev.pluginProps['prefSensorValue0068']:
-                    case "BH":  # Barometric pressure HG
-                        ows_baro_hg = float(ows_sensor.find(self.xmlns + 'BarometricPressureHg').text)
-                        local['input_value'] = self.pressure_convert(ows_baro_hg)
-                        dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-                    case "BM":  # Barometric pressure MB
-                        ows_baro_mb = float(ows_sensor.find(self.xmlns + 'BarometricPressureMb').text)
-                        local['input_value'] = self.pressure_convert(ows_baro_mb)
-                        dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-                    case "C_1":  # Counter 1
-                        local['input_value'] = ows_sensor.find(self.xmlns + 'Counter1').text
-                        dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-                    case "C_2":  # Counter 2
-                        local['input_value'] = ows_sensor.find(self.xmlns + 'Counter2').text
-                        dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-                    case "DP":  # Dewpoint
-                        dewpoint = ows_sensor.find(self.xmlns + 'DewPoint').text
-                        local['input_value'] = self.temp_convert(dewpoint)
-                        dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-                    case "HI":  # Heat Index
-                        heat_index = ows_sensor.find(self.xmlns + 'HeatIndex').text
-                        local['input_value'] = self.temp_convert(heat_index)
-                        dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-                    case "HX":  # Humidex
-                        ows_humidex = ows_sensor.find(self.xmlns + 'Humidex').text
-                        local['input_value'] = self.humidex_convert(ows_humidex)
-                        dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-                    case "HY":  # Humidity
-                        ows_humidity = ows_sensor.find(self.xmlns + 'Humidity').text
-                        local['input_value'] = self.humidity_convert(ows_humidity)
-                        dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-                    case "IL":  # Illumination
-                        local['input_value'] = ows_sensor.find(self.xmlns + 'Light').text
-                        dev.updateStateImageOnServer(indigo.kStateImageSel.LightSensor)
-                    case "LED":  # LED
-                        local['input_value'] = ows_sensor.find(self.xmlns + 'LED').text
-                        if local['input_value'] == "1":
-                            dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOn)
-                        else:
-                            dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-                    case "Relay":  # Relay
-                        local['input_value'] = ows_sensor.find(self.xmlns + 'Relay').text
-                        if local['input_value'] == "1":
-                            dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOn)
-                        else:
-                            dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-                    case "T":  # Temperature
-                        local['ows_temp'] = float(ows_sensor.find(self.xmlns + 'Temperature').text)
-                        comp_val = float(dev.pluginProps.get('EDS0068TempComp', '0.0'))
-                        local['input_value'] = local['ows_temp'] + comp_val
-                        local['input_value'] = self.temp_convert(float(local['input_value']))
-                        dev.updateStateImageOnServer(indigo.kStateImageSel.TemperatureSensor)
-
-                dev.updateStateOnServer('sensorValue', value=local['input_value'], uiValue=local['input_value'])
+    # =============================================================================
+    def pressure_convert(self, ows_pressure):
+        """
+        Title Placeholder
 
-            except Exception:  # noqa
-                self.logger.exception("General exception:")
-                self.logger.debug(f"Unable to update device state on server. Device: {dev.name}")
-                dev.updateStateOnServer('sensorValue', value="Unsupported", uiValue="Unsupported")
-                dev.updateStateImageOnServer(indigo.kStateImageSel.Error)
+        pressure_convert(self): This method converts any pressure values used in the plugin based on user preference:
+        self.pluginPrefs['configMenuPressureDec'].
+
+        :param float ows_pressure:
+        """
+        self.logger.debug("  Converting pressure values.")
 
-            self.populate_props(dev, props, ows_sensor, "EDS0068")
+        try:
+            # Format the pressure value to the requested number of decimal places.
+            format_pressure = f"%.{self.pluginPrefs.get('configMenuPressureDec', '1')}f"
+            ows_pressure = float(ows_pressure)
+            ows_pressure = format_pressure % ows_pressure
+            return ows_pressure
 
         except Exception:  # noqa
-            self.logger.critical("Sensor update failure. Check connection.")
             self.logger.exception("General exception:")
-            dev.updateStateOnServer('onOffState', value=False, uiValue=" ")
-            dev.updateStateImageOnServer(indigo.kStateImageSel.Error)
-            return False
+            self.logger.warning("Error formatting pressure value. Returning value unchanged.")
+            return ows_pressure
 
-    #  =============================================================================
-    def updateEDS0070(self, dev, ows_sensor, server_ip):  # noqa
+    # =============================================================================
+    def temp_convert(self, ows_temp):
         """
         Title Placeholder
 
-        EDS0070 Description = "Vibration Sensor"
+        temp_convert(self): This method converts any temperature values used in the plugin based on user preference:
+        self.pluginPrefs['configMenuDegreesDec']. This method returns a string that is formatted based on user
+        preferences.
 
-        :param indigo.Device dev:
-        :param XML ows_sensor:
-        :param str server_ip:
+        :param float ows_temp:
         """
-        self.logger.debug("updateEDS0070() method called.")
-        props = ['LEDFunction', 'RelayFunction', 'VibrationHighAlarmValue', 'VibrationLowAlarmValue']
+        self.logger.debug("  Converting temperature values.")
 
-        try:
-            eds0070_state_dict = self.state_dict.eds0070_state_dict()
-            input_value = None
+        # Format the temperature value to the requested number of decimal places.
+        format_temp = f"%.{self.pluginPrefs.get('configMenuDegreesDec', '1')}f"
 
-            for key, value in eds0070_state_dict.items():
-                try:
-                    dev.updateStateOnServer(key, value=ows_sensor.find(self.xmlns + value).text)
-                except Exception:  # noqa
-                    self.logger.exception("General exception:")
-                    self.logger.debug(f"Unable to update device state on server. Device: {dev.name}")
-                    self.logger.debug(f"Key: {key} : Value: Unsupported")
-                    dev.updateStateOnServer(key, value="Unsupported")
+        if self.pluginPrefs.get('configMenuDegrees', 'F') == "C":
+            ows_temp = float(ows_temp)
+            ows_temp = format_temp % ows_temp
 
-            # The user can select which of the following values become the main sensorValue.
-            try:
-                match dev.pluginProps['prefSensorValue0070']:
-                    case "C_1":  # Counter
-                        input_value = ows_sensor.find(self.xmlns + 'Counter').text
-                        dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-                    case "LED":  # LED State
-                        input_value = ows_sensor.find(self.xmlns + 'LED').text
-                        if input_value == "1":
-                            dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOn)
-                        else:
-                            dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-                    case "Relay":  # Relay State
-                        input_value = ows_sensor.find(self.xmlns + 'Relay').text
-                        if input_value == "1":
-                            dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOn)
-                        else:
-                            dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-                    case "V":  # Vibration
-                        input_value = ows_sensor.find(self.xmlns + 'VibrationInstant').text
-                        dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-
-                dev.updateStateOnServer('sensorValue', value=input_value, uiValue=input_value)
+        elif self.pluginPrefs.get('configMenuDegrees', 'F') != "C":
+            ows_temp = float(ows_temp) * 1.8000 + 32.00
+            ows_temp = format_temp % ows_temp
 
-            except Exception:  # noqa
-                self.logger.exception("General exception:")
-                self.logger.debug(f"Unable to update device state on server. Device: {dev.name}")
-                dev.updateStateOnServer('sensorValue', value="Unsupported", uiValue="Unsupported")
-                dev.updateStateImageOnServer(indigo.kStateImageSel.Error)
+        return ows_temp
 
-            self.populate_props(dev, props, ows_sensor, "EDS0070")
+    # =============================================================================
+    def volts_convert(self, ows_volts):
+        """
+        Title Placeholder
 
-        except Exception:  # noqa
-            self.logger.critical("Sensor update failure. Check connection.")
-            self.logger.exception("General exception:")
-            dev.updateStateOnServer('onOffState', value=False, uiValue=" ")
-            dev.updateStateImageOnServer(indigo.kStateImageSel.Error)
-            return False
+        volts_convert(self): This method converts any voltages values used in the plugin based on user preference:
+        self.pluginPrefs['configMenuVoltsDec']. This method returns a string that is formatted based on user
+        preferences.
+
+        :param str ows_volts:
+        """
+        self.logger.debug("  Converting volts values.")
+
+        # Format the value to the requested number of decimal places.
+        format_volts = f"%.{self.pluginPrefs.get('configMenuVoltsDec', '1')}f"
+        ows_volts    = float(ows_volts)
+        ows_volts    = format_volts % ows_volts
+        return ows_volts
 
-    #  =============================================================================
-    def updateEDS0071(self, dev, ows_sensor, server_ip):  # noqa
+    # =============================================================================
+    def update_state(self, dev, key, value=None, uiValue=None):  # noqa
         """
-        Title Placeholder
+        Write a device state to the Indigo server only if it has changed
+
+        update_state() keeps a shadow copy of the last value written to each device state. Writes that wouldn't change
+        anything are skipped so that subscribeToChanges() subscribers only hear about real changes. Clear
+        self.state_cache (or call updateDeviceStates(force=True)) to write every state on the next poll.
 
-        EDS0071 Description = "RTD Interface, 4 Wire"
+        If the calling thread has opened a batch for the device with begin_state_batch(), the change is held until
+        flush_state_batch() sends the whole batch in a single call.
 
         :param indigo.Device dev:
-        :param XML ows_sensor:
-        :param str server_ip:
+        :param str key:
+        :param value:
+        :param uiValue:
+        :return bool: True if the state was written (or added to the batch).
         """
-        self.logger.debug("updateEDS0071() method called.")
-        props = [
-            'CalibrationKey', 'LEDFunction', 'RelayFunction', 'RTDReadDelay', 'RTDResistanceHighAlarmValue',
-            'RTDResistanceLowAlarmValue', 'TemperatureHighAlarmValue', 'TemperatureLowAlarmValue'
-        ]
+        if self.pending_writes and any(
+                dev_id == dev.id and key in entry['states'] for (dev_id, _), entry in list(self.pending_writes.items())
+        ):
+            uiValue = f"{value} (pending)"
 
-        try:
-            eds0071_state_dict = self.state_dict.eds0071_state_dict()
-            input_value = None
+        dev_cache = self.state_cache.setdefault(dev.id, {})
+        new_value = (value, uiValue)
 
-            for key, value in eds0071_state_dict.items():
-                try:
-                    dev.updateStateOnServer(key, value=ows_sensor.find(self.xmlns + value).text)
-                except Exception:  # noqa
-                    self.logger.exception("General exception:")
-                    self.logger.debug(f"Unable to update device state on server. Device: {dev.name}")
-                    self.logger.debug(f"Key: {key} : Value: Unsupported")
-                    dev.updateStateOnServer(key, value="Unsupported")
+        if key in dev_cache and dev_cache[key] == new_value:
+            return False
 
-            # The user can select which of the following values become the main sensorValue.
-            try:
-                match dev.pluginProps['prefSensorValue0071']:
-                    case "C_1":  # Counter
-                        input_value = ows_sensor.find(self.xmlns + 'Counter').text
-                        dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-                    case "LED":  # LED State
-                        input_value = ows_sensor.find(self.xmlns + 'LED').text
-                        if input_value == "1":
-                            dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOn)
-                        else:
-                            dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-                    case "Relay":  # Relay State
-                        input_value = ows_sensor.find(self.xmlns + 'Relay').text
-                        if input_value == "1":
-                            dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOn)
-                        else:
-                            dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-                    case "RTD":  # RTD
-                        conversion_value = ows_sensor.find(self.xmlns + 'RTDOhms').text
-                        input_value = self.volts_convert(conversion_value)
-                        dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-                    case "T":  # Temperature
-                        input_value = ows_sensor.find(self.xmlns + 'Temperature').text
-                        dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-
-                dev.updateStateOnServer('sensorValue', value=input_value, uiValue=input_value)
+        entry = {'key': key, 'value': value}
+        if uiValue is not None:
+            entry['uiValue'] = uiValue
 
-            except Exception:  # noqa
-                self.logger.exception("General exception:")
-                self.logger.debug(f"Unable to update device state on server. Device: {dev.name}")
-                dev.updateStateOnServer('sensorValue', value="Unsupported", uiValue="Unsupported")
-                dev.updateStateImageOnServer(indigo.kStateImageSel.Error)
+        batch = self.state_batches.get(dev.id)
 
-            self.populate_props(dev, props, ows_sensor, "EDS0071")
+        if batch and batch[0] == threading.get_ident():
+            # A later write to the same key replaces the earlier one.
+            batch[1][key] = entry
+        else:
+            dev.updateStatesOnServer([entry])
 
-        except Exception:  # noqa
-            self.logger.critical("Sensor update failure. Check connection.")
-            self.logger.exception("General exception:")
-            dev.updateStateOnServer('onOffState', value=False, uiValue=" ")
-            dev.updateStateImageOnServer(indigo.kStateImageSel.Error)
-            return False
+        dev_cache[key] = new_value
+        return True
 
-    #  =============================================================================
-    def updateEDS0080(self, dev, ows_sensor, server_ip):  # noqa
+    # =============================================================================
+    def begin_state_batch(self, dev):
         """
-        Title Placeholder
+        Start collecting state changes for a device so they can be sent as one update
 
-        EDS0080 Description = "Octal 4-20 Milliamp Input"
+        Only writes made from the calling thread join the batch.
 
         :param indigo.Device dev:
-        :param XML ows_sensor:
-        :param str server_ip:
         """
-        self.logger.debug("updateEDS0080() method called.")
-        props = [
-            'LEDFunction', 'RelayFunction', 'RelayFunction', 'v4to20mAInput1HighAlarmValue',
-            'v4to20mAInput1LowAlarmValue', 'v4to20mAInput2HighAlarmValue', 'v4to20mAInput2LowAlarmValue',
-            'v4to20mAInput3HighAlarmValue', 'v4to20mAInput3LowAlarmValue', 'v4to20mAInput4HighAlarmValue',
-            'v4to20mAInput4LowAlarmValue', 'v4to20mAInput5HighAlarmValue', 'v4to20mAInput5LowAlarmValue',
-            'v4to20mAInput6HighAlarmValue', 'v4to20mAInput6LowAlarmValue', 'v4to20mAInput7HighAlarmValue',
-            'v4to20mAInput7LowAlarmValue', 'v4to20mAInput8HighAlarmValue', 'v4to20mAInput8LowAlarmValue'
-        ]
+        self.state_batches[dev.id] = (threading.get_ident(), {})
+
+    # =============================================================================
+    def flush_state_batch(self, dev):
+        """
+        Send a device's batched state changes to the Indigo server in a single call
+
+        :param indigo.Device dev:
+        :return int: the number of states sent.
+        """
+        batch = self.state_batches.pop(dev.id, None)
+
+        if not batch or not batch[1]:
+            return 0
 
         try:
-            eds0080_state_dict = self.state_dict.eds0080_state_dict()
-            input_value = None
+            dev.updateStatesOnServer(list(batch[1].values()))
+        except Exception:  # noqa
+            # Nothing in the batch can be assumed to have been written, so send every state on the next poll.
+            self.state_cache.pop(dev.id, None)
+            self.logger.exception(f"Unable to update device states on server. Device: {dev.name}")
+            return 0
 
-            for key, value in eds0080_state_dict.items():
-                try:
-                    dev.updateStateOnServer(key, value=ows_sensor.find(self.xmlns + value).text)
-                except Exception:  # noqa
-                    self.logger.exception("General exception:")
-                    self.logger.debug(f"Unable to update device state on server. Device: {dev.name}")
-                    self.logger.debug(f"Key: {key} : Value: Unsupported")
-                    dev.updateStateOnServer(key, value="Unsupported")
+        return len(batch[1])
 
-            # The user can select which of the following values become the main sensorValue.
-            try:
-                match dev.pluginProps['prefSensorValue0080']:
-                    case "I_1":  # Input 1
-                        conversion_value = ows_sensor.find(self.xmlns + 'v4to20mAInput1Instant').text
-                        input_value = self.volts_convert(conversion_value)
-                        dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-                    case "I_2":  # Input 2
-                        conversion_value = ows_sensor.find(self.xmlns + 'v4to20mAInput2Instant').text
-                        input_value = self.volts_convert(conversion_value)
-                        dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-                    case "I_3":  # Input 3
-                        conversion_value = ows_sensor.find(self.xmlns + 'v4to20mAInput3Instant').text
-                        input_value = self.volts_convert(conversion_value)
-                        dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-                    case "I_4":  # Input 4
-                        conversion_value = ows_sensor.find(self.xmlns + 'v4to20mAInput4Instant').text
-                        input_value = self.volts_convert(conversion_value)
-                        dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-                    case "I_5":  # Input 5
-                        conversion_value = ows_sensor.find(self.xmlns + 'v4to20mAInput5Instant').text
-                        input_value = self.volts_convert(conversion_value)
-                        dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-                    case "I_6":  # Input 6
-                        conversion_value = ows_sensor.find(self.xmlns + 'v4to20mAInput6Instant').text
-                        input_value = self.volts_convert(conversion_value)
-                        dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-                    case "I_7":  # Input 7
-                        conversion_value = ows_sensor.find(self.xmlns + 'v4to20mAInput7Instant').text
-                        input_value = self.volts_convert(conversion_value)
-                        dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-                    case "I_8":  # Input 8
-                        conversion_value = ows_sensor.find(self.xmlns + 'v4to20mAInput8Instant').text
-                        input_value = self.volts_convert(conversion_value)
-                        dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-                    case "LED":  # LED State
-                        input_value = ows_sensor.find(self.xmlns + 'LED').text
-                        if input_value == "1":
-                            dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOn)
-                        else:
-                            dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-                    case "Relay":  # Relay State
-                        input_value = ows_sensor.find(self.xmlns + 'Relay').text
-                        if input_value == "1":
-                            dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOn)
-                        else:
-                            dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-                    case "C_1":  # Counter 1
-                        conversion_value = ows_sensor.find(self.xmlns + 'Counter').text
-
-                dev.updateStateOnServer('sensorValue', value=input_value, uiValue=input_value)
+    # =============================================================================
+    def update_props(self, dev, new_values):
+        """
+        Save device props, but only if one of them has changed
 
-            except Exception:  # noqa
-                self.logger.exception("General exception:")
-                self.logger.debug(f"Unable to update device state on server. Device: {dev.name}")
-                dev.updateStateOnServer('sensorValue', value="Unsupported", uiValue="Unsupported")
-                dev.updateStateImageOnServer(indigo.kStateImageSel.Error)
+        Saving props costs a full round trip to the Indigo server and fires device config change events, and the
+        values mirrored from details.xml (address, alarm thresholds and the like) rarely change. Returns True if the
+        props were saved.
 
-            self.populate_props(dev, props, ows_sensor, "EDS0080")
+        :param indigo.Device dev:
+        :param dict new_values: {prop: value}
+        :return bool:
+        """
+        props = dev.pluginProps
+        changed = {key: value for key, value in new_values.items() if props.get(key) != value}
 
-        except Exception:  # noqa
-            self.logger.critical("Sensor update failure. Check connection.")
-            self.logger.exception("General exception:")
-            dev.updateStateOnServer('onOffState', value=False, uiValue=" ")
-            dev.updateStateImageOnServer(indigo.kStateImageSel.Error)
+        if not changed:
             return False
 
-    #  =============================================================================
-    def updateEDS0082(self, dev, ows_sensor, server_ip):  # noqa
+        self.logger.debug(f"Saving changed props for {dev.name}: {sorted(changed)}")
+        props.update(changed)
+        start = time.perf_counter()
+        dev.replacePluginPropsOnServer(props)
+        self.cycle_prop_writes += 1
+        self.add_cycle_timing(props.get('serverList', ''), 'prop_writes', time.perf_counter() - start)
+        return True
+
+    # =============================================================================
+    # ================== Server and Sensor Device Update Methods ==================
+    # =============================================================================
+    def updateOWServer(self, dev, server_data, server_ip):  # noqa
         """
         Title Placeholder
 
-        EDS0082 Description = "Octal Current Input Device"
+        Server Type: Covers OWSERVER-ENET Rev. 1 and Rev. 2
 
         :param indigo.Device dev:
-        :param XML ows_sensor:
+        :param dict server_data: server-level details.xml values keyed by tag.
         :param str server_ip:
         """
-        self.logger.debug("updateEDS0082() method called.")
-        props = [
-            'LEDFunction', 'RelayFunction', 'v0to10VoltInput1HighAlarmValue', 'v0to10VoltInput1LowAlarmValue',
-            'v0to10VoltInput2HighAlarmValue', 'v0to10VoltInput2LowAlarmValue', 'v0to10VoltInput3HighAlarmValue',
-            'v0to10VoltInput3LowAlarmValue', 'v0to10VoltInput4HighAlarmValue', 'v0to10VoltInput4LowAlarmValue',
-            'v0to10VoltInput5HighAlarmValue', 'v0to10VoltInput5LowAlarmValue', 'v0to10VoltInput6HighAlarmValue',
-            'v0to10VoltInput6LowAlarmValue', 'v0to10VoltInput7HighAlarmValue', 'v0to10VoltInput7LowAlarmValue',
-            'v0to10VoltInput8HighAlarmValue', 'v0to10VoltInput8LowAlarmValue'
-        ]
+        self.logger.debug("updateOWServer() method called.")
 
         try:
-            eds0082_state_dict = self.state_dict.eds0082_state_dict()
-            input_value = None
+            server_state_dict = self.state_dict.server_state_dict()
 
-            for key, value in eds0082_state_dict.items():
+            for key, value in server_state_dict.items():
                 try:
-                    dev.updateStateOnServer(key, value=ows_sensor.find(self.xmlns + value).text)
-                except Exception:  # noqa
-                    self.logger.exception("General exception:")
-                    self.logger.debug(f"Unable to update device state on server. Device: {dev.name}")
-                    self.logger.debug(f"Key: {key} : Value: Unsupported")
-                    dev.updateStateOnServer(key, value="Unsupported")
+                    self.update_state(dev, key, value=server_data[value])
+                except KeyError:
+                    self.update_state(dev, key, value="Unsupported")
 
-            # The user can select which of the following values become the main sensorValue.
             try:
-                match dev.pluginProps['prefSensorValue0082']:
-                    case "I_1":  # Input 1 Instant
-                        input_value = ows_sensor.find(self.xmlns + 'v0to10VoltInput1Instant').text
-                        input_value = self.volts_convert(input_value)
-                        dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-                    case "I_2":  # Input 2 Instant
-                        input_value = ows_sensor.find(self.xmlns + 'v0to10VoltInput2Instant').text
-                        input_value = self.volts_convert(input_value)
-                        dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-                    case "I_3":  # Input 3 Instant
-                        input_value = ows_sensor.find(self.xmlns + 'v0to10VoltInput3Instant').text
-                        input_value = self.volts_convert(input_value)
-                        dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-                    case "I_4":  # Input 4 Instant
-                        input_value = ows_sensor.find(self.xmlns + 'v0to10VoltInput4Instant').text
-                        input_value = self.volts_convert(input_value)
-                        dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-                    case "I_5":  # Input 5 Instant
-                        input_value = ows_sensor.find(self.xmlns + 'v0to10VoltInput5Instant').text
-                        input_value = self.volts_convert(input_value)
-                        dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-                    case "I_6":  # Input 6 Instant
-                        input_value = ows_sensor.find(self.xmlns + 'v0to10VoltInput6Instant').text
-                        input_value = self.volts_convert(input_value)
-                        dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-                    case "I_7":  # Input 7 Instant
-                        input_value = ows_sensor.find(self.xmlns + 'v0to10VoltInput7Instant').text
-                        input_value = self.volts_convert(input_value)
-                        dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-                    case "I_8":  # Input 8 Instant
-                        input_value = ows_sensor.find(self.xmlns + 'v0to10VoltInput8Instant').text
-                        input_value = self.volts_convert(input_value)
-                        dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-                    case "LED":  # LED State
-                        input_value = ows_sensor.find(self.xmlns + 'LED').text
-                        if input_value == "1":
-                            dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOn)
-                        else:
-                            dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-                    case "Relay":  # Relay State
-                        input_value = ows_sensor.find(self.xmlns + 'Relay').text
-                        if input_value == "1":
-                            dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOn)
-                        else:
-                            dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-
-                dev.updateStateOnServer('sensorValue', value=input_value, uiValue=input_value)
+                devices_connected = server_data['DevicesConnected']
+                if devices_connected == "1":
+                    input_value = f"{devices_connected} sensor"
+                else:
+                    input_value = f"{devices_connected} sensors"
+                self.update_state(dev, 'onOffState', value=True, uiValue=input_value)
+                dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOn)
 
             except Exception:  # noqa
-                self.logger.exception("General exception:")
                 self.logger.debug(f"Unable to update device state on server. Device: {dev.name}")
-                dev.updateStateOnServer('sensorValue', value="Unsupported", uiValue="Unsupported")
                 dev.updateStateImageOnServer(indigo.kStateImageSel.Error)
+                self.update_state(dev, 'onOffState', value=False, uiValue=" ")
+                self.logger.exception("General exception:")
+
+            mac_address = server_data.get('MACAddress')
+            if mac_address is not None:
+                self.update_props(dev, {'address': mac_address})
+            self.number_of_servers += 1
 
-            self.populate_props(dev, props, ows_sensor, "EDS0082")
+            self.logger.debug("Success. Polling next server if appropriate.")
+            return True
 
         except Exception:  # noqa
-            self.logger.critical("Sensor update failure. Check connection.")
+            self.logger.critical("Server update failure. Check settings.")
             self.logger.exception("General exception:")
-            dev.updateStateOnServer('onOffState', value=False, uiValue=" ")
+            self.update_state(dev, 'onOffState', value=False, uiValue=" ")
             dev.updateStateImageOnServer(indigo.kStateImageSel.Error)
             return False
 
     #  =============================================================================
-    def updateEDS0083(self, dev, ows_sensor, server_ip):  # noqa
+    def update_sensor_device(self, dev, sensor_family, sensor_data, server_ip):
         """
-        Title Placeholder
+        Update a sensor device from its details.xml values
 
-        EDS0083 Description = "Octal Current Input Device"
+        update_sensor_device() is the single update engine for every supported sensor family. Everything that differs
+        from one family to the next (state map, primary sensor value choices, conversions, props and state images)
+        comes from the family's entry in sensorFamilies.SENSOR_FAMILIES. A device whose family doesn't match the
+        sensor's family (for example, a ROM ID assigned to the wrong device type) is skipped.
 
         :param indigo.Device dev:
-        :param XML ows_sensor:
+        :param str sensor_family: the family from the sensor's owd_<family> tag.
+        :param dict sensor_data: the sensor's details.xml values keyed by tag.
         :param str server_ip:
         """
-        self.logger.debug("updateEDS0083() method called.")
-        props = [
-            'LEDFunction', 'RelayFunction', 'v4to20mAInput1HighAlarmValue', 'v4to20mAInput1LowAlarmValue',
-            'v4to20mAInput2HighAlarmValue', 'v4to20mAInput2LowAlarmValue', 'v4to20mAInput3HighAlarmValue',
-            'v4to20mAInput3LowAlarmValue', 'v4to20mAInput4HighAlarmValue', 'v4to20mAInput4LowAlarmValue'
-        ]
+        family = SENSOR_FAMILIES[dev.deviceTypeId]
+        family_name = family['family']
 
-        try:
-            eds0083_state_dict = self.state_dict.eds0083_state_dict()
-            input_value = None
+        if sensor_family != family_name:
+            self.logger.debug(f"{dev.name} expects a {family_name} sensor. Skipping.")
+            return False
 
-            for key, value in eds0083_state_dict.items():
+        self.logger.debug(f"Updating {family_name} device: {dev.name}")
+        values = sensor_data
+
+        try:
+            for key, value in family['states'].items():
                 try:
-                    dev.updateStateOnServer(key, value=ows_sensor.find(self.xmlns + value).text)
+                    if key == "owsTemperature" and family['temp_comp']:
+                        self.update_state(dev, key, value=self.convert_value(dev, family, 'temperature', values[value]))
+                    else:
+                        self.update_state(dev, key, value=values[value])
                 except Exception:  # noqa
                     self.logger.exception("General exception:")
                     self.logger.debug(f"Unable to update device state on server. Device: {dev.name}")
                     self.logger.debug(f"Key: {key} : Value: Unsupported")
-                    dev.updateStateOnServer(key, value="Unsupported")
+                    self.update_state(dev, key, value="Unsupported")
 
-            # The user can select which of the following values become the main sensorValue.
+            # The user can select which of the family's values becomes the main sensorValue.
             try:
-                match dev.pluginProps['prefSensorValue0083']:
-                    case "I_1":  # Input 1 Instant
-                        input_value = ows_sensor.find(self.xmlns + 'v4to20mAInput1Instant').text
-                        input_value = self.volts_convert(input_value)
-                        dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-                    case "I_2":  # Input 2 Instant
-                        input_value = ows_sensor.find(self.xmlns + 'v4to20mAInput2Instant').text
-                        input_value = self.volts_convert(input_value)
-                        dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-                    case "I_3":  # Input 3 Instant
-                        input_value = ows_sensor.find(self.xmlns + 'v4to20mAInput3Instant').text
-                        input_value = self.volts_convert(input_value)
-                        dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-                    case "I_4":  # Input 4 Instant
-                        input_value = ows_sensor.find(self.xmlns + 'v4to20mAInput4Instant').text
-                        input_value = self.volts_convert(input_value)
-                        dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-                    case "LED":  # LED State
-                        input_value = ows_sensor.find(self.xmlns + 'LED').text
-                        if input_value == "1":
-                            dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOn)
-                        else:
-                            dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-                    case "Relay":  # Relay State
-                        input_value = ows_sensor.find(self.xmlns + 'Relay').text
-                        if input_value == "1":
-                            dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOn)
-                        else:
-                            dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-
-                dev.updateStateOnServer('sensorValue', value=input_value, uiValue=input_value)
+                if family['derive']:
+                    values = {**sensor_data, **getattr(self, family['derive'])(dev, sensor_data)}
+
+                choice = dev.pluginProps[family['value_pref']] if family['value_pref'] else None
+                key, converter, image = family['values'][choice]
+                input_value = self.convert_value(dev, family, converter, values[key])
+                self.update_state(dev, 'sensorValue', value=input_value, uiValue=input_value)
+                self.update_state_image(dev, image, input_value)
 
             except Exception:  # noqa
                 self.logger.exception("General exception:")
                 self.logger.debug(f"Unable to update device state on server. Device: {dev.name}")
-                dev.updateStateOnServer('sensorValue', value="Unsupported", uiValue="Unsupported")
+                self.update_state(dev, 'sensorValue', value="Unsupported", uiValue="Unsupported")
                 dev.updateStateImageOnServer(indigo.kStateImageSel.Error)
 
-            self.populate_props(dev, props, ows_sensor, "EDS0083")
+            self.populate_props(dev, family['props'], sensor_data, family_name)
+
+            if family['image']:
+                dev.updateStateImageOnServer(getattr(indigo.kStateImageSel, family['image']))
+
+            return True
 
         except Exception:  # noqa
             self.logger.critical("Sensor update failure. Check connection.")
             self.logger.exception("General exception:")
-            dev.updateStateOnServer('onOffState', value=False, uiValue=" ")
+            self.update_state(dev, 'onOffState', value=False, uiValue=" ")
             dev.updateStateImageOnServer(indigo.kStateImageSel.Error)
             return False
 
     #  =============================================================================
-    def updateEDS0085(self, dev, ows_sensor, server_ip):  # noqa
+    def convert_value(self, dev, family, converter, value):
         """
-        Title Placeholder
-
-        EDS0085 Description = "Octal Current Input Device"
+        Apply a named conversion from the sensor family registry to a details.xml value
 
         :param indigo.Device dev:
-        :param XML ows_sensor:
-        :param str server_ip:
-        """
-        self.logger.debug("updateEDS0085() method called.")
-        props = [
-            'LEDFunction', 'RelayFunction', 'v0to10VoltInput1HighAlarmValue', 'v0to10VoltInput1LowAlarmValue',
-            'v0to10VoltInput2HighAlarmValue', 'v0to10VoltInput2LowAlarmValue', 'v0to10VoltInput3HighAlarmValue',
-            'v0to10VoltInput3LowAlarmValue', 'v0to10VoltInput4HighAlarmValue', 'v0to10VoltInput4LowAlarmValue'
-        ]
-
-        try:
-            eds0085_state_dict = self.state_dict.eds0085_state_dict()
-            input_value = None
-
-            for key, value in eds0085_state_dict.items():
-                try:
-                    dev.updateStateOnServer(key, value=ows_sensor.find(self.xmlns + value).text)
-                except Exception:  # noqa
-                    self.logger.exception("General exception:")
-                    self.logger.debug(f"Unable to update device state on server. Device: {dev.name}")
-                    self.logger.debug(f"Key: {key} : Value: Unsupported")
-                    dev.updateStateOnServer(key, value="Unsupported")
+        :param dict family:
+        :param str converter:
+        :param str value:
+        """
+        match converter:
+            case "temperature":
+                comp_val = dev.pluginProps.get(family['temp_comp'], '0.0')
+                return self.temp_convert(float(value) + float(comp_val))
+            case "temp":
+                return self.temp_convert(value)
+            case "humidex":
+                return self.humidex_convert(value)
+            case "humidity":
+                return self.humidity_convert(value)
+            case "pressure":
+                return self.pressure_convert(value)
+            case "volts":
+                return self.volts_convert(value)
+            case _:
+                return value
 
-            # The user can select which of the following values become the main sensorValue.
-            try:
-                match dev.pluginProps['prefSensorValue0085']:
-                    case "I_1":  # Input 1 Instant
-                        input_value = ows_sensor.find(self.xmlns + 'v0to10VoltInput1Instant').text
-                        input_value = self.volts_convert(input_value)
-                        dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-                    case "I_2":  # Input 2 Instant
-                        input_value = ows_sensor.find(self.xmlns + 'v0to10VoltInput2Instant').text
-                        input_value = self.volts_convert(input_value)
-                        dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-                    case "I_3":  # Input 3 Instant
-                        input_value = ows_sensor.find(self.xmlns + 'v0to10VoltInput3Instant').text
-                        input_value = self.volts_convert(input_value)
-                        dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-                    case "I_4":  # Input 4 Instant
-                        input_value = ows_sensor.find(self.xmlns + 'v0to10VoltInput4Instant').text
-                        input_value = self.volts_convert(input_value)
-                        dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-                    case "LED":  # LED State
-                        input_value = ows_sensor.find(self.xmlns + 'LED').text
-                        if input_value == "1":
-                            dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOn)
-                        else:
-                            dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-                    case "Relay":  # Relay State
-                        input_value = ows_sensor.find(self.xmlns + 'Relay').text
-                        if input_value == "1":
-                            dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOn)
-                        else:
-                            dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-
-                dev.updateStateOnServer('sensorValue', value=input_value, uiValue=input_value)
+    #  =============================================================================
+    @staticmethod
+    def update_state_image(dev, image, value):
+        """
+        Apply a state image from the sensor family registry
 
-            except Exception:  # noqa
-                self.logger.exception("General exception:")
-                self.logger.debug(f"Unable to update device state on server. Device: {dev.name}")
-                dev.updateStateOnServer('sensorValue', value="Unsupported", uiValue="Unsupported")
-                dev.updateStateImageOnServer(indigo.kStateImageSel.Error)
+        'on_if_0' and 'on_if_1' select SensorOn or SensorOff depending on the value; anything else names an
+        indigo.kStateImageSel member.
 
-            self.populate_props(dev, props, ows_sensor, "EDS0085")
+        :param indigo.Device dev:
+        :param str image:
+        :param str value:
+        """
+        match image:
+            case None:
+                return
+            case "on_if_0":
+                selector = indigo.kStateImageSel.SensorOn if value == "0" else indigo.kStateImageSel.SensorOff
+            case "on_if_1":
+                selector = indigo.kStateImageSel.SensorOn if value == "1" else indigo.kStateImageSel.SensorOff
+            case _:
+                selector = getattr(indigo.kStateImageSel, image)
 
-        except Exception:  # noqa
-            self.logger.critical("Sensor update failure. Check connection.")
-            self.logger.exception("General exception:")
-            dev.updateStateOnServer('onOffState', value=False, uiValue=" ")
-            dev.updateStateImageOnServer(indigo.kStateImageSel.Error)
-            return False
+        dev.updateStateImageOnServer(selector)
 
     #  =============================================================================
-    def updateEDS0090(self, dev, ows_sensor, server_ip):  # noqa
+    def derive_ds2408_switches(self, dev, sensor_data):
         """
-        Title Placeholder
+        Impute the DS2408 switch states from <PIOOutputLatchState>
 
-        EDS0090 Description = "Octal Discrete IO"
+        The switch states don't exist in the details.xml file. PIOOutputLatchState is a bit mask with switch 0 in the
+        least significant bit, and is returned as Switch0 ... Switch7 so that a switch can be selected as the primary
+        sensor value. The owsInput states keep their original order, with the most significant bit first (owsInput1 is
+        switch 7 and owsInput8 is switch 0), so that existing triggers keep their meaning.
 
         :param indigo.Device dev:
-        :param XML ows_sensor:
-        :param str server_ip:
+        :param dict sensor_data: the sensor's details.xml values keyed by tag.
+        :return dict:
         """
-        self.logger.debug("updateEDS0090() method called.")
-        props = [
-            'DiscreteIO1ActivityLatchReset', 'DiscreteIO1HighAlarmValue', 'DiscreteIO1LowAlarmValue',
-            'DiscreteIO1OutputState', 'DiscreteIO1PulldownState', 'DiscreteIO1PulseCounterReset',
-            'DiscreteIO2ActivityLatchReset', 'DiscreteIO2HighAlarmValue', 'DiscreteIO2LowAlarmValue',
-            'DiscreteIO2OutputState', 'DiscreteIO2PulldownState', 'DiscreteIO2PulseCounterReset',
-            'DiscreteIO3ActivityLatchReset', 'DiscreteIO3HighAlarmValue', 'DiscreteIO3LowAlarmValue',
-            'DiscreteIO3OutputState', 'DiscreteIO3PulldownState', 'DiscreteIO3PulldownState',
-            'DiscreteIO4ActivityLatchReset', 'DiscreteIO4HighAlarmValue', 'DiscreteIO4LowAlarmValue',
-            'DiscreteIO4OutputState', 'DiscreteIO4PulldownState', 'DiscreteIO5ActivityLatchReset',
-            'DiscreteIO5HighAlarmValue', 'DiscreteIO5LowAlarmValue', 'DiscreteIO5OutputState',
-            'DiscreteIO5PulldownState', 'DiscreteIO6ActivityLatchReset', 'DiscreteIO6HighAlarmValue',
-            'DiscreteIO6LowAlarmValue', 'DiscreteIO6OutputState', 'DiscreteIO6PulldownState',
-            'DiscreteIO7ActivityLatchReset', 'DiscreteIO7HighAlarmValue', 'DiscreteIO7LowAlarmValue',
-            'DiscreteIO7OutputState', 'DiscreteIO7PulldownState', 'DiscreteIO8ActivityLatchReset',
-            'DiscreteIO8HighAlarmValue', 'DiscreteIO8LowAlarmValue', 'DiscreteIO8OutputState',
-            'DiscreteIO8PulldownState', 'LEDFunction', 'RelayFunction'
-        ]
-
-        try:
-            eds0090_state_dict = self.state_dict.eds0090_state_dict()
-            input_value = None
-
-            for key, value in eds0090_state_dict.items():
-                try:
-                    dev.updateStateOnServer(key, value=ows_sensor.find(self.xmlns + value).text)
-                except Exception:  # noqa
-                    self.logger.exception("General exception:")
-                    self.logger.debug(f"Unable to update device state on server. Device: {dev.name}")
-                    self.logger.debug(f"Key: {key} : Value: Unsupported")
-                    dev.updateStateOnServer(key, value="Unsupported")
-
-            # The user can select which of the following values become the main sensorValue.
-            try:
-                match dev.pluginProps['prefSensorValue0090']:
-                    case "C_1":  # Counter 1
-                        input_value = ows_sensor.find(self.xmlns + 'Counter').text
-                        dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-                    case "I_1":  # Input 1 State
-                        input_value = ows_sensor.find(self.xmlns + 'DiscreteIO1InputState').text
-                        dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-                    case "I_2":  # Input 2 State
-                        input_value = ows_sensor.find(self.xmlns + 'DiscreteIO2InputState').text
-                        dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-                    case "I_3":  # Input 3 State
-                        input_value = ows_sensor.find(self.xmlns + 'DiscreteIO3InputState').text
-                        dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-                    case "I_4":  # Input 4 State
-                        input_value = ows_sensor.find(self.xmlns + 'DiscreteIO4InputState').text
-                        dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-                    case "I_5":  # Input 5 State
-                        input_value = ows_sensor.find(self.xmlns + 'DiscreteIO5InputState').text
-                        dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-                    case "I_6":  # Input 6 State
-                        input_value = ows_sensor.find(self.xmlns + 'DiscreteIO6InputState').text
-                        dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-                    case "I_7":  # Input 7 State
-                        input_value = ows_sensor.find(self.xmlns + 'DiscreteIO7InputState').text
-                        dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-                    case "I_8":  # Input 8 State
-                        input_value = ows_sensor.find(self.xmlns + 'DiscreteIO8InputState').text
-                        dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-                    case "LED":  # LED State
-                        input_value = ows_sensor.find(self.xmlns + 'LED').text
-                        if input_value == "1":
-                            dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOn)
-                        else:
-                            dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-                    case "Relay":  # Relay State
-                        input_value = ows_sensor.find(self.xmlns + 'Relay').text
-                        if input_value == "1":
-                            dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOn)
-                        else:
-                            dev.updateStateImageOnServer(indigo.kStateImageSel.SensorOff)
-
-                dev.updateStateOnServer('sensorValue', value=input_value, uiValue=input_value)
+        latch_state_str = f"{int(float(sensor_data['PIOOutputLatchState'])):08b}"
+        switches = {}
 
-            except Exception:  # noqa
-                self.logger.exception("General exception:")
-                self.logger.debug(f"Unable to update device state on server. Device: {dev.name}")
-                dev.updateStateOnServer('sensorValue', value="Unsupported", uiValue="Unsupported")
-                dev.updateStateImageOnServer(indigo.kStateImageSel.Error)
+        for bit in range(0, 8):
+            switches[f'Switch{7 - bit}'] = latch_state_str[bit]
+            self.update_state(dev, f'owsInput{bit + 1}', value=latch_state_str[bit])
 
-            self.populate_props(dev, props, ows_sensor, "EDS0090")
+        return switches
 
-        except Exception:  # noqa
-            self.logger.critical("Sensor update failure. Check connection.")
-            self.logger.exception("General exception:")
-            dev.updateStateOnServer('onOffState', value=False, uiValue=" ")
-            dev.updateStateImageOnServer(indigo.kStateImageSel.Error)
-            return False
+    #  =============================================================================
+    def populate_props(self, dev, props, sensor_data, sensor_num):
+        """
+        Mirror details.xml values to device props and mark the device as updated
 
-    def populate_props(self, dev, props, ows_sensor, sensor_num):
-        new_props = dev.pluginProps
-        for prop in props:
-            new_props[f'{sensor_num}{prop}'] = ows_sensor.find(self.xmlns + prop).text
-        new_props['address'] = dev.states['owsRomID']
+        :param indigo.Device dev:
+        :param list props: details.xml keys to mirror.
+        :param dict sensor_data: the sensor's details.xml values keyed by tag.
+        :param str sensor_num: the sensor family, used as the prop name prefix.
+        """
+        new_values = {f'{sensor_num}{prop}': sensor_data[prop] for prop in props}
+        new_values['address'] = sensor_data['ROMId']
+        self.update_props(dev, new_values)
         self.number_of_sensors += 1
-        dev.updateStateOnServer('onOffState', value=True, uiValue=" ")
+        self.update_state(dev, 'onOffState', value=True, uiValue=" ")
         self.logger.debug("Success. Polling next sensor if appropriate.")
         return True
 
@@ -3666,7 +3628,6 @@ class Plugin(indigo.PluginBase):
         :param str fltr:
         :return:
         """
-        new_var = ""
         try:
             match indigo.devices[target_id].states['owsLED']:
                 case "1":
@@ -3675,11 +3636,12 @@ class Plugin(indigo.PluginBase):
                     new_var = "1"
                 case _:
                     self.logger.critical("Error toggling sensor LED.")
+                    return
         except Exception:  # noqa
             self.logger.exception("General exception:")
+            return
 
-        parm_list = (values_dict['serverList'], values_dict['romID'], "LEDState", new_var)
-        self.sendToServer(parm_list)
+        self.queue_write(values_dict['serverList'], values_dict['romID'], "LEDState", new_var, toggle=True)
 
     # =============================================================================
     def toggle_relay(self, values_dict, type_id, target_id, fltr="indigo.sensor"):  # noqa
@@ -3694,7 +3656,6 @@ class Plugin(indigo.PluginBase):
         :param str fltr:
         :return:
         """
-        new_var = ""
         try:
             match indigo.devices[target_id].states['owsRelay']:
                 case "1":
@@ -3703,11 +3664,12 @@ class Plugin(indigo.PluginBase):
                     new_var = "1"
                 case _:
                     self.logger.critical("Error toggling sensor relay.")
+                    return
         except Exception:  # noqa
             self.logger.exception("General exception:")
+            return
 
-        parm_list = (values_dict['serverList'], values_dict['romID'], "RelayState", new_var)
-        self.sendToServer(parm_list)
+        self.queue_write(values_dict['serverList'], values_dict['romID'], "RelayState", new_var, toggle=True)
 
     # =============================================================================
     def updateDeviceStatesAction(self, values_dict):  # noqa
@@ -3724,234 +3686,416 @@ class Plugin(indigo.PluginBase):
         """
         Invoke the updateDeviceStates() method when it is called for from a Menu item.
 
+        A refresh requested from the menu writes every state, whether it has changed or not.
+
         :return:
         """
-        self.updateDeviceStates()
-        indigo.server.log("Sensors updated.")
+        self.updateDeviceStates(force=True)
+        if self.replay_session is None:
+            indigo.server.log("Sensors updated.")
 
     # =============================================================================
-    def updateDeviceStates(self):  # noqa
+    def updateDeviceStates(self, force=False, due=None, replay=False):  # noqa
         """
         Initiate an update for each established Indigo device.
 
+        The device registry is built once per poll, so every device is matched to its sensor with a dictionary lookup
+        rather than scanning every device and every sensor for every server. Each server's details.xml is streamed and
+        parsed incrementally, and sensor devices are updated as soon as their sensor element has arrived rather than
+        after the whole file has been downloaded.
+
+        When the poll scheduler passes the devices that are due, only the servers those devices belong to are polled and
+        only those devices are updated.
+
+        Polls run one at a time under poll_lock, since each resets the per-poll counters and timings kept on the plugin.
+
+        While captured traffic is being replayed, only the replay's own polls run. Other refreshes are skipped, and the
+        replayed polls leave the circuit breakers, fetch failure counts, adaptive polling and metrics alone.
+
+        :param bool force: write every device state, even those that haven't changed since the last poll.
+        :param set due: IDs of the devices to update. All devices are updated when due is None.
+        :param bool replay: the poll is being run by replay_traffic().
         :return:
         """
         self.logger.debug("updateDeviceStates() method called.")
 
-        addr = self.pluginPrefs['OWServerIP']
-        split_ip = addr.replace(" ", "").split(",")
-        self.number_of_sensors = 0
-        self.number_of_servers = 0
-        pref_poll = int(self.pluginPrefs.get('configMenuPollInterval', 900))
+        if self.replay_session is not None and not replay:
+            self.logger.info("Captured traffic is being replayed. Use Stop Replay to refresh from the servers.")
+            return
+
+        # Polls can be started from the poll loop, menus, actions and the write refresh at the same time. Each poll
+        # resets the per-poll counters and timings, so polls are run one at a time.
+        with self.poll_lock:
+            self.apply_pending_changes()
+
+            if force:
+                self.state_cache.clear()
+
+            addr = self.pluginPrefs['OWServerIP']
+            split_ip = addr.replace(" ", "").split(",")
+            self.number_of_sensors = 0
+            self.number_of_servers = 0
+
+            if not self.pluginPrefs.get('suppressResultsLogging', False):
+                self.logger.info("Getting OWServer data...")
+
+            cycle_start = time.perf_counter()
+            self.cycle_timings = {}
+            self.cycle_state_writes = 0
+            self.cycle_prop_writes = 0
+            server_registry, sensor_registry = self.build_device_registry(due)
+            self.poll_stats.record('cycle', 'all', 'match', time.perf_counter() - cycle_start)
+
+            if due is not None:
+                due_servers = set(server_registry) | {server_ip for server_ip, rom_id in sensor_registry}
+                split_ip = [server_ip for server_ip in split_ip if server_ip in due_servers]
+
+                if not split_ip:
+                    self.logger.debug("No servers have devices due.")
+                    return
+
+            # Servers whose circuit breaker is open are skipped without waiting on a timeout. Their devices were marked
+            # offline when the breaker opened. A forced refresh tries every server.
+            if not force and not replay:
+                skipped = [server_ip for server_ip in split_ip if not self.get_breaker(server_ip).allow()]
+                if skipped:
+                    self.logger.debug(f"Skipping unreachable servers until their backoff has passed: {skipped}")
+                    split_ip = [server_ip for server_ip in split_ip if server_ip not in skipped]
+
+                if not split_ip:
+                    return
+
+            # Servers are streamed and parsed concurrently by a bounded pool of worker threads. The workers queue each
+            # parsed element and the results are applied to Indigo devices from this thread as they arrive, so a slow
+            # server doesn't hold up the others.
+            max_workers = max(1, min(int(self.pluginPrefs.get('configMenuMaxConcurrency', 4)), len(split_ip)))
+            results = queue.Queue()
+
+            with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="OWServerPoll") as executor:
+                for server_ip in split_ip:
+                    executor.submit(self.stream_server_data, server_ip, results)
+
+                # Each worker finishes with exactly one 'done' or 'error' result.
+                remaining = len(split_ip)
+                while remaining:
+                    kind, server_ip, payload = results.get()
+
+                    match kind:
+                        case 'sensor':
+                            self.update_sensor_devices(server_ip, *payload, sensor_registry)
+                        case 'server':
+                            self.update_server_devices(server_ip, payload, server_registry)
+                        case 'done':
+                            remaining -= 1
+                            self.record_cycle_timings(server_ip)
+                            active = self.server_activity.pop(server_ip, False)
+                            if replay:
+                                continue
+                            self.get_breaker(server_ip).record_success()
+                            if self.pluginPrefs.get('adaptivePolling', False):
+                                self.adapt_poll_interval(server_ip, active)
+                        case _:
+                            remaining -= 1
+                            self.server_activity.pop(server_ip, None)
+                            # There has been a problem reaching the server. "Turn off" its devices until the next
+                            # successful poll. Devices on other servers are left alone.
+                            _ = [
+                                self.update_state(dev, 'onOffState', value=False)
+                                for dev in indigo.devices.itervalues("self")
+                                if dev.pluginProps.get('serverList', '') == server_ip
+                            ]
+                            self.logger.warning(f"Error parsing sensor states for server {server_ip}.")
+                            if replay:
+                                continue
+                            self.fetch_failures[server_ip] = self.fetch_failures.get(server_ip, 0) + 1
+                            backoff = self.get_breaker(server_ip).record_failure()
+                            if backoff:
+                                self.logger.warning(f"Trying again in {backoff:.0f} seconds.")
+                            else:
+                                self.logger.warning("Trying again on the next poll.")
+
+            cycle_time = time.perf_counter() - cycle_start
+            self.poll_stats.record('cycle', 'all', 'total', cycle_time)
+            if not replay:
+                self.publish_metrics(cycle_time)
+            self.logger.debug("  No more sensors to poll.")
+
+            if not self.pluginPrefs.get("suppressResultsLogging", False):
+                self.logger.info(f"  Total of {self.number_of_servers} servers polled.")
+                self.logger.info(f"  Total of {self.number_of_sensors} devices updated.")
+                self.logger.info("OWServer data parsed successfully.")
 
-        if not self.pluginPrefs.get('suppressResultsLogging', False):
-            self.logger.info("Getting OWServer data...")
+    # =============================================================================
+    def get_breaker(self, server_ip):
+        """
+        Return the circuit breaker for a server, creating it if needed
 
-        for server_ip in split_ip:
+        :param str server_ip:
+        :return CircuitBreaker:
+        """
+        return self.breakers.setdefault(server_ip, CircuitBreaker())
+
+    # =============================================================================
+    def stream_server_data(self, server_ip, results):
+        """
+        Stream one server's details.xml onto the results queue
+
+        stream_server_data() runs on a poll worker thread, so it must not touch Indigo devices. Everything
+        iter_details_xml() yields is put on the queue as (kind, server_ip, payload), followed by a final ('done',
+        server_ip, None), or ('error', server_ip, None) if the server couldn't be reached or its details.xml couldn't
+        be parsed.
+
+        :param str server_ip:
+        :param queue.Queue results:
+        """
+        self.logger.debug(f"Getting details.xml for server {server_ip}")
+        self.fetch_started[server_ip] = time.monotonic()
+
+        try:
+            for kind, payload in self.iter_details_xml(server_ip):
+                results.put((kind, server_ip, payload))
+            results.put(('done', server_ip, None))
+
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout, requests.exceptions.HTTPError):
+            self.logger.warning("Unable to make a successful connection to One Wire Server.")
+            results.put(('error', server_ip, None))
+
+        except Exception:  # noqa
+            self.logger.exception("General exception:")
+            results.put(('error', server_ip, None))
+
+    # =============================================================================
+    def iter_details_xml(self, server_ip):
+        """
+        Stream details.xml from a server and yield its values as each element is parsed
+
+        The response is fed to parse_details_xml() in chunks as it arrives, so sensor values are yielded while the rest
+        of the file is still downloading. Once the whole file has been parsed it is saved as the server's snapshot.
+        Connection errors and malformed or truncated XML are raised to the caller.
+
+        While captured traffic is being replayed, details.xml comes from the replay session and is neither captured,
+        timed for automatic timeouts nor saved as a snapshot.
+
+        :param str server_ip:
+        """
+        # The EDS server does not support https://.
+        url      = f"http://{server_ip}/details.xml"  # noqa
+        body     = []
+        replay   = self.replay_session
+        session  = replay or self.get_session(server_ip)
+
+        with session.get(url, timeout=self.get_timeout(server_ip), stream=True) as response:
+            response.raise_for_status()
+            if replay is None:
+                self.record_latency(server_ip, response.elapsed.total_seconds())
+            download_time = 0.0
+            start = time.perf_counter()
+
+            def chunks():
+                nonlocal download_time
+                content = response.iter_content(chunk_size=8192)
+                while True:
+                    chunk_start = time.perf_counter()
+                    chunk = next(content, None)
+                    download_time += time.perf_counter() - chunk_start
+                    if chunk is None:
+                        return
+                    body.append(chunk)
+                    yield chunk
 
             try:
-                # Grab details.xml
-                self.logger.debug(f"Getting details.xml for server {server_ip}")
-                ows_xml = self.get_details_xml(server_ip)
+                yield from self.parse_details_xml(chunks())
+            finally:
+                # Responses that fail to parse are captured too, so that the failure can be reproduced.
+                capture = self.traffic_capture
+                if capture is not None and replay is None:
+                    try:
+                        capture.write(server_ip, b"".join(body))
+                    except OSError:
+                        self.logger.exception("General exception:")
+                        self.logger.warning("Unable to write to the traffic capture archive.")
 
-                if not ows_xml:
-                    raise Exception
+            # Downloading and parsing are interleaved, so parse time is whatever wasn't spent waiting on the server.
+            self.poll_stats.record('server', server_ip, 'connect', response.elapsed.total_seconds())
+            self.poll_stats.record('server', server_ip, 'download', download_time)
+            self.poll_stats.record('server', server_ip, 'parse', time.perf_counter() - start - download_time)
 
-                root = eTree.fromstring(ows_xml)
+            if replay is None:
+                self.store_snapshot(server_ip, b"".join(body).decode(response.encoding or 'utf-8', errors='replace'))
 
-                for dev in indigo.devices.itervalues("self"):
-                    if not dev:
-                        # There are no devices of type OWServer, so go to sleep.
-                        self.logger.debug("There aren't any servers or sensors to assign yet. Sleeping.")
-                        self.sleep(pref_poll)
+    # =============================================================================
+    @staticmethod
+    def parse_details_xml(chunks):
+        """
+        Incrementally parse details.xml and yield its values as each element is complete
 
-                    elif not dev.configured:
-                        # A device has been created, but hasn't been fully configured.
-                        self.logger.warning(
-                            "A device has been created, but is not fully  configured. Sleeping while you finish."
-                        )
-                        self.sleep(pref_poll)
-
-                    elif not dev.enabled:
-                        # A device has been disabled. Skip it.
-                        self.logger.debug(f"{dev.name} is disabled. Skipping.")
-
-                    elif dev.enabled:
-                        self.logger.debug(f"Parsing information for device: {dev.name}")
-
-                        try:
-                            if (dev.deviceTypeId == "owsOWSServer"
-                                    and dev.pluginProps['serverList'] == server_ip):
-                                self.updateOWServer(dev, root, server_ip)
-
-                            elif dev.deviceTypeId == 'owsTemperatureSensor':
-                                for owsSensor in root.findall('./' + self.xmlns + 'owd_DS18B20'):
-                                    self.logger.debug("Parsing DS18B20 devices.")
-                                    rom_id = owsSensor.find(self.xmlns + 'ROMId').text
-                                    if dev.pluginProps['romID'] == rom_id \
-                                            and dev.pluginProps['serverList'] == server_ip:
-                                        self.updateDS18B20(dev, owsSensor, server_ip)
-
-                            elif dev.deviceTypeId == 'owsTemperatureSensor_S':
-                                for owsSensor in root.findall('./' + self.xmlns + 'owd_DS18S20'):
-                                    self.logger.debug("Parsing DS18S20 devices.")
-                                    rom_id = owsSensor.find(self.xmlns + 'ROMId').text
-                                    if dev.pluginProps['romID'] == rom_id \
-                                            and dev.pluginProps['serverList'] == server_ip:
-                                        self.updateDS18S20(dev, owsSensor, server_ip)
-
-                            elif dev.deviceTypeId == 'owsDualSwitchPlusMemory':
-                                for owsSensor in root.findall('./' + self.xmlns + 'owd_DS2406'):
-                                    self.logger.debug("Parsing DS2406 devices.")
-                                    rom_id = owsSensor.find(self.xmlns + 'ROMId').text
-                                    if dev.pluginProps['romID'] == rom_id \
-                                            and dev.pluginProps['serverList'] == server_ip:
-                                        self.updateDS2406(dev, owsSensor, server_ip)
-
-                            elif dev.deviceTypeId == 'owsUserSwitch':
-                                for owsSensor in root.findall('./' + self.xmlns + 'owd_DS2408'):
-                                    self.logger.debug("Parsing DS2408 devices.")
-                                    rom_id = owsSensor.find(self.xmlns + 'ROMId').text
-                                    if dev.pluginProps['romID'] == rom_id \
-                                            and dev.pluginProps['serverList'] == server_ip:
-                                        self.updateDS2408(dev, owsSensor, server_ip)
-
-                            elif dev.deviceTypeId == 'owsCounterDevice':
-                                for owsSensor in root.findall('./' + self.xmlns + 'owd_DS2423'):
-                                    self.logger.debug("Parsing DS2423 devices.")
-                                    rom_id = owsSensor.find(self.xmlns + 'ROMId').text
-                                    if dev.pluginProps['romID'] == rom_id \
-                                            and dev.pluginProps['serverList'] == server_ip:
-                                        self.updateDS2423(dev, owsSensor, server_ip)
-
-                            elif dev.deviceTypeId == 'owsSmartBatteryMonitor':
-                                for owsSensor in root.findall('./' + self.xmlns + 'owd_DS2438'):
-                                    self.logger.debug("Parsing DS2438 devices.")
-                                    rom_id = owsSensor.find(self.xmlns + 'ROMId').text
-                                    if dev.pluginProps['romID'] == rom_id \
-                                            and dev.pluginProps['serverList'] == server_ip:
-                                        self.updateDS2438(dev, owsSensor, server_ip)
-
-                            elif dev.deviceTypeId == 'owsQuadConverter':
-                                for owsSensor in root.findall('./' + self.xmlns + 'owd_DS2450'):
-                                    self.logger.debug("Parsing DS2450 devices.")
-                                    rom_id = owsSensor.find(self.xmlns + 'ROMId').text
-                                    if dev.pluginProps['romID'] == rom_id \
-                                            and dev.pluginProps['serverList'] == server_ip:
-                                        self.updateDS2450(dev, owsSensor, server_ip)
-
-                            elif dev.deviceTypeId == 'owsTemperatureSensor64':
-                                for owsSensor in root.findall('./' + self.xmlns + 'owd_EDS0064'):
-                                    self.logger.debug("Parsing EDS0064 devices.")
-                                    rom_id = owsSensor.find(self.xmlns + 'ROMId').text
-                                    if dev.pluginProps['romID'] == rom_id \
-                                            and dev.pluginProps['serverList'] == server_ip:
-                                        self.updateEDS0064(dev, owsSensor, server_ip)
-
-                            elif dev.deviceTypeId == 'owsTemperatureHumiditySensor65':
-                                for owsSensor in root.findall('./' + self.xmlns + 'owd_EDS0065'):
-                                    self.logger.debug("Parsing EDS0065 devices.")
-                                    rom_id = owsSensor.find(self.xmlns + 'ROMId').text
-                                    if dev.pluginProps['romID'] == rom_id \
-                                            and dev.pluginProps['serverList'] == server_ip:
-                                        self.updateEDS0065(dev, owsSensor, server_ip)
-
-                            elif dev.deviceTypeId == 'owsTemperaturePressureSensor66':
-                                for owsSensor in root.findall('./' + self.xmlns + 'owd_EDS0066'):
-                                    self.logger.debug("Parsing EDS0066 devices.")
-                                    rom_id = owsSensor.find(self.xmlns + 'ROMId').text
-                                    if dev.pluginProps['romID'] == rom_id \
-                                            and dev.pluginProps['serverList'] == server_ip:
-                                        self.updateEDS0066(dev, owsSensor, server_ip)
-
-                            elif dev.deviceTypeId == 'owsTemperatureLight':
-                                for owsSensor in root.findall('./' + self.xmlns + 'owd_EDS0067'):
-                                    self.logger.debug("Parsing EDS0067 devices.")
-                                    rom_id = owsSensor.find(self.xmlns + 'ROMId').text
-                                    if dev.pluginProps['romID'] == rom_id \
-                                            and dev.pluginProps['serverList'] == server_ip:
-                                        self.updateEDS0067(dev, owsSensor, server_ip)
-
-                            elif dev.deviceTypeId == 'owsTemperatureHumidityBarometricPressureLight':
-                                for owsSensor in root.findall('./' + self.xmlns + 'owd_EDS0068'):
-                                    self.logger.debug("Parsing EDS0068 devices.")
-                                    rom_id = owsSensor.find(self.xmlns + 'ROMId').text
-                                    if dev.pluginProps['romID'] == rom_id \
-                                            and dev.pluginProps['serverList'] == server_ip:
-                                        self.updateEDS0068(dev, owsSensor, server_ip)
-
-                            elif dev.deviceTypeId == 'owsVibrationSensor':
-                                for owsSensor in root.findall('./' + self.xmlns + 'owd_EDS0070'):
-                                    self.logger.debug("Parsing EDS0070 devices.")
-                                    rom_id = owsSensor.find(self.xmlns + 'ROMId').text
-                                    if dev.pluginProps['romID'] == rom_id \
-                                            and dev.pluginProps['serverList'] == server_ip:
-                                        self.updateEDS0070(dev, owsSensor, server_ip)
-
-                            elif dev.deviceTypeId == 'owsRTDinterfaceFourWire71':
-                                for owsSensor in root.findall('./' + self.xmlns + 'owd_EDS0071'):
-                                    self.logger.debug("Parsing EDS0071 devices.")
-                                    rom_id = owsSensor.find(self.xmlns + 'ROMId').text
-                                    if dev.pluginProps['romID'] == rom_id \
-                                            and dev.pluginProps['serverList'] == server_ip:
-                                        self.updateEDS0071(dev, owsSensor, server_ip)
-
-                            elif dev.deviceTypeId == 'owsOctalMilliampInput80':
-                                for owsSensor in root.findall('./' + self.xmlns + 'owd_EDS0080'):
-                                    self.logger.debug("Parsing EDS0080 devices.")
-                                    rom_id = owsSensor.find(self.xmlns + 'ROMId').text
-                                    if dev.pluginProps['romID'] == rom_id \
-                                            and dev.pluginProps['serverList'] == server_ip:
-                                        self.updateEDS0080(dev, owsSensor, server_ip)
-
-                            elif dev.deviceTypeId == 'owsOctalCurrentDevice':
-                                for owsSensor in root.findall('./' + self.xmlns + 'owd_EDS0082'):
-                                    self.logger.debug("Parsing EDS0082 devices.")
-                                    rom_id = owsSensor.find(self.xmlns + 'ROMId').text
-                                    if dev.pluginProps['romID'] == rom_id \
-                                            and dev.pluginProps['serverList'] == server_ip:
-                                        self.updateEDS0082(dev, owsSensor, server_ip)
-
-                            elif dev.deviceTypeId == 'owsOctalCurrentDevice83':
-                                for owsSensor in root.findall('./' + self.xmlns + 'owd_EDS0083'):
-                                    self.logger.debug("Parsing EDS0083 devices.")
-                                    rom_id = owsSensor.find(self.xmlns + 'ROMId').text
-                                    if dev.pluginProps['romID'] == rom_id \
-                                            and dev.pluginProps['serverList'] == server_ip:
-                                        self.updateEDS0083(dev, owsSensor, server_ip)
-
-                            elif dev.deviceTypeId == 'owsQuadCurrentDevice':
-                                for owsSensor in root.findall('./' + self.xmlns + 'owd_EDS0085'):
-                                    self.logger.debug("Parsing EDS0085 devices.")
-                                    rom_id = owsSensor.find(self.xmlns + 'ROMId').text
-                                    if dev.pluginProps['romID'] == rom_id \
-                                            and dev.pluginProps['serverList'] == server_ip:
-                                        self.updateEDS0085(dev, owsSensor, server_ip)
-
-                            elif dev.deviceTypeId == 'owsOctalDiscreteIO90':
-                                for owsSensor in root.findall('./' + self.xmlns + 'owd_EDS0090'):
-                                    self.logger.debug("Parsing EDS0090 devices.")
-                                    rom_id = owsSensor.find(self.xmlns + 'ROMId').text
-                                    if dev.pluginProps['romID'] == rom_id \
-                                            and dev.pluginProps['serverList'] == server_ip:
-                                        self.updateEDS0090(dev, owsSensor, server_ip)
-
-                        except Exception:  # noqa
-                            self.logger.critical("Error in server parsing routine.")
-                            self.logger.exception("General exception:")
+        Each owd_<family> element is flattened and yielded as ('sensor', (ROM ID, family, sensor_data)) as soon as it
+        is complete, and is then dropped from the tree so that only one sensor element is held in memory at a time.
+        The server-level values are yielded last as ('server', server_data). Malformed or truncated XML raises
+        ParseError.
 
-            except Exception:  # noqa
-                # There has been a problem reaching the server. "Turn off" all sensors until next successful poll.
-                _ = [
-                    dev.updateStateOnServer('onOffState', value=False)
-                    for dev in indigo.devices.itervalues("self")
-                ]
-                self.logger.warning("Error parsing sensor states.")
-                self.logger.warning(f"Trying again in {pref_poll} seconds.")
-
-        self.logger.debug("  No more sensors to poll.")
-
-        if not self.pluginPrefs.get("suppressResultsLogging", False):
-            self.logger.info(f"  Total of {self.number_of_servers} servers polled.")
-            self.logger.info(f"  Total of {self.number_of_sensors} devices updated.")
-            self.logger.info("OWServer data parsed successfully.")
+        :param chunks: iterable of str or bytes pieces of the document.
+        """
+        parser      = eTree.XMLPullParser(events=('start', 'end'))
+        root        = None
+        depth       = 0
+        server_data = {}
+
+        for chunk in chunks:
+            parser.feed(chunk)
+
+            for event, element in parser.read_events():
+                if event == 'start':
+                    if root is None:
+                        root = element
+                    depth += 1
+                    continue
+
+                depth -= 1
+
+                # Only the direct children of the root are of interest. Anything deeper belongs to an element that is
+                # still being parsed.
+                if depth != 1:
+                    continue
+
+                tag = element.tag.rpartition('}')[2]
+                if tag.startswith("owd_"):
+                    sensor_data = {child.tag.rpartition('}')[2]: child.text for child in element}
+                    if 'ROMId' in sensor_data:
+                        yield 'sensor', (sensor_data['ROMId'], tag[4:], sensor_data)
+                else:
+                    server_data[tag] = element.text
+
+                root.remove(element)
+
+        # Raises if the document was empty or truncated.
+        parser.close()
+
+        yield 'server', server_data
+
+    # =============================================================================
+    def update_server_devices(self, server_ip, server_data, server_registry):
+        """
+        Apply one server's details.xml values to the server devices assigned to that server
+
+        :param str server_ip:
+        :param dict server_data:
+        :param dict server_registry:
+        """
+        self.eds_metrics[server_ip] = {}
+        for key in ('PollCount', 'LoopTime', 'DevicesConnected', 'DataErrors', 'DataErrorsChannel1',
+                    'DataErrorsChannel2', 'DataErrorsChannel3'):
+            try:
+                self.eds_metrics[server_ip][key] = float(server_data[key])
+            except (KeyError, TypeError, ValueError):
+                pass
+
+        for dev in server_registry.get(server_ip, []):
+            self.update_device(dev, server_ip, self.updateOWServer, server_data, server_ip)
+
+    # =============================================================================
+    def update_sensor_devices(self, server_ip, rom_id, sensor_family, sensor_data, sensor_registry):
+        """
+        Apply one sensor's details.xml values to the sensor devices assigned to that sensor
+
+        :param str server_ip:
+        :param str rom_id:
+        :param str sensor_family:
+        :param dict sensor_data:
+        :param dict sensor_registry:
+        """
+        for dev in sensor_registry.get((server_ip, rom_id), []):
+            data = self.reconcile_pending_writes(dev, server_ip, sensor_data) if self.pending_writes else sensor_data
+            self.update_device(dev, server_ip, self.update_sensor_device, sensor_family, data, server_ip)
+            self.note_sensor_activity(server_ip, dev)
+
+    # =============================================================================
+    def update_device(self, dev, server_ip, update_method, *args):
+        """
+        Run a device update method inside a state batch and record how long it took
+
+        The time spent computing states, writing states and writing props is added to the server's totals for this
+        poll, and the device's total update cost is recorded by device and by device type.
+
+        :param indigo.Device dev:
+        :param str server_ip:
+        :param update_method: updateOWServer or update_sensor_device.
+        :param args: arguments passed to update_method after the device.
+        """
+        self.logger.debug(f"Parsing information for device: {dev.name}")
+        if self.replay_session is None:
+            self.last_seen[dev.id] = indigo.server.getTime()
+        prop_time = self.cycle_timings.get((server_ip, 'prop_writes'), 0.0)
+        start = time.perf_counter()
+        self.begin_state_batch(dev)
+        try:
+            update_method(dev, *args)
+        except Exception:  # noqa
+            self.logger.critical("Error in server parsing routine.")
+            self.logger.exception("General exception:")
+        finally:
+            flush_start = time.perf_counter()
+            self.cycle_state_writes += self.flush_state_batch(dev)
+            end = time.perf_counter()
+
+        prop_time = self.cycle_timings.get((server_ip, 'prop_writes'), 0.0) - prop_time
+        self.add_cycle_timing(server_ip, 'update', flush_start - start - prop_time)
+        self.add_cycle_timing(server_ip, 'state_writes', end - flush_start)
+        self.poll_stats.record('device', dev.name, 'update', end - start)
+        self.poll_stats.record('family', dev.deviceTypeId, 'update', end - start)
+
+    # =============================================================================
+    def add_cycle_timing(self, server_ip, phase, seconds):
+        """
+        Add to a server's total time in a phase for the current poll
+
+        :param str server_ip:
+        :param str phase:
+        :param float seconds:
+        """
+        self.cycle_timings[(server_ip, phase)] = self.cycle_timings.get((server_ip, phase), 0.0) + seconds
+
+    # =============================================================================
+    def record_cycle_timings(self, server_ip):
+        """
+        Move a server's phase totals for the current poll into the timing histograms
+
+        :param str server_ip:
+        """
+        for phase in ('update', 'state_writes', 'prop_writes'):
+            self.poll_stats.record('server', server_ip, phase, self.cycle_timings.pop((server_ip, phase), 0.0))
+
+    # =============================================================================
+    def build_device_registry(self, due=None):
+        """
+        Build the per-poll registry of enabled plugin devices
+
+        Server devices are keyed by server IP and sensor devices are keyed by (server IP, ROM ID). Each value is a list
+        because nothing stops a user from assigning the same sensor to more than one Indigo device.
+
+        :param set due: IDs of the devices to include. All devices are included when due is None.
+        :return tuple: (server_registry, sensor_registry)
+        """
+        server_registry = {}
+        sensor_registry = {}
+
+        for dev in indigo.devices.itervalues("self"):
+            if due is not None and dev.id not in due:
+                continue
+
+            elif not dev.configured:
+                # A device has been created, but hasn't been fully configured.
+                self.logger.warning(f"{dev.name} has been created, but is not fully configured. Skipping.")
+
+            elif not dev.enabled:
+                # A device has been disabled. Skip it.
+                self.logger.debug(f"{dev.name} is disabled. Skipping.")
+
+            elif dev.deviceTypeId == "owsOWSServer":
+                server_registry.setdefault(dev.pluginProps.get('serverList', ''), []).append(dev)
+
+            elif dev.deviceTypeId in SENSOR_FAMILIES:
+                key = (dev.pluginProps.get('serverList', ''), dev.pluginProps.get('romID', ''))
+                sensor_registry.setdefault(key, []).append(dev)
+
+        return server_registry, sensor_registry
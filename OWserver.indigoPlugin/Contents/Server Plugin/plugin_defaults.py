@@ -1,13 +1,24 @@
 kDefaultPluginPrefs = {
+    "adaptivePolling": False,          # Poll faster while sensor values are changing.
+    "autoTimeout": False,              # Set timeouts from observed server response times.
+    "captureTraffic": False,           # Save every details.xml to the capture archive.
+    "configMenuConnectTimeout": "3",   # How long to wait for a connection.
     "configMenuDegrees": "F",          # Setting for devices that report temperature.
     "configMenuDegreesDec": "1",       # For devices that report temperature.
     "configMenuHumidexDec": "1",       # For devices that report Humidex.
     "configMenuHumidityDec": "1",      # For devices that report Humidity.
+    "configMenuMaxConcurrency": "4",   # How many servers to poll at once.
     "configMenuPollInterval": "900",   # How frequently OWServer will refresh.
-    "configMenuServerTimeout": "15",   # How long to wait for a response.
+    "configMenuServerTimeout": "15",   # How long to wait for a response once connected.
     "configMenuServerType": "OW",      # What kind of server is it?
+    "metricsExporter": "none",         # Where to export poll health metrics.
+    "metricsPort": "9788",             # Port for the Prometheus metrics endpoint.
+    "optimisticWrites": True,          # Show LED and relay writes before the server confirms them.
     "OWServerIP": "",                  # List of server IP address(es).
+    "refreshAfterWrite": True,         # Re-read a device shortly after writing to it.
     "showDebugInfo": False,            # Verbose debug logging?
     "showDebugLevel": "1",             # Low, Medium or High debug output.
+    "statsdHost": "127.0.0.1",         # StatsD server address.
+    "statsdPort": "8125",              # StatsD server port.
     "suppressResultsLogging": False,   # Don't log unless there's a problem.
 }
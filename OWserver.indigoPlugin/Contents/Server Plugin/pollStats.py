@@ -0,0 +1,94 @@
+# pylint: disable=invalid-name
+
+"""
+filename: pollStats.py
+author: DaveL17
+
+pollStats.py is a module designed to support the OWServer plugin for Indigo Home Control Server. The module keeps
+rolling timing histograms for the poll pipeline so that slow servers, phases and sensor families can be found.
+
+Samples are recorded in seconds under a (group, name, phase) key, for example ('server', '10.0.1.44', 'download') or
+('family', 'owsTemperatureSensor', 'update'). Each key keeps the most recent TIMING_HISTORY samples.
+"""
+
+from collections import deque
+import threading
+
+from constants import TIMING_BUCKETS_MS, TIMING_HISTORY  # noqa
+
+
+def summarize(samples):
+    """
+    Summarize a list of timing samples in milliseconds
+
+    :param list samples: seconds.
+    :return dict: count, mean, p50, p90, p99 and max, plus the number of samples in each TIMING_BUCKETS_MS bucket.
+    """
+    samples = sorted(samples)
+    count = len(samples)
+
+    if not count:
+        return {'count': 0}
+
+    def percentile(fraction):
+        return round(samples[min(count - 1, int(count * fraction))] * 1000, 3)
+
+    buckets = {}
+    for upper in TIMING_BUCKETS_MS:
+        buckets[f"<={upper}"] = sum(1 for sample in samples if sample * 1000 <= upper)
+    buckets["+Inf"] = count
+
+    return {
+        'count': count,
+        'mean': round(sum(samples) / count * 1000, 3),
+        'p50': percentile(0.50),
+        'p90': percentile(0.90),
+        'p99': percentile(0.99),
+        'max': round(samples[-1] * 1000, 3),
+        'buckets': buckets,
+    }
+
+
+class PollStats:
+    """
+    Rolling timing histograms for the poll pipeline, safe to record from any thread
+    """
+    def __init__(self):
+        self.histograms = {}  # {(group, name, phase): deque of samples}
+        self.lock = threading.Lock()
+
+    def record(self, group, name, phase, seconds):
+        """
+        Add a timing sample
+
+        :param str group: 'cycle', 'server', 'family' or 'device'.
+        :param str name: the server IP, device type ID or device name ('all' for the cycle).
+        :param str phase:
+        :param float seconds:
+        """
+        with self.lock:
+            histogram = self.histograms.get((group, name, phase))
+            if histogram is None:
+                histogram = self.histograms[(group, name, phase)] = deque(maxlen=TIMING_HISTORY)
+            histogram.append(seconds)
+
+    def reset(self):
+        """
+        Discard every sample
+        """
+        with self.lock:
+            self.histograms = {}
+
+    def summary(self):
+        """
+        Summarize every histogram
+
+        :return dict: {group: {name: {phase: summary}}}
+        """
+        with self.lock:
+            items = [(key, list(histogram)) for key, histogram in self.histograms.items()]
+
+        report = {}
+        for (group, name, phase), samples in sorted(items):
+            report.setdefault(group, {}).setdefault(name, {})[phase] = summarize(samples)
+        return report
@@ -0,0 +1,366 @@
+# pylint: disable=line-too-long, invalid-name
+
+"""
+filename: sensorFamilies.py
+author: DaveL17
+
+sensorFamilies.py is a module designed to support the OWServer plugin for Indigo Home Control Server. The module
+contains the registry of supported 1-Wire sensor families. Each entry is keyed by Indigo device type ID and holds
+everything the plugin needs to update a device of that type from its details.xml element:
+
+    family:     the 1-Wire family name. Sensors appear in details.xml as <owd_{family}> elements, and details.xml
+                values mirrored to device props are stored as '{family}{key}'.
+    states:     {'Indigo Device State': 'details.xml key'} (see stateDict.py).
+    temp_comp:  the device prop that holds the temperature compensation applied to 'owsTemperature', or None.
+    value_pref: the device prop that holds the user's choice of primary sensor value, or None when there is no choice.
+    values:     {choice: (details.xml key, converter, state image)} for each primary sensor value choice. The
+                converter names a Plugin conversion ('temperature' applies temperature compensation, 'temp' does not)
+                and the state image is either an indigo.kStateImageSel name or 'on_if_0' / 'on_if_1'.
+    props:      details.xml keys that are mirrored to device props (saved only when they change).
+    image:      the indigo.kStateImageSel name to apply once the update succeeds, or None.
+    derive:     the name of a Plugin method that imputes values that aren't in details.xml, or None.
+
+Adding support for a new sensor family is a matter of adding its state dictionary to stateDict.py, its device to
+Devices.xml and its entry here.
+"""
+
+import stateDict  # noqa
+
+# Primary sensor value choices shared by several EDS families.
+_COUNTER = {'C_1': ('Counter', None, 'SensorOff')}
+_COUNTERS = {'C_1': ('Counter1', None, 'SensorOff'), 'C_2': ('Counter2', None, 'SensorOff')}
+_LED_RELAY = {'LED': ('LED', None, 'on_if_1'), 'Relay': ('Relay', None, 'on_if_1')}
+_TEMPERATURE = {'T': ('Temperature', 'temperature', 'TemperatureSensor')}
+
+
+def _inputs(count, key, converter):
+    """
+    Build the primary sensor value choices for numbered inputs (I_1, I_2, ...)
+
+    :param int count:
+    :param str key: details.xml key with '{}' in place of the input number.
+    :param str converter:
+    :return dict:
+    """
+    return {f'I_{n}': (key.format(n), converter, 'SensorOff') for n in range(1, count + 1)}
+
+
+SENSOR_FAMILIES = {
+    # DS18B20 Description = "Programmable resolution thermometer"
+    'owsTemperatureSensor': {
+        'family': 'DS18B20',
+        'states': stateDict.OWServer.ds18b20_state_dict(),
+        'temp_comp': 'DS18B20TempComp',
+        'value_pref': None,
+        'values': {None: ('Temperature', 'temperature', None)},
+        'props': ['UserByte1', 'UserByte2'],
+        'image': None,
+        'derive': None,
+    },
+    # DS18S20 Description = "Parasite Power Thermometer"
+    'owsTemperatureSensor_S': {
+        'family': 'DS18S20',
+        'states': stateDict.OWServer.ds18s20_state_dict(),
+        'temp_comp': 'DS18S20TempComp',
+        'value_pref': None,
+        'values': {None: ('Temperature', 'temperature', None)},
+        'props': ['UserByte1', 'UserByte2'],
+        'image': None,
+        'derive': None,
+    },
+    # DS2406 Description = "Dual Addressable Switch Plus Memory"
+    'owsDualSwitchPlusMemory': {
+        'family': 'DS2406',
+        'states': stateDict.OWServer.ds2406_state_dict(),
+        'temp_comp': None,
+        'value_pref': 'prefSensorValue2406',
+        'values': {
+            'I_A': ('InputLevel_A', None, 'on_if_0'),
+            'I_B': ('InputLevel_B', None, 'on_if_0'),
+        },
+        'props': ['ActivityLatchReset'],
+        'image': None,
+        'derive': None,
+    },
+    # DS2408 Description = "8-Channel Addressable Switch"
+    'owsUserSwitch': {
+        'family': 'DS2408',
+        'states': stateDict.OWServer.ds2408_state_dict(),
+        'temp_comp': None,
+        'value_pref': 'prefSensorValue2408',
+        'values': {f'S_{n}': (f'Switch{n}', None, 'on_if_0') for n in range(8)},
+        'props': ['PIOActivityLatchState', 'PIOOutputLatchState', 'PowerOnResetLatch', 'RSTZconfiguration'],
+        'image': None,
+        'derive': 'derive_ds2408_switches',
+    },
+    # DS2423 Description = "RAM with Counters"
+    'owsCounterDevice': {
+        'family': 'DS2423',
+        'states': stateDict.OWServer.ds2423_state_dict(),
+        'temp_comp': None,
+        'value_pref': 'prefSensorValue2423',
+        'values': {
+            'C_A': ('Counter_A', None, 'SensorOff'),
+            'C_B': ('Counter_B', None, 'SensorOff'),
+        },
+        'props': [],
+        'image': 'SensorOff',
+        'derive': None,
+    },
+    # DS2438 Description = "Smart battery monitor"
+    'owsSmartBatteryMonitor': {
+        'family': 'DS2438',
+        'states': stateDict.OWServer.ds2438_state_dict(),
+        'temp_comp': 'DS2438TempComp',
+        'value_pref': None,
+        'values': {None: ('Temperature', 'temperature', None)},
+        'props': [],
+        'image': 'TemperatureSensor',
+        'derive': None,
+    },
+    # DS2450 Description = "Quad A/D Converter"
+    'owsQuadConverter': {
+        'family': 'DS2450',
+        'states': stateDict.OWServer.ds2450_state_dict(),
+        'temp_comp': None,
+        'value_pref': 'prefSensorValue2450',
+        'values': {f'C_{ch}': (f'Channel{ch}ConversionValue', None, 'SensorOff') for ch in 'ABCD'},
+        'props': [
+            'ChannelAConversionRange', 'ChannelAConversionResolution', 'ChannelAOutputControl', 'ChannelAOutputEnable',
+            'ChannelBConversionRange', 'ChannelBConversionResolution', 'ChannelBOutputControl', 'ChannelBOutputEnable',
+            'ChannelCConversionRange', 'ChannelCConversionResolution', 'ChannelCOutputControl', 'ChannelCOutputEnable',
+            'ChannelDConversionRange', 'ChannelDConversionResolution', 'ChannelDOutputControl', 'ChannelDOutputEnable',
+            'PowerOnReset', 'VCCControl'
+        ],
+        'image': None,
+        'derive': None,
+    },
+    # EDS0064 Description = "Octal Current Input Device"
+    'owsTemperatureSensor64': {
+        'family': 'EDS0064',
+        'states': stateDict.OWServer.eds0064_state_dict(),
+        'temp_comp': 'EDS0064TempComp',
+        'value_pref': 'prefSensorValue0064',
+        'values': {**_COUNTERS, **_LED_RELAY, **_TEMPERATURE},
+        'props': ['LEDFunction', 'RelayFunction', 'TemperatureHighAlarmValue', 'TemperatureLowAlarmValue'],
+        'image': None,
+        'derive': None,
+    },
+    # EDS0065 Description = "Temperature and Humidity Sensor"
+    'owsTemperatureHumiditySensor65': {
+        'family': 'EDS0065',
+        'states': stateDict.OWServer.eds0065_state_dict(),
+        'temp_comp': 'EDS0065TempComp',
+        'value_pref': 'prefSensorValue0065',
+        'values': {
+            **_COUNTERS,
+            'DP': ('DewPoint', 'temp', 'SensorOff'),
+            'Hu': ('Humidity', 'humidity', 'SensorOff'),
+            'Hx': ('Humidex', 'humidex', 'SensorOff'),
+            'HI': ('HeatIndex', 'temp', 'SensorOff'),
+            **_LED_RELAY,
+            **_TEMPERATURE,
+        },
+        'props': [
+            'DewPointHighAlarmValue', 'DewPointLowAlarmValue', 'HeatIndexHighAlarmValue', 'HeatIndexLowAlarmValue',
+            'HumidexHighAlarmValue', 'HumidexLowAlarmValue', 'HumidityHighAlarmValue', 'HumidityLowAlarmValue',
+            'LEDFunction', 'RelayFunction', 'TemperatureHighAlarmValue', 'TemperatureLowAlarmValue'
+        ],
+        'image': None,
+        'derive': None,
+    },
+    # EDS0066 Description = "Temperature and Barometric Pressure Sensor"
+    'owsTemperaturePressureSensor66': {
+        'family': 'EDS0066',
+        'states': stateDict.OWServer.eds0066_state_dict(),
+        'temp_comp': 'EDS0066TempComp',
+        'value_pref': 'prefSensorValue0066',
+        'values': {
+            **_COUNTERS,
+            'BPH': ('BarometricPressureHg', 'pressure', 'LightSensor'),
+            'BPM': ('BarometricPressureMb', 'pressure', 'SensorOff'),
+            **_LED_RELAY,
+            **_TEMPERATURE,
+        },
+        'props': [
+            'BarometricPressureHgHighAlarmValue', 'BarometricPressureHgLowAlarmValue',
+            'BarometricPressureMbHighAlarmValue', 'BarometricPressureMbLowAlarmValue', 'LEDFunction', 'RelayFunction',
+            'TemperatureHighAlarmValue', 'TemperatureLowAlarmValue'
+        ],
+        'image': None,
+        'derive': None,
+    },
+    # EDS0067 Description = "Temperature and Light Sensor"
+    'owsTemperatureLight': {
+        'family': 'EDS0067',
+        'states': stateDict.OWServer.eds0067_state_dict(),
+        'temp_comp': 'EDS0067TempComp',
+        'value_pref': 'prefSensorValue0067',
+        'values': {**_COUNTERS, 'IL': ('Light', None, 'LightSensor'), **_LED_RELAY, **_TEMPERATURE},
+        'props': [
+            'LEDFunction', 'LightHighAlarmValue', 'LightLowAlarmValue', 'RelayFunction', 'TemperatureHighAlarmValue',
+            'TemperatureLowAlarmValue'
+        ],
+        'image': None,
+        'derive': None,
+    },
+    # EDS0068 Description = "Temperature, Humidity, Barometric Pressure and Light Sensor"
+    'owsTemperatureHumidityBarometricPressureLight': {
+        'family': 'EDS0068',
+        'states': stateDict.OWServer.eds0068_state_dict(),
+        'temp_comp': 'EDS0068TempComp',
+        'value_pref': 'prefSensorValue0068',
+        'values': {
+            'BH': ('BarometricPressureHg', 'pressure', 'SensorOff'),
+            'BM': ('BarometricPressureMb', 'pressure', 'SensorOff'),
+            **_COUNTERS,
+            'DP': ('DewPoint', 'temp', 'SensorOff'),
+            'HI': ('HeatIndex', 'temp', 'SensorOff'),
+            'HX': ('Humidex', 'humidex', 'SensorOff'),
+            'HY': ('Humidity', 'humidity', 'SensorOff'),
+            'IL': ('Light', None, 'LightSensor'),
+            **_LED_RELAY,
+            **_TEMPERATURE,
+        },
+        'props': [
+            'BarometricPressureHgHighAlarmValue', 'BarometricPressureHgHighConditionalSearchState',
+            'BarometricPressureHgLowAlarmValue', 'BarometricPressureHgLowConditionalSearchState',
+            'BarometricPressureMbHighAlarmValue', 'BarometricPressureMbHighConditionalSearchState',
+            'BarometricPressureMbLowAlarmValue', 'BarometricPressureMbLowConditionalSearchState',
+            'DewPointHighAlarmValue', 'DewPointHighConditionalSearchState', 'DewPointLowAlarmValue',
+            'DewPointLowConditionalSearchState', 'HeatIndexHighAlarmValue', 'HeatIndexHighConditionalSearchState',
+            'HeatIndexLowAlarmValue', 'HeatIndexLowConditionalSearchState', 'HumidexHighAlarmValue',
+            'HumidexHighConditionalSearchState', 'HumidexLowAlarmValue', 'HumidexLowConditionalSearchState',
+            'HumidityHighAlarmValue', 'HumidityHighConditionalSearchState', 'HumidityLowAlarmValue',
+            'HumidityLowConditionalSearchState', 'LEDFunction', 'LightHighAlarmValue',
+            'LightHighConditionalSearchState', 'LightLowAlarmValue', 'LightLowConditionalSearchState',
+            'RelayFunction', 'TemperatureHighAlarmValue', 'TemperatureHighConditionalSearchState',
+            'TemperatureLowAlarmValue', 'TemperatureLowConditionalSearchState'
+        ],
+        'image': None,
+        'derive': None,
+    },
+    # EDS0070 Description = "Vibration Sensor"
+    'owsVibrationSensor': {
+        'family': 'EDS0070',
+        'states': stateDict.OWServer.eds0070_state_dict(),
+        'temp_comp': None,
+        'value_pref': 'prefSensorValue0070',
+        'values': {**_COUNTER, **_LED_RELAY, 'V': ('VibrationInstant', None, 'SensorOff')},
+        'props': ['LEDFunction', 'RelayFunction', 'VibrationHighAlarmValue', 'VibrationLowAlarmValue'],
+        'image': None,
+        'derive': None,
+    },
+    # EDS0071 Description = "RTD Interface, 4 Wire"
+    'owsRTDinterfaceFourWire71': {
+        'family': 'EDS0071',
+        'states': stateDict.OWServer.eds0071_state_dict(),
+        'temp_comp': None,
+        'value_pref': 'prefSensorValue0071',
+        'values': {
+            **_COUNTER,
+            **_LED_RELAY,
+            'RTD': ('RTDOhms', 'volts', 'SensorOff'),
+            'T': ('Temperature', None, 'SensorOff'),
+        },
+        'props': [
+            'CalibrationKey', 'LEDFunction', 'RelayFunction', 'RTDReadDelay', 'RTDResistanceHighAlarmValue',
+            'RTDResistanceLowAlarmValue', 'TemperatureHighAlarmValue', 'TemperatureLowAlarmValue'
+        ],
+        'image': None,
+        'derive': None,
+    },
+    # EDS0080 Description = "Octal 4-20 Milliamp Input"
+    'owsOctalMilliampInput80': {
+        'family': 'EDS0080',
+        'states': stateDict.OWServer.eds0080_state_dict(),
+        'temp_comp': None,
+        'value_pref': 'prefSensorValue0080',
+        'values': {**_inputs(8, 'v4to20mAInput{}Instant', 'volts'), **_LED_RELAY, **_COUNTER},
+        'props': [
+            'LEDFunction', 'RelayFunction', 'v4to20mAInput1HighAlarmValue', 'v4to20mAInput1LowAlarmValue',
+            'v4to20mAInput2HighAlarmValue', 'v4to20mAInput2LowAlarmValue', 'v4to20mAInput3HighAlarmValue',
+            'v4to20mAInput3LowAlarmValue', 'v4to20mAInput4HighAlarmValue', 'v4to20mAInput4LowAlarmValue',
+            'v4to20mAInput5HighAlarmValue', 'v4to20mAInput5LowAlarmValue', 'v4to20mAInput6HighAlarmValue',
+            'v4to20mAInput6LowAlarmValue', 'v4to20mAInput7HighAlarmValue', 'v4to20mAInput7LowAlarmValue',
+            'v4to20mAInput8HighAlarmValue', 'v4to20mAInput8LowAlarmValue'
+        ],
+        'image': None,
+        'derive': None,
+    },
+    # EDS0082 Description = "Octal Current Input Device"
+    'owsOctalCurrentDevice': {
+        'family': 'EDS0082',
+        'states': stateDict.OWServer.eds0082_state_dict(),
+        'temp_comp': None,
+        'value_pref': 'prefSensorValue0082',
+        'values': {**_inputs(8, 'v0to10VoltInput{}Instant', 'volts'), **_LED_RELAY},
+        'props': [
+            'LEDFunction', 'RelayFunction', 'v0to10VoltInput1HighAlarmValue', 'v0to10VoltInput1LowAlarmValue',
+            'v0to10VoltInput2HighAlarmValue', 'v0to10VoltInput2LowAlarmValue', 'v0to10VoltInput3HighAlarmValue',
+            'v0to10VoltInput3LowAlarmValue', 'v0to10VoltInput4HighAlarmValue', 'v0to10VoltInput4LowAlarmValue',
+            'v0to10VoltInput5HighAlarmValue', 'v0to10VoltInput5LowAlarmValue', 'v0to10VoltInput6HighAlarmValue',
+            'v0to10VoltInput6LowAlarmValue', 'v0to10VoltInput7HighAlarmValue', 'v0to10VoltInput7LowAlarmValue',
+            'v0to10VoltInput8HighAlarmValue', 'v0to10VoltInput8LowAlarmValue'
+        ],
+        'image': None,
+        'derive': None,
+    },
+    # EDS0083 Description = "Octal Current Input Device"
+    'owsOctalCurrentDevice83': {
+        'family': 'EDS0083',
+        'states': stateDict.OWServer.eds0083_state_dict(),
+        'temp_comp': None,
+        'value_pref': 'prefSensorValue0083',
+        'values': {**_inputs(4, 'v4to20mAInput{}Instant', 'volts'), **_LED_RELAY},
+        'props': [
+            'LEDFunction', 'RelayFunction', 'v4to20mAInput1HighAlarmValue', 'v4to20mAInput1LowAlarmValue',
+            'v4to20mAInput2HighAlarmValue', 'v4to20mAInput2LowAlarmValue', 'v4to20mAInput3HighAlarmValue',
+            'v4to20mAInput3LowAlarmValue', 'v4to20mAInput4HighAlarmValue', 'v4to20mAInput4LowAlarmValue'
+        ],
+        'image': None,
+        'derive': None,
+    },
+    # EDS0085 Description = "Octal Current Input Device"
+    'owsQuadCurrentDevice': {
+        'family': 'EDS0085',
+        'states': stateDict.OWServer.eds0085_state_dict(),
+        'temp_comp': None,
+        'value_pref': 'prefSensorValue0085',
+        'values': {**_inputs(4, 'v0to10VoltInput{}Instant', 'volts'), **_LED_RELAY},
+        'props': [
+            'LEDFunction', 'RelayFunction', 'v0to10VoltInput1HighAlarmValue', 'v0to10VoltInput1LowAlarmValue',
+            'v0to10VoltInput2HighAlarmValue', 'v0to10VoltInput2LowAlarmValue', 'v0to10VoltInput3HighAlarmValue',
+            'v0to10VoltInput3LowAlarmValue', 'v0to10VoltInput4HighAlarmValue', 'v0to10VoltInput4LowAlarmValue'
+        ],
+        'image': None,
+        'derive': None,
+    },
+    # EDS0090 Description = "Octal Discrete IO"
+    'owsOctalDiscreteIO90': {
+        'family': 'EDS0090',
+        'states': stateDict.OWServer.eds0090_state_dict(),
+        'temp_comp': None,
+        'value_pref': 'prefSensorValue0090',
+        'values': {**_COUNTER, **_inputs(8, 'DiscreteIO{}InputState', None), **_LED_RELAY},
+        'props': [
+            'DiscreteIO1ActivityLatchReset', 'DiscreteIO1HighAlarmValue', 'DiscreteIO1LowAlarmValue',
+            'DiscreteIO1OutputState', 'DiscreteIO1PulldownState', 'DiscreteIO1PulseCounterReset',
+            'DiscreteIO2ActivityLatchReset', 'DiscreteIO2HighAlarmValue', 'DiscreteIO2LowAlarmValue',
+            'DiscreteIO2OutputState', 'DiscreteIO2PulldownState', 'DiscreteIO2PulseCounterReset',
+            'DiscreteIO3ActivityLatchReset', 'DiscreteIO3HighAlarmValue', 'DiscreteIO3LowAlarmValue',
+            'DiscreteIO3OutputState', 'DiscreteIO3PulldownState', 'DiscreteIO3PulldownState',
+            'DiscreteIO4ActivityLatchReset', 'DiscreteIO4HighAlarmValue', 'DiscreteIO4LowAlarmValue',
+            'DiscreteIO4OutputState', 'DiscreteIO4PulldownState', 'DiscreteIO5ActivityLatchReset',
+            'DiscreteIO5HighAlarmValue', 'DiscreteIO5LowAlarmValue', 'DiscreteIO5OutputState',
+            'DiscreteIO5PulldownState', 'DiscreteIO6ActivityLatchReset', 'DiscreteIO6HighAlarmValue',
+            'DiscreteIO6LowAlarmValue', 'DiscreteIO6OutputState', 'DiscreteIO6PulldownState',
+            'DiscreteIO7ActivityLatchReset', 'DiscreteIO7HighAlarmValue', 'DiscreteIO7LowAlarmValue',
+            'DiscreteIO7OutputState', 'DiscreteIO7PulldownState', 'DiscreteIO8ActivityLatchReset',
+            'DiscreteIO8HighAlarmValue', 'DiscreteIO8LowAlarmValue', 'DiscreteIO8OutputState',
+            'DiscreteIO8PulldownState', 'LEDFunction', 'RelayFunction'
+        ],
+        'image': None,
+        'derive': None,
+    },
+}
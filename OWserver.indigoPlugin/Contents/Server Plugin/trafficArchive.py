@@ -0,0 +1,199 @@
+# pylint: disable=invalid-name
+
+"""
+filename: trafficArchive.py
+author: DaveL17
+
+trafficArchive.py is a module designed to support the OWServer plugin for Indigo Home Control Server. The module
+captures raw details.xml responses to a rolling archive and reads them back so that they can be replayed through the
+plugin's poll pipeline without touching the live 1-Wire network.
+
+An archive is a folder of capture files. Each response is appended to the newest file as a gzip member of its own,
+holding a one line JSON header ({"time": epoch seconds, "server": IP, "size": bytes}) followed by the response exactly
+as it arrived. Files are only ever appended to. Once the newest file reaches CAPTURE_FILE_BYTES a new one is started,
+and the oldest files are deleted to keep CAPTURE_MAX_FILES. A capture cut short by a crash is skipped when the archive
+is read.
+"""
+
+import datetime as dt
+import gzip
+import json
+from pathlib import Path
+import threading
+import time
+import zlib
+
+import requests  # noqa - included in the standard Indigo python install
+
+from constants import CAPTURE_FILE_BYTES, CAPTURE_MAX_FILES  # noqa
+
+SUFFIX = ".owcap.gz"
+
+
+def archive_files(folder):
+    """
+    Return the capture files in an archive folder, oldest first
+
+    :param str folder:
+    :return list: [Path]
+    """
+    # File names start with the UTC time they were created, so they sort oldest first.
+    return sorted(Path(folder).glob(f"*{SUFFIX}"))
+
+
+def read_archive(paths):
+    """
+    Yield every capture in the given files, in the order they were captured
+
+    :param list paths:
+    :return: generator of (epoch seconds, server IP, body bytes)
+    """
+    for path in paths:
+        data = Path(path).read_bytes()
+
+        while data:
+            # wbits=31 reads a single gzip member and leaves the rest of the file in unused_data.
+            decompressor = zlib.decompressobj(wbits=31)
+            try:
+                record = decompressor.decompress(data)
+            except zlib.error:
+                break
+
+            if not decompressor.eof:
+                # The last capture was cut short.
+                break
+
+            data = decompressor.unused_data
+            header, _, body = record.partition(b"\n")
+            try:
+                meta = json.loads(header)
+            except ValueError:
+                continue
+
+            yield meta['time'], meta['server'], body
+
+
+def group_polls(captures, gap):
+    """
+    Group captures into polls
+
+    Servers are polled together, so captures that start within gap seconds of each other belong to the same poll. A
+    second capture from a server starts a new poll.
+
+    :param captures: iterable of (epoch seconds, server IP, body bytes).
+    :param float gap: seconds.
+    :return: generator of (epoch seconds, {server IP: body bytes})
+    """
+    poll_time, bodies = None, {}
+
+    for captured, server_ip, body in captures:
+        if bodies and (captured - poll_time > gap or server_ip in bodies):
+            yield poll_time, bodies
+            bodies = {}
+
+        if not bodies:
+            poll_time = captured
+        bodies[server_ip] = body
+
+    if bodies:
+        yield poll_time, bodies
+
+
+class TrafficCapture:
+    """
+    Append details.xml responses to a rolling archive, safe to call from any thread
+    """
+    def __init__(self, folder):
+        """
+        :param str folder:
+        """
+        self.folder = Path(folder)
+        self.lock = threading.Lock()
+        existing = archive_files(self.folder) if self.folder.exists() else []
+        self.path = existing[-1] if existing else None
+
+    def write(self, server_ip, body, captured=None):
+        """
+        Add a response to the archive
+
+        :param str server_ip:
+        :param bytes body:
+        :param float captured: epoch seconds; now if not given.
+        """
+        header = json.dumps({'time': captured or time.time(), 'server': server_ip, 'size': len(body)})
+        record = gzip.compress(header.encode('utf-8') + b"\n" + body, compresslevel=6)
+
+        with self.lock:
+            if self.path is None or not self.path.exists() or self.path.stat().st_size >= CAPTURE_FILE_BYTES:
+                self.roll()
+
+            with open(self.path, "ab") as archive:
+                archive.write(record)
+
+    def roll(self):
+        """
+        Start a new capture file, deleting the oldest files to stay within CAPTURE_MAX_FILES
+        """
+        self.folder.mkdir(parents=True, exist_ok=True)
+        self.path = self.folder / f"details-{dt.datetime.now(dt.timezone.utc):%Y%m%d-%H%M%S-%f}{SUFFIX}"
+
+        for old in archive_files(self.folder)[:-(CAPTURE_MAX_FILES - 1) or None]:
+            old.unlink(missing_ok=True)
+
+
+class ReplayResponse:
+    """
+    A captured details.xml dressed up as a streamed requests.Response
+    """
+    elapsed = dt.timedelta(0)
+    encoding = 'utf-8'
+    status_code = 200
+
+    def __init__(self, body):
+        """
+        :param bytes body:
+        """
+        self.body = body
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    @property
+    def text(self):  # noqa
+        return self.body.decode(self.encoding, errors='replace')
+
+    def raise_for_status(self):  # noqa
+        pass
+
+    def iter_content(self, chunk_size=1):  # noqa
+        for start in range(0, len(self.body), chunk_size):
+            yield self.body[start:start + chunk_size]
+
+
+class ReplaySession:
+    """
+    Stands in for the servers' requests.Sessions when replayed polls fetch details.xml
+
+    details.xml requests are answered with the capture for the current poll. Nothing else was captured, so anything
+    else raises ConnectionError rather than pretending to have reached a server.
+    """
+    def __init__(self):
+        self.bodies = {}  # {server IP: bytes} for the poll being replayed.
+
+    def get(self, url, **kwargs):  # noqa
+        """
+        :param str url:
+        :return ReplayResponse:
+        """
+        server_ip, _, path = url.split('://', 1)[-1].partition('/')
+
+        if not path.startswith('details.xml'):
+            raise requests.exceptions.ConnectionError(f"Only details.xml can be replayed, not {path}.")
+
+        if server_ip not in self.bodies:
+            raise requests.exceptions.ConnectionError(f"No captured details.xml for {server_ip} in this poll.")
+
+        return ReplayResponse(self.bodies[server_ip])
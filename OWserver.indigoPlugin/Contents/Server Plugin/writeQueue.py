@@ -0,0 +1,218 @@
+# pylint: disable=invalid-name
+
+"""
+filename: writeQueue.py
+author: DaveL17
+
+writeQueue.py is a module designed to support the OWServer plugin for Indigo Home Control Server. The module queues
+devices.htm writes so that the Indigo UI and action threads that ask for them don't wait on the EDS server.
+
+Each server has its own lane. Writes to a server are sent one at a time in the order they were queued, so a burst of
+scripted actions doesn't open a pile of parallel connections to the EDS web server, while writes to different servers
+go out in parallel. A lane's worker thread is started when a write is queued and exits once the lane is empty.
+
+Writes wait in their lane for WRITE_COALESCE_WINDOW seconds before they are sent so that bursts can be coalesced. A
+write to a ROM ID and variable that already has a write waiting replaces that write's value rather than adding another
+round trip, and toggles (writes queued with toggle=True) flip the waiting value instead. If a toggle flips a waiting
+toggle back to what the device had before it, the pair cancels out and nothing is sent. Only toggles cancel; an
+explicit value always replaces the waiting one and is sent. Every coalesced write's
+future resolves with the outcome of the write that was sent (or None if nothing was).
+"""
+
+from collections import deque
+from concurrent.futures import Future
+import threading
+import time
+
+from constants import WRITE_COALESCE_WINDOW  # noqa
+
+
+def flip(value):
+    """
+    Return the opposite of a "0" / "1" value, or None if it is neither
+
+    :param str value:
+    :return str:
+    """
+    return {"0": "1", "1": "0"}.get(str(value))
+
+
+class WriteRequest:
+    """
+    A single devices.htm write and the future that reports its outcome
+    """
+    def __init__(self, server_ip, rom_id, variable, value, toggle=False, refresh=True):
+        """
+        :param str server_ip:
+        :param str rom_id:
+        :param str variable:
+        :param str value:
+        :param bool toggle: value is the opposite of the device's current value.
+        :param bool refresh: ask for the written device to be polled shortly after the write.
+        """
+        self.server_ip = server_ip
+        self.rom_id = rom_id
+        self.variable = variable
+        self.value = value
+        self.toggle = toggle
+        self.refresh = refresh
+        self.original = flip(value) if toggle else None  # The device's value before this write, if known.
+        self.merged = []  # Later writes coalesced into this one.
+        self.queued_at = time.monotonic()
+        self.future = Future()
+
+    def __repr__(self):
+        return f"{self.server_ip} {self.rom_id} {self.variable}={self.value}"
+
+
+class WriteQueue:
+    """
+    Per-server ordered write lanes, safe to call from any thread
+    """
+    def __init__(self, send):
+        """
+        :param send: callable(WriteRequest) that performs the write and returns its result, or raises.
+        """
+        self.send = send
+        self.lanes = {}    # {server IP: deque of WriteRequest}
+        self.workers = {}  # {server IP: the lane's worker thread}
+        self.lock = threading.Lock()
+        self.closed = False
+
+    def submit(self, server_ip, rom_id, variable, value, callback=None, toggle=False, refresh=True):
+        """
+        Queue a write and return immediately
+
+        :param str server_ip:
+        :param str rom_id:
+        :param str variable:
+        :param str value:
+        :param callback: optional callable(WriteRequest), called once the write has finished or failed.
+        :param bool toggle: value is the opposite of the device's current value.
+        :param bool refresh: ask for the written device to be polled shortly after the write.
+        :return Future: resolves to the result of send() (None if the write cancelled out), or raises its exception.
+        """
+        request = WriteRequest(server_ip, rom_id, variable, value, toggle, refresh)
+
+        if callback is not None:
+            request.future.add_done_callback(lambda future: callback(request))
+
+        with self.lock:
+            if self.closed:
+                request.future.set_exception(RuntimeError("The write queue has been shut down."))
+                return request.future
+
+            lane = self.lanes.setdefault(server_ip, deque())
+            waiting = next(
+                (queued for queued in lane if (queued.rom_id, queued.variable) == (rom_id, variable)), None
+            )
+            cancelled_out = []
+
+            if waiting is None:
+                lane.append(request)
+            else:
+                cancelled_out = self.coalesce(lane, waiting, request)
+
+            if server_ip not in self.workers:
+                worker = threading.Thread(
+                    target=self.run_lane, args=(server_ip,), name=f"OWServerWrite {server_ip}", daemon=True
+                )
+                self.workers[server_ip] = worker
+                worker.start()
+
+        # Resolved outside the lock, since callbacks may queue more writes.
+        for coalesced in cancelled_out:
+            if coalesced.future.set_running_or_notify_cancel():
+                coalesced.future.set_result(None)
+
+        return request.future
+
+    @staticmethod
+    def coalesce(lane, waiting, request):
+        """
+        Fold a new write into the write already waiting for the same ROM ID and variable
+
+        The waiting write keeps its place in the lane and takes the new value. A toggle that takes a waiting toggle back
+        to the device's original value cancels both. Must be called with the lock held.
+
+        :param deque lane:
+        :param WriteRequest waiting:
+        :param WriteRequest request:
+        :return list: the writes that cancelled out and should be resolved with None, if any.
+        """
+        value = flip(waiting.value) if request.toggle else request.value
+        waiting.merged.append(request)
+
+        if request.toggle and waiting.toggle and value is not None and value == waiting.original:
+            # Back to where the device started, so nothing needs to be sent.
+            lane.remove(waiting)
+            return [waiting] + waiting.merged
+
+        waiting.value = value if value is not None else request.value
+        waiting.refresh = waiting.refresh or request.refresh
+        request.value = waiting.value
+        if not request.toggle:
+            # An explicit value has to reach the server, so later toggles can no longer cancel it out.
+            waiting.toggle = False
+        return []
+
+    def run_lane(self, server_ip):
+        """
+        Send a server's queued writes in order until its lane is empty
+
+        :param str server_ip:
+        """
+        while True:
+            with self.lock:
+                lane = self.lanes.get(server_ip)
+
+                if not lane or self.closed:
+                    self.lanes.pop(server_ip, None)
+                    self.workers.pop(server_ip, None)
+                    return
+
+                # Give later writes to the same variable a chance to be coalesced into this one.
+                hold = lane[0].queued_at + WRITE_COALESCE_WINDOW - time.monotonic()
+                if hold <= 0:
+                    request = lane.popleft()
+
+            if hold > 0:
+                time.sleep(hold)
+                continue
+
+            # Callers may have given up on some of the coalesced writes; send if anyone is still waiting.
+            live = [coalesced for coalesced in [request] + request.merged
+                    if coalesced.future.set_running_or_notify_cancel()]
+            if not live:
+                continue
+
+            try:
+                result = self.send(request)
+            except Exception as error:  # noqa
+                for coalesced in live:
+                    coalesced.future.set_exception(error)
+            else:
+                for coalesced in live:
+                    coalesced.future.set_result(result)
+
+    def pending(self):
+        """
+        Return the number of writes waiting in each lane
+
+        :return dict: {server IP: count}
+        """
+        with self.lock:
+            return {server_ip: len(lane) for server_ip, lane in self.lanes.items() if lane}
+
+    def close(self):
+        """
+        Stop accepting writes and cancel those still waiting. Writes already being sent are allowed to finish.
+        """
+        with self.lock:
+            self.closed = True
+            waiting = [coalesced for lane in self.lanes.values() for request in lane
+                       for coalesced in [request] + request.merged]
+            self.lanes.clear()
+
+        for request in waiting:
+            request.future.cancel()
@@ -0,0 +1,287 @@
+# pylint: disable=invalid-name
+
+"""
+filename: benchmark.py
+author: DaveL17
+
+benchmark.py measures the OWServer plugin's poll pipeline outside of Indigo. It loads plugin.py against the fakeIndigo
+stand-in, creates one Indigo device for each server and sensor, and drives Plugin.updateDeviceStates() against
+synthetic details.xml from the EDS simulator (or recorded details.xml files). It is a development tool and is not part
+of the plugin bundle.
+
+details.xml is handed to the plugin from memory, so the numbers measure the plugin rather than the network. For each
+scale it reports:
+
+    cold:       seconds for the first poll, when every state is written.
+    warm:       median seconds for the following polls, when only changed states are written.
+    IPC/dev:    calls to the Indigo server per device for the cold and warm polls (see fakeIndigo.py).
+    alloc:      peak memory allocated during a warm poll (tracemalloc), and how much of it was still held afterwards.
+    RSS:        peak resident memory of the process.
+
+Each scale runs in its own process so that peak RSS belongs to that scale alone. Examples:
+
+    # The default scales: 10, 100, 1,000 and 5,000 sensors over 1, 10 and 50 servers.
+    python3 tools/benchmark.py
+
+    python3 tools/benchmark.py --sensors 100,1000 --servers 1,4 --cycles 10 --json results.json
+
+    # Recorded details.xml files, one per server.
+    python3 tools/benchmark.py --xml server1.xml server2.xml
+
+    # Traffic captured by the plugin (see trafficArchive.py). Each poll uses the next capture from each server.
+    python3 tools/benchmark.py --archive ~/Library/.../Logs/OWServer\ Captures/*.owcap.gz
+"""
+
+import argparse
+import json
+import itertools
+import logging
+from pathlib import Path
+import random
+import resource
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+TOOLS_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(TOOLS_DIR))
+sys.path.insert(0, str(TOOLS_DIR.parent / "OWserver.indigoPlugin" / "Contents" / "Server Plugin"))
+
+import fakeIndigo  # noqa  pylint: disable=wrong-import-position
+fakeIndigo.install()
+
+import edsSimulator  # noqa  pylint: disable=wrong-import-position
+import plugin  # noqa  pylint: disable=wrong-import-position
+from plugin_defaults import kDefaultPluginPrefs  # noqa  pylint: disable=wrong-import-position
+from sensorFamilies import SENSOR_FAMILIES  # noqa  pylint: disable=wrong-import-position
+from trafficArchive import ReplaySession, read_archive  # noqa  pylint: disable=wrong-import-position
+
+FAMILIES = sorted({entry['family'] for entry in SENSOR_FAMILIES.values()})
+DEVICE_TYPES = {entry['family']: type_id for type_id, entry in SENSOR_FAMILIES.items()}
+
+
+def peak_rss_mib():
+    """
+    :return float: peak resident memory of this process in MiB.
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB; macOS reports bytes.
+    return peak / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+
+
+def synthetic_servers(sensors, servers, change_rate, seed):
+    """
+    Spread a number of sensors, cycling through the supported families, over a number of simulated servers
+
+    :param int sensors:
+    :param int servers:
+    :param float change_rate:
+    :param int seed:
+    :return list: [(server IP, callable returning the next details.xml as bytes, [(ROM ID, family)])]
+    """
+    settings = {'latency': 0, 'jitter': 0, 'error_rate': 0, 'malformed_rate': 0, 'change_rate': change_rate}
+    rng = random.Random(seed)
+    result = []
+    placed = 0
+
+    for index in range(1, servers + 1):
+        count = sensors // servers + (1 if index <= sensors % servers else 0)
+        families = [FAMILIES[(placed + n) % len(FAMILIES)] for n in range(count)]
+        placed += count
+        server = edsSimulator.SimulatedServer(index, f"192.0.2.{index}", 80, families, settings,
+                                              random.Random(rng.random()))
+        roms = [(rom_id, sensor.family) for rom_id, sensor in server.sensors.items()]
+        result.append((server.address, lambda server=server: server.details_xml().encode('utf-8'), roms))
+
+    return result
+
+
+def recorded_servers(recordings):
+    """
+    Use recorded details.xml, taking each server's recordings in turn
+
+    :param dict recordings: {server IP: [bytes]}
+    :return list: [(server IP, callable returning the next details.xml as bytes, [(ROM ID, family)])]
+    """
+    result = []
+
+    for server_ip, bodies in recordings.items():
+        roms = {}
+        for body in bodies:
+            try:
+                for kind, payload in plugin.Plugin.parse_details_xml([body]):
+                    if kind == 'sensor':
+                        roms[payload[0]] = payload[1]
+            except plugin.eTree.ParseError:
+                # Malformed captures are still replayed; they just can't name any sensors.
+                pass
+
+        bodies = itertools.cycle(bodies)
+        result.append((server_ip, lambda bodies=bodies: next(bodies), list(roms.items())))
+
+    return result
+
+
+def run_scale(servers, cycles, concurrency):
+    """
+    Benchmark updateDeviceStates() against a set of servers
+
+    :param list servers: [(server IP, callable returning the next details.xml as bytes, [(ROM ID, family)])]
+    :param int cycles: warm polls to time.
+    :param int concurrency: servers polled at once.
+    :return dict:
+    """
+    fakeIndigo.devices.clear()
+    dev_id = 1
+
+    for server_ip, _, roms in servers:
+        fakeIndigo.devices.add(fakeIndigo.Device(dev_id, f"Server {server_ip}", "owsOWSServer",
+                                                 {'serverList': server_ip}))
+        dev_id += 1
+
+        for rom_id, family in roms:
+            type_id = DEVICE_TYPES.get(family)
+            if not type_id:
+                continue
+
+            props = {'serverList': server_ip, 'romID': rom_id}
+            entry = SENSOR_FAMILIES[type_id]
+            if entry['value_pref']:
+                props[entry['value_pref']] = next(iter(entry['values']))
+
+            fakeIndigo.devices.add(fakeIndigo.Device(dev_id, f"{family} {rom_id}", type_id, props))
+            dev_id += 1
+
+    prefs = dict(kDefaultPluginPrefs)
+    prefs.update({
+        'OWServerIP': ",".join(server_ip for server_ip, _, _ in servers),
+        'configMenuMaxConcurrency': str(concurrency),
+        'showDebugLevel': 30,
+        'suppressResultsLogging': True,
+    })
+    owserver = plugin.Plugin("com.fogbert.indigoplugin.OWServer", "OWServer", plugin.__version__, prefs)
+    session = ReplaySession()
+    owserver.get_session = lambda server_ip: session
+
+    def load():
+        for server_ip, next_body, _ in servers:
+            session.bodies[server_ip] = next_body()
+
+    def poll():
+        load()
+        fakeIndigo.reset_counters()
+        start = time.perf_counter()
+        owserver.updateDeviceStates()
+        return time.perf_counter() - start, sum(fakeIndigo.CALLS.values())
+
+    devices = len(fakeIndigo.devices)
+    cold_time, cold_calls = poll()
+    warm = [poll() for _ in range(cycles)]
+
+    # tracemalloc slows everything down, so allocations are measured on a poll of their own.
+    load()
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    owserver.updateDeviceStates()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'sensors': sum(len(roms) for _, _, roms in servers),
+        'servers': len(servers),
+        'devices': devices,
+        'cold_s': round(cold_time, 4),
+        'warm_s': round(statistics.median(seconds for seconds, _ in warm), 4) if warm else None,
+        'cold_ipc_per_device': round(cold_calls / devices, 2),
+        'warm_ipc_per_device': round(statistics.mean(calls for _, calls in warm) / devices, 2) if warm else None,
+        'alloc_peak_mib': round((peak - baseline) / 1024 / 1024, 2),
+        'alloc_retained_kib': round((current - baseline) / 1024, 1),
+        'peak_rss_mib': round(peak_rss_mib(), 1),
+    }
+
+
+def print_row(result=None):
+    """
+    Print one result as a table row, or the table header if no result is given
+
+    :param dict result:
+    """
+    columns = [
+        ('sensors', 'sensors', 8), ('servers', 'servers', 8), ('cold_s', 'cold s', 9), ('warm_s', 'warm s', 9),
+        ('cold_ipc_per_device', 'cold IPC/dev', 13), ('warm_ipc_per_device', 'warm IPC/dev', 13),
+        ('alloc_peak_mib', 'alloc MiB', 10), ('alloc_retained_kib', 'held KiB', 9), ('peak_rss_mib', 'RSS MiB', 8),
+    ]
+    if result is None:
+        print("".join(f"{title:>{width}}" for _, title, width in columns))
+    else:
+        print("".join(f"{str(result[key]):>{width}}" for key, _, width in columns), flush=True)
+
+
+def main():
+    """
+    Run every requested scale, each in a child process, and report the results
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the OWServer plugin's poll pipeline.")
+    parser.add_argument('--sensors', default="10,100,1000,5000", help="comma separated sensor counts")
+    parser.add_argument('--servers', default="1,10,50", help="comma separated server counts")
+    parser.add_argument('--xml', nargs='+', help="recorded details.xml files, one per server, in place of synthetic data")
+    parser.add_argument('--archive', nargs='+', help="capture files from the plugin, in place of synthetic data")
+    parser.add_argument('--cycles', type=int, default=5, help="warm polls to time at each scale (default 5)")
+    parser.add_argument('--concurrency', type=int, default=4, help="servers polled at once (default 4)")
+    parser.add_argument('--change-rate', type=float, default=0.5, help="chance each reading changes between polls")
+    parser.add_argument('--ipc-latency', type=float, default=0.0, help="seconds charged per Indigo server call")
+    parser.add_argument('--seed', type=int, default=1, help="random seed for the synthetic data")
+    parser.add_argument('--json', help="also write the results to this file")
+    parser.add_argument('--child', nargs=2, type=int, metavar=('SENSORS', 'SERVERS'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR)
+    fakeIndigo.IPC_LATENCY = args.ipc_latency
+
+    if args.child:
+        sensors, servers = args.child
+        result = run_scale(synthetic_servers(sensors, servers, args.change_rate, args.seed), args.cycles,
+                           args.concurrency)
+        print(json.dumps(result))
+        return
+
+    print_row()
+
+    if args.xml or args.archive:
+        recordings = {}
+        if args.xml:
+            for index, path in enumerate(args.xml, start=1):
+                recordings[f"192.0.2.{index}"] = [Path(path).read_bytes()]
+        else:
+            for _, server_ip, body in read_archive(args.archive):
+                recordings.setdefault(server_ip, []).append(body)
+
+        results = [run_scale(recorded_servers(recordings), args.cycles, args.concurrency)]
+        print_row(results[0])
+
+    else:
+        results = []
+        for sensors in (int(value) for value in args.sensors.split(',')):
+            for servers in (int(value) for value in args.servers.split(',')):
+                if servers > sensors:
+                    continue
+
+                command = [sys.executable, __file__, '--child', str(sensors), str(servers),
+                           '--cycles', str(args.cycles), '--concurrency', str(args.concurrency),
+                           '--change-rate', str(args.change_rate), '--ipc-latency', str(args.ipc_latency),
+                           '--seed', str(args.seed)]
+                child = subprocess.run(command, capture_output=True, text=True, check=False)
+                if child.returncode:
+                    sys.exit(f"Benchmark of {sensors} sensors over {servers} servers failed:\n{child.stderr}")
+
+                results.append(json.loads(child.stdout.strip().splitlines()[-1]))
+                print_row(results[-1])
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2), encoding='utf-8')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,524 @@
+# pylint: disable=invalid-name
+
+"""
+filename: edsSimulator.py
+author: DaveL17
+
+edsSimulator.py simulates one or more EDS OW-SERVER 1-Wire servers so that the OWServer plugin can be load and
+regression tested without EDS hardware. It is a development tool and is not part of the plugin bundle.
+
+Each simulated server:
+    - serves a synthetic details.xml for any mix of the supported sensor families. The families, their details.xml
+      keys and their descriptions come from the plugin's own sensorFamilies.py and stateDict.py.
+    - accepts devices.htm?rom=&variable=&value= writes and reflects them in the next details.xml.
+    - answers the EDS discovery broadcast on UDP port 30303.
+    - can inject latency, HTTP errors and malformed (truncated or non-XML) responses.
+
+Servers listen on consecutive ports starting at --port. The plugin accepts 'address:port' server addresses, so a
+simulator on 127.0.0.1:8080 can be entered in the plugin config as is. Examples:
+
+    # One server with one sensor of each family.
+    python3 tools/edsSimulator.py
+
+    # Ten servers with 50 DS18B20 and 50 EDS0068 sensors each, 200ms to 700ms latency and 2% HTTP errors.
+    python3 tools/edsSimulator.py --servers 10 --sensors 50 --families DS18B20,EDS0068 --latency 0.2 --jitter 0.5 \
+        --error-rate 0.02
+
+Fault injection can also be changed while the simulator runs by requesting /sim from a server, for example
+http://127.0.0.1:8080/sim?latency=2&malformed_rate=0.5. /sim with no query returns the server's settings and request
+counters as JSON.
+"""
+
+import argparse
+import datetime as dt
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+import random
+import re
+import socket
+import sys
+import threading
+import time
+from urllib.parse import parse_qs, urlparse
+from xml.sax.saxutils import escape, quoteattr
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "OWserver.indigoPlugin" / "Contents" / "Server Plugin"))
+
+import stateDict  # noqa
+from constants import DISCOVERY_PORT  # noqa
+from sensorFamilies import SENSOR_FAMILIES  # noqa
+
+NAMESPACE = "http://www.embeddeddatasystems.com/schema/owserver"
+
+FAMILY_CODES = {
+    'DS18B20': '28', 'DS18S20': '10', 'DS2406': '12', 'DS2408': '29', 'DS2423': '1D', 'DS2438': '26', 'DS2450': '20',
+}
+
+# Readings that drift between polls: (pattern, starting value, largest step, decimal places). The first match wins.
+READINGS = [
+    (r'Temperature$', 20.0, 0.5, 4),
+    (r'Humidity$', 45.0, 1.0, 2),
+    (r'DewPoint$', 8.0, 0.5, 2),
+    (r'(HeatIndex|Humidex)$', 21.0, 0.5, 2),
+    (r'BarometricPressureHg$', 29.92, 0.02, 2),
+    (r'BarometricPressureMb$', 1013.25, 0.5, 2),
+    (r'Light$', 500.0, 25.0, 0),
+    (r'^Vibration(Instant|Peak|Minimum|Maximum)$', 5.0, 1.0, 0),
+    (r'^RTDOhms$', 108.0, 0.2, 3),
+    (r'^(Vad|Vdd)$', 5.0, 0.05, 2),
+    (r'^Vsense$', 0.01, 0.005, 4),
+    (r'ConversionValue$', 2.5, 0.1, 3),
+    (r'Input\d(Instant|Minimum|Maximum)$', 10.0, 0.5, 3),
+    (r'(Counter\w*|PulseCounter)$', 1000.0, 5.0, 0),
+]
+
+# Fixed values for descriptive keys.
+FIXED_VALUES = {
+    'Health': '7',
+    'Channel': '1',
+    'Version': '3.16',
+    'Resolution': '12',
+    'NumberOfChannels': '8',
+    'PowerSource': 'FF',
+}
+
+BIT_MASKS = ('PIOOutputLatchState', 'PIOLogicState', 'PIOActivityLatchState')
+
+
+def family_descriptions():
+    """
+    Read each family's description from the comments in sensorFamilies.py
+
+    :return dict: {family: description}
+    """
+    source = Path(sys.modules['sensorFamilies'].__file__).read_text(encoding='utf-8')
+    return dict(re.findall(r'#\s*(\w+) Description = "([^"]*)"', source))
+
+
+def family_keys(family):
+    """
+    Return the details.xml keys that a sensor of the given family reports
+
+    :param str family:
+    :return list:
+    """
+    for entry in SENSOR_FAMILIES.values():
+        if entry['family'] == family:
+            keys = set(entry['states'].values()) | set(entry['props'])
+            keys |= {value[0] for value in entry['values'].values()}
+            # DS2408 switch states are derived by the plugin from PIOOutputLatchState; they aren't in details.xml.
+            if entry['derive']:
+                keys = {key for key in keys if not key.startswith('Switch')}
+            return sorted(keys - {'Name', 'Family', 'ROMId'})
+
+    raise ValueError(f"Unsupported sensor family: {family}")
+
+
+class SimulatedSensor:
+    """
+    A single 1-Wire sensor and its current details.xml values
+    """
+    def __init__(self, family, rom_id, description, rng):
+        """
+        :param str family:
+        :param str rom_id:
+        :param str description:
+        :param random.Random rng:
+        """
+        self.family = family
+        self.rom_id = rom_id
+        self.description = description
+        self.rng = rng
+        self.readings = {}  # {key: (largest step, decimal places)}
+        self.values = {
+            'Name': family,
+            'Family': FAMILY_CODES.get(family, '7E'),
+            'ROMId': rom_id,
+        }
+
+        for key in family_keys(family):
+            self.values[key] = self.initial_value(key)
+
+    def initial_value(self, key):
+        """
+        Make up a plausible starting value for a details.xml key
+
+        :param str key:
+        :return str:
+        """
+        if key in FIXED_VALUES:
+            return FIXED_VALUES[key]
+
+        if key in BIT_MASKS:
+            return str(self.rng.randint(0, 255))
+
+        if key == 'RawData':
+            return ''.join(self.rng.choice('0123456789ABCDEF') for _ in range(32))
+
+        if key.endswith('HighAlarmValue'):
+            return "100.00"
+
+        if key.endswith('LowAlarmValue'):
+            return "0.00"
+
+        for pattern, start, step, places in READINGS:
+            if re.search(pattern, key):
+                self.readings[key] = (step, places)
+                return f"{start + self.rng.uniform(-step, step) * 4:.{places}f}"
+
+        # States, latches, switches and settings.
+        return "0"
+
+    def drift(self, change_rate):
+        """
+        Move some of the sensor's readings, as a live sensor would between polls
+
+        :param float change_rate: chance that each reading changes.
+        """
+        for key, (step, places) in self.readings.items():
+            if self.rng.random() >= change_rate:
+                continue
+
+            value = float(self.values[key])
+            if key.startswith('Counter') or key.endswith('Counter'):
+                value += self.rng.randint(1, max(1, int(step)))
+            else:
+                value += self.rng.uniform(-step, step)
+            self.values[key] = f"{value:.{places}f}"
+
+        if 'PrimaryValue' in self.values and self.readings:
+            self.values['PrimaryValue'] = self.values[next(iter(self.readings))]
+
+    def write(self, variable, value):
+        """
+        Apply a devices.htm write
+
+        :param str variable:
+        :param str value:
+        :return bool: True if the variable exists on this sensor.
+        """
+        if variable.lower() == 'clearalarms':
+            for key in self.values:
+                if key.endswith(('AlarmState', 'ConditionalSearchState')):
+                    self.values[key] = "0"
+            return True
+
+        if variable not in self.values:
+            return False
+
+        self.values[variable] = value
+
+        # The LED and relay report the state they were last commanded to.
+        if variable in ('LEDState', 'RelayState'):
+            self.values[variable.removesuffix('State')] = value
+        return True
+
+    def xml(self):
+        """
+        :return str: the sensor's owd_ element.
+        """
+        children = ''.join(f"<{key}>{escape(value)}</{key}>" for key, value in self.values.items())
+        return f"<owd_{self.family} Description={quoteattr(self.description)}>{children}</owd_{self.family}>"
+
+
+class SimulatedServer:
+    """
+    One simulated EDS server: its sensors, fault injection settings and HTTP listener
+    """
+    def __init__(self, index, host, port, families, settings, rng):
+        """
+        :param int index: 1 for the first server.
+        :param str host:
+        :param int port:
+        :param list families: the family of each sensor on the server.
+        :param dict settings: latency, jitter, error_rate, malformed_rate and change_rate.
+        :param random.Random rng:
+        """
+        self.index = index
+        self.host = host
+        self.port = port
+        self.address = host if port == 80 else f"{host}:{port}"
+        self.settings = dict(settings)
+        self.rng = rng
+        self.lock = threading.Lock()
+        self.counters = {'details': 0, 'writes': 0, 'errors': 0, 'malformed': 0}
+        self.write_log = []
+
+        descriptions = family_descriptions()
+        self.sensors = {}
+        for family in families:
+            rom_id = f"{len(self.sensors) + 1:06X}{index:04X}{FAMILY_CODES.get(family, '7E')}0000"
+            self.sensors[rom_id] = SimulatedSensor(family, rom_id, descriptions.get(family, family), rng)
+
+        self.httpd = None
+
+    def start(self):
+        """
+        Start answering HTTP requests on a background thread
+        """
+        self.httpd = ThreadingHTTPServer((self.host, self.port), self.make_handler())
+        self.httpd.daemon_threads = True
+        threading.Thread(target=self.httpd.serve_forever, name=f"EDS {self.address}", daemon=True).start()
+
+    def stop(self):
+        """
+        Stop answering HTTP requests
+        """
+        if self.httpd:
+            self.httpd.shutdown()
+            self.httpd.server_close()
+            self.httpd = None
+
+    def details_xml(self):
+        """
+        Render details.xml, advancing the simulated poll
+
+        :return str:
+        """
+        with self.lock:
+            self.counters['details'] += 1
+
+            for sensor in self.sensors.values():
+                sensor.drift(self.settings['change_rate'])
+
+            connected = len(self.sensors)
+            server_values = {
+                'PollCount': str(self.counters['details']),
+                'DevicesConnected': str(connected),
+                'LoopTime': f"{0.5 + 0.01 * connected:.3f}",
+                'DevicesConnectedChannel1': str(connected),
+                'DevicesConnectedChannel2': "0",
+                'DevicesConnectedChannel3': "0",
+                'DataErrors': str(self.counters['errors'] + self.counters['malformed']),
+                'DataErrorsChannel1': "0",
+                'DataErrorsChannel2': "0",
+                'DataErrorsChannel3': "0",
+                'VoltageChannel1': "5.04",
+                'VoltageChannel2': "5.04",
+                'VoltageChannel3': "5.04",
+                'VoltagePower': "5.01",
+                'DeviceName': "OW-SERVER Simulator",
+                'HostName': f"EDSOWSERVER{self.index}",
+                'MACAddress': f"00:04:A3:00:{self.index // 256:02X}:{self.index % 256:02X}",
+                'DateTime': dt.datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            }
+            parts = [f'<?xml version="1.0" encoding="UTF-8"?>\n<Devices-Detail-Response xmlns="{NAMESPACE}">']
+            for key in dict.fromkeys(stateDict.OWServer.server_state_dict().values()):
+                parts.append(f"<{key}>{escape(server_values.get(key, '0'))}</{key}>")
+            parts.extend(sensor.xml() for sensor in self.sensors.values())
+
+        parts.append("</Devices-Detail-Response>\n")
+        return '\n'.join(parts)
+
+    def write(self, rom_id, variable, value):
+        """
+        Apply a devices.htm write to one of the server's sensors
+
+        :param str rom_id:
+        :param str variable:
+        :param str value:
+        :return bool: True if the sensor and variable exist.
+        """
+        with self.lock:
+            self.counters['writes'] += 1
+            sensor = self.sensors.get(rom_id)
+            written = bool(sensor and sensor.write(variable, value))
+            self.write_log.append((time.time(), rom_id, variable, value, written))
+            del self.write_log[:-1000]
+
+        print(f"{self.address} write rom={rom_id} variable={variable} value={value} "
+              f"{'applied' if written else 'ignored (unknown ROM ID or variable)'}")
+        return written
+
+    def discovery_response(self):
+        """
+        :return bytes: the JSON blob an EDS server sends in answer to a discovery broadcast.
+        """
+        blob = {
+            'Acquired': dt.datetime.now().strftime('%m/%d/%Y %H:%M:%S'),
+            'Product': "OW-SERVER Simulator",
+            'MAC': f"00:04:A3:00:{self.index // 256:02X}:{self.index % 256:02X}",
+            'IP': self.address,
+            'Name': f"EDSOWSERVER{self.index}",
+            'Version': "3.16",
+        }
+        return json.dumps(blob, indent=0).replace('\n', '\r\n').encode('utf-8')
+
+    def inject_fault(self):
+        """
+        Sleep for the configured latency and pick a fault to inject, if any
+
+        :return str: 'error', 'malformed' or None.
+        """
+        with self.lock:
+            settings = dict(self.settings)
+            roll = self.rng.random()
+
+        time.sleep(settings['latency'] + self.rng.uniform(0, settings['jitter']))
+
+        if roll < settings['error_rate']:
+            fault = 'error'
+        elif roll < settings['error_rate'] + settings['malformed_rate']:
+            fault = 'malformed'
+        else:
+            return None
+
+        with self.lock:
+            self.counters['errors' if fault == 'error' else 'malformed'] += 1
+        return fault
+
+    def make_handler(self):
+        """
+        :return type: the request handler class for this server.
+        """
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            """
+            Answer details.xml, devices.htm and /sim requests
+            """
+            def do_GET(self):  # noqa
+                url = urlparse(self.path)
+                query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+
+                match url.path:
+                    case "/sim":
+                        self.control(query)
+                    case "/details.xml":
+                        self.details()
+                    case "/devices.htm":
+                        self.devices(query)
+                    case _:
+                        self.send_error(404)
+
+            def details(self):
+                fault = server.inject_fault()
+                if fault == 'error':
+                    self.send_error(500, "Simulated server error")
+                    return
+
+                body = server.details_xml().encode('utf-8')
+                if fault == 'malformed':
+                    if server.rng.random() < 0.5:
+                        body = body[:server.rng.randint(1, len(body) - 1)]
+                    else:
+                        body = b"<html><body>Simulated garbage</body>"
+
+                self.reply(body, "text/xml")
+
+            def devices(self, query):
+                if server.inject_fault() == 'error':
+                    self.send_error(500, "Simulated server error")
+                    return
+
+                if 'rom' in query and 'variable' in query:
+                    server.write(query['rom'], query['variable'], query.get('value', ''))
+                self.reply(b"<html><body>OK</body></html>", "text/html")
+
+            def control(self, query):
+                try:
+                    changes = {key: float(value) for key, value in query.items() if key in server.settings}
+                except ValueError:
+                    self.send_error(400, "Settings must be numbers")
+                    return
+
+                with server.lock:
+                    server.settings.update(changes)
+                    body = json.dumps({'settings': server.settings, 'counters': server.counters}, indent=2)
+                self.reply(body.encode('utf-8'), "application/json")
+
+            def reply(self, body, content_type):
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):  # noqa
+                # Polls are frequent; writes are logged by SimulatedServer.write().
+                pass
+
+        return Handler
+
+
+def answer_discovery(servers, port):
+    """
+    Answer EDS discovery broadcasts on behalf of every simulated server
+
+    :param list servers:
+    :param int port:
+    """
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP) as listener:
+        listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, True)
+        listener.bind(('', port))
+
+        while True:
+            request, address = listener.recvfrom(2048)
+            if request.strip() != b"D":
+                continue
+
+            for server in servers:
+                listener.sendto(server.discovery_response(), address)
+
+
+def main():
+    """
+    Start the simulated servers and run until interrupted
+    """
+    families = sorted({entry['family'] for entry in SENSOR_FAMILIES.values()})
+
+    parser = argparse.ArgumentParser(description="Simulate EDS OW-SERVER 1-Wire servers for the OWServer plugin.")
+    parser.add_argument('--host', default='127.0.0.1', help="address to listen on (default 127.0.0.1)")
+    parser.add_argument('--port', type=int, default=8080, help="HTTP port of the first server (default 8080)")
+    parser.add_argument('--servers', type=int, default=1, help="number of servers (default 1)")
+    parser.add_argument('--sensors', type=int, default=1, help="sensors of each family per server (default 1)")
+    parser.add_argument('--families', default=','.join(families), help="comma separated families (default all)")
+    parser.add_argument('--latency', type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument('--jitter', type=float, default=0.0, help="up to this many more seconds, at random")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="fraction of requests answered with HTTP 500")
+    parser.add_argument('--malformed-rate', type=float, default=0.0, help="fraction of details.xml that is malformed")
+    parser.add_argument('--change-rate', type=float, default=0.5, help="chance each reading changes between polls")
+    parser.add_argument('--discovery-port', type=int, default=DISCOVERY_PORT, help="UDP discovery port (0 disables)")
+    parser.add_argument('--seed', type=int, default=None, help="random seed for repeatable values and faults")
+    args = parser.parse_args()
+
+    chosen = [family.strip() for family in args.families.split(',') if family.strip()]
+    unknown = sorted(set(chosen) - set(families))
+    if unknown:
+        parser.error(f"unsupported families: {', '.join(unknown)}. Choose from {', '.join(families)}.")
+
+    settings = {
+        'latency': args.latency,
+        'jitter': args.jitter,
+        'error_rate': args.error_rate,
+        'malformed_rate': args.malformed_rate,
+        'change_rate': args.change_rate,
+    }
+    families_per_server = [family for family in chosen for _ in range(args.sensors)]
+    rng = random.Random(args.seed)
+    servers = [
+        SimulatedServer(index, args.host, args.port + index - 1, families_per_server, settings,
+                        random.Random(rng.random()))
+        for index in range(1, args.servers + 1)
+    ]
+
+    for server in servers:
+        server.start()
+    print(f"Serving {args.servers} simulated servers with {len(chosen) * args.sensors} sensors each: "
+          f"{', '.join(server.address for server in servers)}")
+
+    if args.discovery_port:
+        threading.Thread(target=answer_discovery, args=(servers, args.discovery_port), daemon=True).start()
+        print(f"Answering discovery broadcasts on UDP port {args.discovery_port}")
+
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        for server in servers:
+            server.stop()
+
+
+if __name__ == '__main__':
+    main()
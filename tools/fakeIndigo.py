@@ -0,0 +1,246 @@
+# pylint: disable=invalid-name
+
+"""
+filename: fakeIndigo.py
+author: DaveL17
+
+fakeIndigo.py is a lightweight, in-process stand-in for the parts of the Indigo plugin API that the OWServer plugin
+uses, so that the plugin can be loaded and driven outside of Indigo. It is a development tool and is not part of the
+plugin bundle.
+
+Call install() before importing plugin.py. Every call that would be a round trip to the Indigo server in a real
+install (state and prop writes, device fetches) is counted in CALLS, both in total and per device, so that a change
+can be measured by how much it talks to the server as well as by how long it takes. Set IPC_LATENCY to also charge a
+fixed number of seconds for each of those calls.
+"""
+
+from collections import Counter
+import datetime as dt
+import logging
+import sys
+import time
+
+CALLS = Counter()              # {call name: count}
+DEVICE_CALLS = Counter()       # {device ID: count}
+IPC_LATENCY = 0.0              # Seconds added to each counted call.
+
+
+def install():
+    """
+    Make this module importable as 'indigo'
+    """
+    sys.modules['indigo'] = sys.modules[__name__]
+
+
+def reset_counters():
+    """
+    Zero the call counters
+    """
+    CALLS.clear()
+    DEVICE_CALLS.clear()
+
+
+def count(name, dev_id=None):
+    """
+    Count one call to the Indigo server
+
+    :param str name:
+    :param int dev_id:
+    """
+    CALLS[name] += 1
+    if dev_id is not None:
+        DEVICE_CALLS[dev_id] += 1
+    if IPC_LATENCY:
+        time.sleep(IPC_LATENCY)
+
+
+class Dict(dict):
+    """
+    indigo.Dict
+    """
+
+
+class List(list):
+    """
+    indigo.List
+    """
+
+
+class kStateImageSel:  # noqa
+    """
+    indigo.kStateImageSel
+    """
+    Auto = 'Auto'
+    Error = 'Error'
+    LightSensor = 'LightSensor'
+    SensorOff = 'SensorOff'
+    SensorOn = 'SensorOn'
+    TemperatureSensor = 'TemperatureSensor'
+
+
+class Device:
+    """
+    indigo.Device
+    """
+    def __init__(self, dev_id, name, device_type_id, props, plugin_id="com.fogbert.indigoplugin.OWServer"):
+        """
+        :param int dev_id:
+        :param str name:
+        :param str device_type_id:
+        :param dict props:
+        :param str plugin_id:
+        """
+        self.id = dev_id
+        self.name = name
+        self.deviceTypeId = device_type_id
+        self.pluginId = plugin_id
+        self.enabled = True
+        self.configured = True
+        self.errorState = ""
+        self.lastChanged = dt.datetime.now()
+        self.states = Dict()
+        self._props = Dict(props)
+
+    @property
+    def pluginProps(self):  # noqa
+        # Indigo hands out a copy; changes only stick through replacePluginPropsOnServer().
+        return Dict(self._props)
+
+    def updateStateOnServer(self, key, value=None, uiValue=None, decimalPlaces=None, clearErrorState=True):  # noqa
+        count('updateStateOnServer', self.id)
+        self.states[key] = value
+        self.lastChanged = dt.datetime.now()
+
+    def updateStatesOnServer(self, key_value_list, clearErrorState=True):  # noqa
+        count('updateStatesOnServer', self.id)
+        for entry in key_value_list:
+            self.states[entry['key']] = entry.get('value')
+        self.lastChanged = dt.datetime.now()
+
+    def updateStateImageOnServer(self, image):  # noqa
+        count('updateStateImageOnServer', self.id)
+
+    def replacePluginPropsOnServer(self, props):  # noqa
+        count('replacePluginPropsOnServer', self.id)
+        self._props = Dict(props)
+
+    def setErrorStateOnServer(self, error):  # noqa
+        count('setErrorStateOnServer', self.id)
+        self.errorState = error or ""
+
+    def stateListOrDisplayStateIdChanged(self):  # noqa
+        count('stateListOrDisplayStateIdChanged', self.id)
+
+    def refreshFromServer(self):  # noqa
+        count('refreshFromServer', self.id)
+
+
+class DeviceList(dict):
+    """
+    indigo.devices, keyed by device ID
+    """
+    def add(self, dev):
+        """
+        :param Device dev:
+        :return Device:
+        """
+        self[dev.id] = dev
+        return dev
+
+    def iter(self, fltr=None):
+        """
+        :param str fltr: ignored; every device belongs to the plugin under test.
+        """
+        for dev in list(self.values()):
+            count('deviceFetch')
+            yield dev
+
+    itervalues = iter
+
+
+class DeviceCommands:
+    """
+    indigo.device
+    """
+    @staticmethod
+    def enable(dev, value=True):
+        """
+        :param Device dev:
+        :param bool value:
+        """
+        count('enable', dev.id)
+        dev.enabled = value
+
+
+class Server:
+    """
+    indigo.server
+    """
+    version = "2022.1.0"
+    apiVersion = "3.0"
+
+    @staticmethod
+    def log(message, **kwargs):
+        """
+        :param str message:
+        """
+        logging.getLogger("Indigo").info(message)
+
+    @staticmethod
+    def getTime():  # noqa
+        return dt.datetime.now()
+
+    @staticmethod
+    def getLogsFolderPath(pluginId=None):  # noqa
+        return "/tmp"
+
+    @staticmethod
+    def getPlugin(plugin_id):  # noqa
+        return None
+
+
+class PluginBase:
+    """
+    indigo.PluginBase
+    """
+    class StopThread(Exception):
+        """
+        Raised by sleep() when the plugin is being stopped
+        """
+
+    def __init__(self, plugin_id, plugin_display_name, plugin_version, plugin_prefs):
+        self.pluginId = plugin_id
+        self.pluginDisplayName = plugin_display_name
+        self.pluginVersion = plugin_version
+        self.pluginPrefs = Dict(plugin_prefs)
+        self.logger = logging.getLogger("Plugin")
+        self.plugin_file_handler = logging.NullHandler()
+        self.indigo_log_handler = logging.NullHandler()
+
+    def __del__(self):
+        pass
+
+    def sleep(self, seconds):
+        """
+        :param float seconds:
+        """
+        time.sleep(seconds)
+
+    @staticmethod
+    def versStrToTuple(version):  # noqa
+        return tuple(int(part) for part in version.split('.'))
+
+
+class PluginAction:
+    """
+    indigo.PluginAction
+    """
+    def __init__(self, props=None, device_id=0):
+        self.props = Dict(props or {})
+        self.deviceId = device_id
+
+
+devices = DeviceList()
+device = DeviceCommands()
+server = Server()
+variables = {}